@@ -0,0 +1,120 @@
+"""Benchmark JSON codecs and compression on Geotab response payloads.
+
+Encodes a synthetic fleet's multi_call response, plus every multi_call result
+in the captures under benchmarks/captures, and reports the payload size raw
+and gzip or deflate compressed and the median decode time of mygeotab's
+decoder (which turns date strings into datetimes), the standard library and
+orjson. The encode time of each codec is measured on a multi_call request.
+Run with:
+
+    python benchmarks/bench_codec.py [--devices 1000] [--rounds 10]
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections.abc import Callable
+import gzip
+import json
+from pathlib import Path
+import statistics
+import time
+from typing import Any
+import zlib
+
+from mygeotab.serializers import json_deserialize, json_serialize
+
+from fleet import build_response, generate_fleet
+
+CAPTURES = sorted((Path(__file__).parent / "captures").glob("*.jsonl.gz"))
+
+
+def _codecs() -> dict[str, tuple[Callable[[Any], Any], Callable[[Any], Any]]]:
+    """Return (dumps, loads) per codec name, skipping codecs that are not installed."""
+    codecs = {
+        "mygeotab": (json_serialize, json_deserialize),
+        "json": (lambda obj: json.dumps(obj, separators=(",", ":")), json.loads),
+    }
+    try:
+        import orjson
+    except ImportError:
+        pass
+    else:
+        codecs["orjson"] = (orjson.dumps, orjson.loads)
+    return codecs
+
+
+def _median_ms(func: Callable[[], Any], rounds: int) -> float:
+    """Return the median wall time of func in milliseconds."""
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def _payloads(devices: int) -> dict[str, bytes]:
+    """Return JSON-RPC response bodies by label."""
+    results, _ = build_response(generate_fleet(devices, trips_per_day=0.7))
+    payloads = {f"synthetic-{devices}": json.dumps({"result": results}).encode()}
+    for capture in CAPTURES:
+        with gzip.open(capture, "rt", encoding="utf-8") as lines:
+            records = [json.loads(line) for line in lines if line.strip()]
+        for record in records:
+            if record["call"] == "multi_call" and "result" in record:
+                label = f"{capture.name.split('.')[0]}-{record['seq']}"
+                payloads[label] = json.dumps({"result": record["result"]}).encode()
+    return payloads
+
+
+def _request(devices: int) -> list[dict[str, Any]]:
+    """Return a multi_call request with a Trip sub-call per device."""
+    calls = [
+        {"method": "Get", "params": {"typeName": "DeviceStatusInfo"}},
+        {"method": "Get", "params": {"typeName": "FaultData", "resultsLimit": 10 * devices}},
+    ]
+    calls += [
+        {
+            "method": "Get",
+            "params": {
+                "typeName": "Trip",
+                "search": {"deviceSearch": {"id": f"b{index:X}"}, "fromDate": "2026-01-01T00:00:00Z"},
+                "resultsLimit": 250,
+            },
+        }
+        for index in range(devices)
+    ]
+    return [{"id": -1, "method": "ExecuteMultiCall", "params": {"calls": calls}}]
+
+
+def main() -> None:
+    """Run the benchmark and print a table per payload."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=10)
+    args = parser.parse_args()
+    codecs = _codecs()
+
+    request = _request(args.devices)
+    body = json.dumps(request).encode()
+    print(f"multi_call request ({args.devices} devices): {len(body) / 1024:.0f} KiB raw, "
+          f"{len(gzip.compress(body, 5)) / 1024:.0f} KiB gzip")
+    for name, (dumps, _) in codecs.items():
+        print(f"  {name:<9} encode  {_median_ms(lambda: dumps(request), args.rounds):8.2f} ms")
+
+    for label, body in _payloads(args.devices).items():
+        gzipped = gzip.compress(body, compresslevel=5)
+        deflated = zlib.compress(body, 5)
+        print(f"{label} response: {len(body) / 1024:.0f} KiB raw, "
+              f"{len(gzipped) / 1024:.0f} KiB gzip ({len(body) / len(gzipped):.1f}x), "
+              f"{len(deflated) / 1024:.0f} KiB deflate")
+        print(f"  gunzip    {_median_ms(lambda: gzip.decompress(gzipped), args.rounds):8.2f} ms")
+        text = body.decode()
+        for name, (_, loads) in codecs.items():
+            payload = text if name == "mygeotab" else body
+            print(f"  {name:<9} decode  {_median_ms(lambda: loads(payload), args.rounds):8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
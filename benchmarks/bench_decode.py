@@ -0,0 +1,171 @@
+"""Benchmark the typed decoder against the legacy dict pipeline.
+
+Builds a synthetic multi_call response for a fleet and times how long each
+pipeline takes to turn it into per-device status, diagnostics, fault and trip
+maps and then release the raw response, and how much memory the output keeps
+alive afterwards. Both keep the raw records; the decoder has to stay at least
+as fast as the legacy pipeline while validating each result once. Run with:
+
+    python benchmarks/bench_decode.py [--devices 1000] [--rounds 20]
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+from collections import defaultdict
+import gc
+import importlib.util
+import os
+import statistics
+import time
+import tracemalloc
+from typing import Any
+
+from fleet import STATUS_DIAGNOSTICS, build_response, generate_fleet
+
+# Import decoder directly from file to avoid loading __init__.py (which needs homeassistant)
+_DECODER_PATH = os.path.join(
+    os.path.dirname(__file__), "..", "custom_components", "geotab", "decoder.py"
+)
+_spec = importlib.util.spec_from_file_location("decoder", _DECODER_PATH)
+decoder = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(decoder)
+
+KEYS_BY_ID = {
+    diagnostic_id: f"key_{i}"
+    for i, (diagnostic_id, _low, _high) in enumerate(STATUS_DIAGNOSTICS)
+}
+
+
+def legacy_pipeline(results: list, call_map: list[str]) -> tuple:
+    """Parse results the way api.py did before the typed decoder."""
+    status_map: dict[str, dict[str, Any]] = {}
+    diagnostics_map: defaultdict[str, dict[str, Any]] = defaultdict(dict)
+    fault_map: defaultdict[str, list[dict[str, Any]]] = defaultdict(list)
+    trip_results_dict: dict[str, list[dict[str, Any]]] = {}
+    for index, key in enumerate(call_map):
+        result = results[index]
+        if key == "status" and isinstance(result, list):
+            for status in result:
+                if not isinstance(status, dict):
+                    continue
+                device = status.get("device")
+                if not isinstance(device, dict) or not device.get("id"):
+                    continue
+                diagnostics: dict[str, Any] = {}
+                for item in status.get("statusData", []):
+                    if not isinstance(item, dict):
+                        continue
+                    diagnostic = item.get("diagnostic")
+                    if not isinstance(diagnostic, dict):
+                        continue
+                    diagnostic_key = KEYS_BY_ID.get(diagnostic.get("id"))
+                    if diagnostic_key is None or item.get("data") is None:
+                        continue
+                    diagnostics[diagnostic_key] = item["data"]
+                # The merge step then copied each status without its statusData
+                payload = dict(status)
+                payload.pop("statusData", None)
+                status_map[device["id"]] = payload
+                diagnostics_map[device["id"]].update(diagnostics)
+        elif key == "faults" and isinstance(result, list):
+            for fault in sorted(
+                (fault for fault in result if isinstance(fault, dict)),
+                key=lambda item: item.get("dateTime", ""),
+                reverse=True,
+            ):
+                device = fault.get("device")
+                if isinstance(device, dict) and device.get("id"):
+                    fault_map[device["id"]].append(fault)
+        elif key.startswith("trip_") and isinstance(result, list):
+            real_trips = [
+                trip for trip in result if isinstance(trip, dict) and trip.get("distance", 0) > 0
+            ]
+            if real_trips:
+                trip_results_dict[key[5:]] = sorted(
+                    real_trips, key=lambda trip: trip.get("start", ""), reverse=True
+                )
+    return status_map, diagnostics_map, fault_map, trip_results_dict
+
+
+def decoder_pipeline(results: list, call_map: list[str]) -> tuple:
+    """Parse results with the typed decoder, as api.py does now."""
+    status_map: dict[str, dict[str, Any]] = {}
+    diagnostics_map: defaultdict[str, dict[str, Any]] = defaultdict(dict)
+    fault_map: defaultdict[str, list[dict[str, Any]]] = defaultdict(list)
+    trip_results_dict: dict[str, list[dict[str, Any]]] = {}
+    for index, key in enumerate(call_map):
+        result = results[index]
+        if key == "status":
+            for status in decoder.decode_statuses(result, KEYS_BY_ID):
+                diagnostics_map[status.device_id].update(status.diagnostics)
+                status_map[status.device_id] = status.payload
+        elif key == "faults":
+            for fault in decoder.decode_faults(result):
+                fault_map[fault.device_id].append(fault.payload)
+        elif key.startswith("trip_"):
+            if trips := decoder.decode_trips(result):
+                trip_results_dict[key[5:]] = trips
+    return status_map, diagnostics_map, fault_map, trip_results_dict
+
+
+def _time(pipeline, response: tuple[list, list[str]], rounds: int) -> list[float]:
+    """Return per-round wall times in milliseconds."""
+    timings = []
+    for _ in range(rounds):
+        results = copy.deepcopy(response[0])
+        # Like timeit, keep collections of the deepcopy garbage out of the timing
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            output = pipeline(results, response[1])
+            # Each poll drops the raw response once it is parsed; count freeing
+            # what the output does not keep
+            del results
+            timings.append((time.perf_counter() - start) * 1000)
+            del output
+        finally:
+            gc.enable()
+    return timings
+
+
+def _retained_kib(pipeline, response: tuple[list, list[str]]) -> float:
+    """Return KiB still referenced by the pipeline output once the raw results are dropped."""
+    tracemalloc.start()
+    results = copy.deepcopy(response[0])
+    output = pipeline(results, response[1])
+    del results
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del output
+    return retained / 1024
+
+
+def main() -> None:
+    """Run the benchmark and print a summary."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    response = build_response(generate_fleet(args.devices, trips_per_day=0.7))
+    # Alternate the pipelines so drift in machine load affects both alike
+    legacy: list[float] = []
+    typed: list[float] = []
+    for _ in range(args.rounds):
+        legacy += _time(legacy_pipeline, response, 1)
+        typed += _time(decoder_pipeline, response, 1)
+
+    legacy_ms, typed_ms = statistics.median(legacy), statistics.median(typed)
+    print(f"devices={args.devices} rounds={args.rounds}")
+    print(f"legacy dict pipeline : {legacy_ms:8.2f} ms (median)")
+    print(f"typed decoder        : {typed_ms:8.2f} ms (median)")
+    print(f"ratio                : {legacy_ms / typed_ms:8.2f}x")
+    print(f"legacy retained      : {_retained_kib(legacy_pipeline, response):8.0f} KiB")
+    print(f"typed retained       : {_retained_kib(decoder_pipeline, response):8.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Fixtures for the Geotab benchmark suite.
+
+Run with ``pytest benchmarks`` (the default test run only collects ``tests``).
+Each benchmark records the median of several rounds in milliseconds and fails
+when it exceeds its entry in ``thresholds.json``. Results are written to
+``benchmarks/results.json`` at the end of the session. Set
+``GEOTAB_BENCH_SIZES`` (e.g. ``10,100,1000,5000``) to change the fleet sizes.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+import json
+import os
+from pathlib import Path
+import statistics
+import time
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from fleet import Fleet, generate_fleet
+
+BENCH_DIR = Path(__file__).parent
+THRESHOLDS: dict[str, float] = json.loads((BENCH_DIR / "thresholds.json").read_text())
+RESULTS: dict[str, float] = {}
+FLEET_SIZES = [
+    int(size) for size in os.environ.get("GEOTAB_BENCH_SIZES", "10,100,1000").split(",")
+]
+
+_FLEETS: dict[int, Fleet] = {}
+
+
+def pytest_generate_tests(metafunc: pytest.Metafunc) -> None:
+    """Parametrize benchmarks taking device_count over the configured fleet sizes."""
+    if "device_count" in metafunc.fixturenames:
+        metafunc.parametrize("device_count", FLEET_SIZES)
+
+
+def pytest_sessionfinish(session: pytest.Session, exitstatus: int) -> None:
+    """Write the recorded medians next to the thresholds."""
+    if RESULTS:
+        (BENCH_DIR / "results.json").write_text(json.dumps(RESULTS, indent=2, sort_keys=True))
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(request):
+    """Enable custom integrations in Home Assistant."""
+    if "hass" in request.fixturenames:
+        hass = request.getfixturevalue("hass")
+        hass.data.pop("custom_components", None)
+    yield
+
+
+@pytest.fixture(autouse=True)
+def join_geotab_executors():
+    """Join API client thread pools after each benchmark so no threads linger."""
+    from custom_components.geotab import executor
+
+    pools = []
+    thread_pool = executor.ThreadPoolExecutor
+
+    def _track(*args, **kwargs):
+        pool = thread_pool(*args, **kwargs)
+        pools.append(pool)
+        return pool
+
+    with patch.object(executor, "ThreadPoolExecutor", _track):
+        yield
+    for pool in pools:
+        pool.shutdown(wait=True)
+
+
+@pytest.fixture
+def fleet(device_count: int) -> Fleet:
+    """Return a synthetic fleet, generated once per size."""
+    if device_count not in _FLEETS:
+        _FLEETS[device_count] = generate_fleet(device_count)
+    return _FLEETS[device_count]
+
+
+def _check(name: str, timings: list[float]) -> float:
+    """Record the median and compare it with the threshold."""
+    median = statistics.median(timings)
+    RESULTS[name] = round(median, 3)
+    if (limit := THRESHOLDS.get(name)) is not None:
+        assert median <= limit, f"{name}: {median:.2f} ms exceeds threshold {limit} ms"
+    return median
+
+
+@pytest.fixture
+def bench(request: pytest.FixtureRequest) -> Callable[..., float]:
+    """Time a synchronous callable and check it against its threshold."""
+
+    def run(func: Callable[[], Any], rounds: int = 5) -> float:
+        timings = []
+        for _ in range(rounds):
+            start = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - start) * 1000)
+        return _check(request.node.name, timings)
+
+    return run
+
+
+@pytest.fixture
+def abench(request: pytest.FixtureRequest) -> Callable[..., Awaitable[float]]:
+    """Time an async callable and check it against its threshold."""
+
+    async def run(func: Callable[[], Awaitable[Any]], rounds: int = 5) -> float:
+        timings = []
+        for _ in range(rounds):
+            start = time.perf_counter()
+            await func()
+            timings.append((time.perf_counter() - start) * 1000)
+        return _check(request.node.name, timings)
+
+    return run
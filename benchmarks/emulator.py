@@ -0,0 +1,260 @@
+"""Local stand-in for the Geotab JSON-RPC API.
+
+Serves Authenticate, Get, GetFeed and ExecuteMultiCall for Device,
+DeviceStatusInfo, FaultData, Trip, Diagnostic and LogRecord from a synthetic
+fleet, with configurable latency, payload padding, OverLimitException
+responses, session expiry and gzip/deflate compression. Point
+GeotabApiClient at it with ``endpoint="http://127.0.0.1:<port>"``. Run
+standalone with:
+
+    python benchmarks/emulator.py --devices 500 --latency 0.2 --port 8765
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+import json
+import random
+import secrets
+from typing import Any
+
+from aiohttp import web
+
+from fleet import FakeGeotabAPI, generate_fleet
+
+EMULATOR_KEY = web.AppKey("emulator", "GeotabEmulator")
+
+
+@dataclass
+class EmulatorConfig:
+    """Behaviour of the emulated server."""
+
+    devices: int = 100
+    seed: int = 1
+    trip_days: int = 30
+    username: str = "user"
+    password: str = "pass"
+    database: str = "db"
+    # Seconds added to every request, plus up to latency_jitter at random
+    latency: float = 0.0
+    latency_jitter: float = 0.0
+    # Extra characters added to every returned record to inflate payloads
+    payload_padding: int = 0
+    # Answer every Nth request with OverLimitException (0 = never)
+    over_limit_every: int = 0
+    # Seconds a session stays valid (None = forever)
+    session_ttl: float | None = None
+    # Compress responses for clients that accept it, and take gzip requests
+    compress_responses: bool = True
+    accept_compressed_requests: bool = True
+    fleet_kwargs: dict[str, Any] = field(default_factory=dict)
+
+
+class RpcError(Exception):
+    """A JSON-RPC error to return to the caller."""
+
+    def __init__(self, name: str, message: str) -> None:
+        """Initialize the error."""
+        super().__init__(message)
+        self.name = name
+        self.message = message
+
+    def as_error(self) -> dict[str, Any]:
+        """Return the error object the Geotab API sends."""
+        return {
+            "message": self.message,
+            "code": -32000,
+            "name": "JSONRPCError",
+            "errors": [{"name": self.name, "message": self.message}],
+        }
+
+
+class GeotabEmulator:
+    """State and request handling of one emulated server."""
+
+    def __init__(self, config: EmulatorConfig) -> None:
+        """Initialize the emulator."""
+        self.config = config
+        self.fleet = generate_fleet(
+            config.devices, seed=config.seed, trip_days=config.trip_days, **config.fleet_kwargs
+        )
+        self.api = FakeGeotabAPI(self.fleet)
+        self.sessions: dict[str, float] = {}
+        self.requests: Counter[str] = Counter()
+        self.feed_version = 0
+        self._request_count = 0
+        self._rng = random.Random(config.seed)
+
+    def expire_sessions(self) -> None:
+        """Invalidate every session, as a server restart would."""
+        self.sessions.clear()
+
+    def _authenticate(self, params: dict[str, Any]) -> dict[str, Any]:
+        """Handle Authenticate."""
+        config = self.config
+        if (
+            params.get("userName") != config.username
+            or params.get("password") != config.password
+            or params.get("database") != config.database
+        ):
+            raise RpcError("InvalidUserException", "Incorrect login credentials")
+        session_id = secrets.token_hex(8)
+        ttl = config.session_ttl
+        self.sessions[session_id] = (
+            asyncio.get_running_loop().time() + ttl if ttl is not None else float("inf")
+        )
+        return {
+            "credentials": {
+                "database": config.database,
+                "sessionId": session_id,
+                "userName": config.username,
+            },
+            "path": "ThisServer",
+        }
+
+    def _check_session(self, params: dict[str, Any]) -> None:
+        """Reject calls without a live session."""
+        session_id = (params.get("credentials") or {}).get("sessionId")
+        expires_at = self.sessions.get(session_id)
+        if expires_at is None or expires_at < asyncio.get_running_loop().time():
+            self.sessions.pop(session_id, None)
+            raise RpcError("InvalidUserException", "Session expired or invalid")
+
+    def _pad(self, result: Any) -> Any:
+        """Inflate every record in a result by the configured padding."""
+        padding = self.config.payload_padding
+        if not padding or not isinstance(result, list):
+            return result
+        filler = "x" * padding
+        return [
+            {**item, "comment": filler} if isinstance(item, dict) else item
+            for item in result
+        ]
+
+    def _get(self, params: dict[str, Any]) -> Any:
+        """Handle Get."""
+        self.requests[f"Get({params.get('typeName')})"] += 1
+        return self._pad(
+            self.api.get(
+                params.get("typeName"),
+                search=params.get("search"),
+                resultsLimit=params.get("resultsLimit"),
+            )
+        )
+
+    def _get_feed(self, params: dict[str, Any]) -> dict[str, Any]:
+        """Handle GetFeed; LogRecord feeds return one fresh fix per device."""
+        type_name = params.get("typeName")
+        self.requests[f"GetFeed({type_name})"] += 1
+        limit = params.get("resultsLimit") or 50000
+        if type_name != "LogRecord":
+            data = self.api.get(type_name, search=params.get("search"))[:limit]
+            return {"data": self._pad(data), "toVersion": f"{self.feed_version:016x}"}
+
+        self.feed_version += 1
+        now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+        data = []
+        for status in self.fleet.statuses[:limit]:
+            status["latitude"] += self._rng.uniform(-0.001, 0.001)
+            status["longitude"] += self._rng.uniform(-0.001, 0.001)
+            data.append(
+                {
+                    "id": f"l{self.feed_version}-{status['device']['id']}",
+                    "device": status["device"],
+                    "dateTime": now,
+                    "latitude": status["latitude"],
+                    "longitude": status["longitude"],
+                    "speed": status["speed"],
+                }
+            )
+        return {"data": self._pad(data), "toVersion": f"{self.feed_version:016x}"}
+
+    def dispatch(self, method: str, params: dict[str, Any]) -> Any:
+        """Run one JSON-RPC method."""
+        if method == "Authenticate":
+            self.requests["Authenticate"] += 1
+            return self._authenticate(params)
+        self._check_session(params)
+        if method == "Get":
+            return self._get(params)
+        if method == "GetFeed":
+            return self._get_feed(params)
+        if method == "ExecuteMultiCall":
+            self.requests["ExecuteMultiCall"] += 1
+            return [
+                self.dispatch(call["method"], {**call.get("params", {}), **_creds(params)})
+                for call in params.get("calls", [])
+            ]
+        raise RpcError("MissingMethodException", f"Method {method} is not emulated")
+
+    async def handle(self, request: web.Request) -> web.Response:
+        """Handle a POST to /apiv1."""
+        config = self.config
+        delay = config.latency + self._rng.uniform(0, config.latency_jitter)
+        if delay:
+            await asyncio.sleep(delay)
+        self._request_count += 1
+        if request.headers.get("Content-Encoding") and not config.accept_compressed_requests:
+            return web.Response(status=415)
+        # aiohttp inflates compressed request bodies
+        body = await request.json()
+        try:
+            if config.over_limit_every and self._request_count % config.over_limit_every == 0:
+                raise RpcError("OverLimitException", "API calls quota exceeded")
+            payload = {"result": self.dispatch(body.get("method"), body.get("params") or {})}
+        except RpcError as err:
+            payload = {"error": err.as_error()}
+        payload.update(id=body.get("id"), jsonrpc="2.0")
+        response = web.json_response(payload, dumps=lambda obj: json.dumps(obj, default=str))
+        if config.compress_responses:
+            # Negotiated from the request's Accept-Encoding
+            response.enable_compression()
+        return response
+
+
+def _creds(params: dict[str, Any]) -> dict[str, Any]:
+    """Return the credentials of a call so multi_call sub-calls inherit them."""
+    return {"credentials": params["credentials"]} if "credentials" in params else {}
+
+
+def create_app(config: EmulatorConfig | None = None) -> web.Application:
+    """Create the emulator web application."""
+    emulator = GeotabEmulator(config or EmulatorConfig())
+    app = web.Application(client_max_size=64 * 1024**2)
+    app[EMULATOR_KEY] = emulator
+    app.router.add_post("/apiv1", emulator.handle)
+    return app
+
+
+def main() -> None:
+    """Run the emulator until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--latency-jitter", type=float, default=0.0)
+    parser.add_argument("--payload-padding", type=int, default=0)
+    parser.add_argument("--over-limit-every", type=int, default=0)
+    parser.add_argument("--session-ttl", type=float, default=None)
+    parser.add_argument("--no-compression", action="store_true")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    config = EmulatorConfig(
+        devices=args.devices,
+        latency=args.latency,
+        latency_jitter=args.latency_jitter,
+        payload_padding=args.payload_padding,
+        over_limit_every=args.over_limit_every,
+        session_ttl=args.session_ttl,
+        compress_responses=not args.no_compression,
+        accept_compressed_requests=not args.no_compression,
+    )
+    web.run_app(create_app(config), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+"""Synthetic Geotab fleets for benchmarks.
+
+Generates devices with realistic live status, embedded status data, active
+faults and a configurable number of days of trips, plus a stand-in for the
+API transport that answers Get and multi_call requests from that fleet. Pure
+Python with no Home Assistant dependencies, so decoder-level benchmarks can
+run without it.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+import random
+from typing import Any
+
+# (diagnostic ID, low, high) for the status data each device reports
+STATUS_DIAGNOSTICS: tuple[tuple[str, float, float], ...] = (
+    ("DiagnosticOdometerId", 1e6, 4e8),
+    ("DiagnosticTotalDistanceId", 1e6, 4e8),
+    ("DiagnosticIgnitionId", 0, 1),
+    ("DiagnosticGoDeviceVoltageId", 11.8, 14.4),
+    ("DiagnosticFuelLevelPercentageId", 5, 100),
+    ("DiagnosticFuelRateId", 0, 25),
+    ("DiagnosticEngineSpeedId", 0, 3500),
+    ("DiagnosticEngineHoursId", 3.6e5, 3.6e7),
+    ("DiagnosticEngineLoadId", 0, 100),
+    ("DiagnosticEngineCoolantTemperatureId", 20, 105),
+    ("DiagnosticEngineOilTemperatureId", 20, 120),
+    ("DiagnosticAmbientAirTemperatureId", -10, 40),
+    ("DiagnosticTirePressureFrontLeftId", 2.0e5, 2.6e5),
+    ("DiagnosticTirePressureFrontRightId", 2.0e5, 2.6e5),
+    ("DiagnosticTirePressureRearLeftId", 2.0e5, 2.6e5),
+    ("DiagnosticTirePressureRearRightId", 2.0e5, 2.6e5),
+)
+# Diagnostics reported by a share of the vehicles, some not requested at all
+FAULT_DIAGNOSTICS: tuple[str, ...] = (
+    "DiagnosticDeviceHasBeenUnpluggedId",
+    "DiagnosticLowVoltageId",
+    "DiagnosticVehicleBatteryLowVoltageId",
+    "DiagnosticRestartedBecauseAllPowerWasRemovedId",
+    "aZq0sPWeA3UKd5aP1HQvRlA",
+    "aTbI5jw5gq0mbx8bUhfglhw",
+)
+DEVICE_TYPES = ("GO9", "GO9B", "GO8", "GO7")
+
+
+@dataclass
+class Fleet:
+    """A synthetic fleet, in the shape the Geotab API returns it."""
+
+    devices: list[dict[str, Any]]
+    statuses: list[dict[str, Any]]
+    faults: list[dict[str, Any]]
+    trips: dict[str, list[dict[str, Any]]] = field(default_factory=dict)
+
+    @property
+    def device_ids(self) -> list[str]:
+        """Return the device IDs in API order."""
+        return [device["id"] for device in self.devices]
+
+
+def _iso(value: datetime) -> str:
+    """Format a datetime the way the Geotab API does."""
+    return value.strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+
+def _duration(seconds: float) -> str:
+    """Format seconds as a Geotab TimeSpan string."""
+    seconds = int(seconds)
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+def generate_fleet(
+    device_count: int,
+    *,
+    seed: int = 1,
+    trip_days: int = 30,
+    trips_per_day: float = 3.0,
+    fault_ratio: float = 0.3,
+    now: datetime | None = None,
+) -> Fleet:
+    """Generate a fleet of device_count vehicles."""
+    rng = random.Random(seed)
+    now = now or datetime.now(timezone.utc)
+    fleet = Fleet(devices=[], statuses=[], faults=[])
+
+    for n in range(device_count):
+        device_id = f"b{n + 1:X}"
+        fleet.devices.append(
+            {
+                "id": device_id,
+                "name": f"Vehicle {n + 1:05d}",
+                "serialNumber": f"G9{rng.randrange(16**10):010X}",
+                "deviceType": rng.choice(DEVICE_TYPES),
+                "vehicleIdentificationNumber": f"1FT{rng.randrange(10**14):014d}",
+                "licensePlate": f"{rng.randrange(1000):03d}-{rng.randrange(1000):03d}",
+                "timeZoneId": "Europe/Rome",
+                "activeFrom": "2020-01-01T00:00:00.000Z",
+                "activeTo": "2050-01-01T00:00:00.000Z",
+                "groups": [{"id": "GroupCompanyId"}],
+                "version": f"0000000000{rng.randrange(100):02d}",
+                "productId": 120,
+                "workTime": "WorkTimeStandardHoursId",
+            }
+        )
+
+        driving = rng.random() < 0.3
+        stamp = _iso(now - timedelta(seconds=rng.randrange(600)))
+        fleet.statuses.append(
+            {
+                "device": {"id": device_id},
+                "latitude": rng.uniform(36.0, 47.0),
+                "longitude": rng.uniform(6.5, 18.5),
+                "speed": rng.uniform(20, 110) if driving else 0,
+                "bearing": rng.randrange(360),
+                "isDriving": driving,
+                "isDeviceCommunicating": rng.random() < 0.97,
+                "dateTime": stamp,
+                "currentStateDuration": _duration(rng.randrange(86400)),
+                "driver": "UnknownDriverId",
+                "groups": [{"id": "GroupCompanyId"}],
+                "exceptionEvents": [],
+                "statusData": [
+                    {
+                        "id": f"a{n}{index}",
+                        "diagnostic": {"id": diagnostic_id},
+                        "device": {"id": device_id},
+                        "data": round(rng.uniform(low, high), 2),
+                        "dateTime": stamp,
+                        "controller": "ControllerNoneId",
+                        "version": "00000000000a1b2c",
+                    }
+                    for index, (diagnostic_id, low, high) in enumerate(STATUS_DIAGNOSTICS)
+                ],
+            }
+        )
+
+        if rng.random() < fault_ratio:
+            for f in range(rng.randint(1, 4)):
+                fleet.faults.append(
+                    {
+                        "id": f"f{n}-{f}",
+                        "device": {"id": device_id},
+                        "diagnostic": {"id": rng.choice(FAULT_DIAGNOSTICS)},
+                        "controller": "ControllerGoDeviceId",
+                        "failureMode": {"id": "NoFailureModeId"},
+                        "dateTime": _iso(now - timedelta(minutes=rng.randrange(43200))),
+                        "faultState": "Active",
+                        "count": rng.randint(1, 20),
+                        "amberWarningLamp": rng.random() < 0.2,
+                        "redStopLamp": False,
+                        "malfunctionLamp": False,
+                        "protectWarningLamp": False,
+                    }
+                )
+
+        trips: list[dict[str, Any]] = []
+        trip_count = int(trip_days * trips_per_day)
+        for t in range(trip_count):
+            start = now - timedelta(hours=(t + rng.random()) * 24 / trips_per_day)
+            driving_seconds = rng.randrange(300, 5400)
+            idle_seconds = rng.randrange(0, 900)
+            distance = round(rng.uniform(0.5, 120), 2) if rng.random() > 0.05 else 0
+            trips.append(
+                {
+                    "id": f"t{n}-{t}",
+                    "device": {"id": device_id},
+                    "driver": "UnknownDriverId",
+                    "start": _iso(start),
+                    "stop": _iso(start + timedelta(seconds=driving_seconds)),
+                    "nextTripStart": _iso(start + timedelta(seconds=driving_seconds + 600)),
+                    "distance": distance,
+                    "averageSpeed": round(distance / max(driving_seconds / 3600, 0.01), 1),
+                    "maximumSpeed": round(rng.uniform(40, 130), 1),
+                    "drivingDuration": f"PT{driving_seconds // 60}M{driving_seconds % 60}S",
+                    "idlingDuration": f"PT{idle_seconds // 60}M{idle_seconds % 60}S",
+                    "stopDuration": "PT10M",
+                    "stopPoint": {"x": rng.uniform(6.5, 18.5), "y": rng.uniform(36, 47)},
+                    "engineHours": rng.randrange(360000, 36000000),
+                    "workDistance": 0,
+                    "isSeatBeltOff": False,
+                    "speedRange1": rng.randrange(10),
+                    "speedRange2": rng.randrange(5),
+                    "speedRange3": 0,
+                }
+            )
+        fleet.trips[device_id] = trips
+
+    return fleet
+
+
+def go_fault_diagnostics() -> list[dict[str, Any]]:
+    """Return the Diagnostic records for the fault diagnostics the fleet reports."""
+    return [
+        {"id": diagnostic_id, "name": f"Fault {index}", "diagnosticType": "GoFault"}
+        for index, diagnostic_id in enumerate(FAULT_DIAGNOSTICS)
+    ]
+
+
+class FakeGeotabAPI:
+    """Stand-in for the API transport that answers from a synthetic fleet."""
+
+    def __init__(self, fleet: Fleet) -> None:
+        """Initialize the fake API."""
+        self.fleet = fleet
+        self.calls: list[str] = []
+
+    def authenticate(self) -> None:
+        """Pretend to authenticate."""
+        self.calls.append("Authenticate")
+
+    def get(self, type_name: str, **params: Any) -> list[dict[str, Any]]:
+        """Answer a Get call."""
+        self.calls.append(type_name)
+        search = params.get("search") or {}
+        if type_name == "Device":
+            return self.fleet.devices
+        if type_name == "DeviceStatusInfo":
+            statuses = self.fleet.statuses
+            if device_id := search.get("deviceSearch", {}).get("id"):
+                statuses = [
+                    status for status in statuses if status["device"]["id"] == device_id
+                ]
+            if "diagnostics" not in search:
+                # Geotab only sends statusData for the requested diagnostics
+                statuses = [
+                    {key: value for key, value in status.items() if key != "statusData"}
+                    for status in statuses
+                ]
+            return statuses
+        if type_name == "FaultData":
+            return self.fleet.faults[: params.get("resultsLimit") or None]
+        if type_name == "Trip":
+            device_id = search.get("deviceSearch", {}).get("id")
+            return self.fleet.trips.get(device_id, [])[: params.get("resultsLimit") or None]
+        if type_name == "Diagnostic":
+            return go_fault_diagnostics()
+        return []
+
+    def multi_call(self, calls: list[tuple[str, dict[str, Any]]]) -> list[Any]:
+        """Answer an ExecuteMultiCall with one result per (method, params) call."""
+        self.calls.append("ExecuteMultiCall")
+        results = []
+        for _method, params in calls:
+            params = dict(params)
+            results.append(self.get(params.pop("typeName"), **params))
+        return results
+
+
+def build_response(fleet: Fleet) -> tuple[list, list[str]]:
+    """Return (results, call_map) shaped like the client's multi_call output."""
+    call_map = ["status", "faults"] + [f"trip_{device_id}" for device_id in fleet.device_ids]
+    results = [fleet.statuses, fleet.faults] + [
+        fleet.trips[device_id] for device_id in fleet.device_ids
+    ]
+    return results, call_map
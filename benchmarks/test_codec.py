@@ -0,0 +1,27 @@
+"""Benchmarks of the JSON-RPC transport codecs on fleet-sized responses."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from custom_components.geotab.transport import JSON_CODEC, ORJSON_CODEC
+from fleet import Fleet, build_response
+
+CODECS = [JSON_CODEC] + ([ORJSON_CODEC] if ORJSON_CODEC is not None else [])
+
+
+def _body(fleet: Fleet) -> bytes:
+    """Return the JSON-RPC response body of a full multi_call."""
+    results, _ = build_response(fleet)
+    return json.dumps({"id": -1, "result": results}).encode()
+
+
+@pytest.mark.parametrize("codec", CODECS, ids=lambda codec: codec.name)
+def test_decode_response(fleet, codec, bench):
+    """Benchmark decoding a full multi_call response."""
+    body = _body(fleet)
+
+    assert codec.loads(body)["result"][0] == fleet.statuses
+    bench(lambda: codec.loads(body))
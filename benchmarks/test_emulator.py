@@ -0,0 +1,145 @@
+"""Load and fault-injection tests against the local Geotab JSON-RPC emulator."""
+
+from __future__ import annotations
+
+from aiohttp.test_utils import TestServer
+import pytest
+
+from custom_components.geotab.api import ApiError, GeotabApiClient, InvalidAuth
+from emulator import EMULATOR_KEY, EmulatorConfig, GeotabEmulator, create_app
+
+
+@pytest.fixture
+async def emulator_server(socket_enabled):
+    """Start emulators on 127.0.0.1 and return (url, emulator) for each."""
+    servers: list[TestServer] = []
+
+    async def start(**config) -> tuple[str, GeotabEmulator]:
+        app = create_app(EmulatorConfig(**config))
+        server = TestServer(app, host="127.0.0.1")
+        await server.start_server()
+        servers.append(server)
+        return str(server.make_url("")), app[EMULATOR_KEY]
+
+    yield start
+    for server in servers:
+        await server.close()
+
+
+async def test_full_fetch(emulator_server):
+    """The client fetches a full fleet snapshot from the emulator."""
+    url, emulator = await emulator_server(devices=25, trip_days=2)
+    client = GeotabApiClient("user", "pass", "db", None, endpoint=url)
+    await client.async_authenticate()
+
+    data = await client.async_get_full_device_data(include_trips=True)
+
+    assert set(data) == set(emulator.fleet.device_ids)
+    assert emulator.requests["Authenticate"] == 1
+    assert emulator.requests["ExecuteMultiCall"] == 1
+    assert emulator.requests["Get(Trip)"] == 25
+
+
+async def test_sharded_fetch(emulator_server):
+    """A sharded refresh fetches one shard's details and every position."""
+    url, emulator = await emulator_server(devices=30, trip_days=2)
+    client = GeotabApiClient("user", "pass", "db", None, endpoint=url)
+    await client.async_authenticate()
+    previous = await client.async_get_full_device_data(include_trips=True)
+    emulator.requests.clear()
+
+    data = await client.async_get_full_device_data(
+        include_trips=True, previous=previous, shard=(0, 3)
+    )
+
+    assert set(data) == set(emulator.fleet.device_ids)
+    assert emulator.requests["ExecuteMultiCall"] == 1
+    assert 0 < emulator.requests["Get(Trip)"] < 30
+    # One position call plus one status call per device of the shard
+    assert emulator.requests["Get(DeviceStatusInfo)"] == emulator.requests["Get(Trip)"] + 1
+
+
+async def test_live_feed(emulator_server):
+    """The LogRecord feed returns one fresh fix per device and advances its version."""
+    url, emulator = await emulator_server(devices=10, trip_days=1)
+    client = GeotabApiClient("user", "pass", "db", None, endpoint=url)
+    await client.async_authenticate()
+
+    fixes, version = await client.async_get_log_feed()
+    next_fixes, next_version = await client.async_get_log_feed(version)
+
+    assert {fix.device_id for fix in fixes} == set(emulator.fleet.device_ids)
+    assert len(next_fixes) == 10
+    assert next_version > version
+    assert emulator.requests["GetFeed(LogRecord)"] == 2
+
+
+async def test_invalid_credentials(emulator_server):
+    """Wrong credentials surface as InvalidAuth."""
+    url, _ = await emulator_server(devices=1)
+    client = GeotabApiClient("user", "wrong", "db", None, endpoint=url)
+
+    with pytest.raises(InvalidAuth):
+        await client.async_authenticate()
+
+
+async def test_session_expiry_reauthenticates(emulator_server):
+    """An expired session is renewed transparently and the call retried."""
+    url, emulator = await emulator_server(devices=5, trip_days=1)
+    client = GeotabApiClient("user", "pass", "db", None, endpoint=url)
+    await client.async_authenticate()
+    emulator.expire_sessions()
+
+    data = await client.async_get_full_device_data(include_trips=False)
+
+    assert len(data) == 5
+    assert emulator.requests["Authenticate"] == 2
+
+
+async def test_traffic_is_compressed(emulator_server):
+    """Responses arrive compressed and large requests are sent compressed."""
+    url, _ = await emulator_server(devices=50, trip_days=1)
+    client = GeotabApiClient("user", "pass", "db", None, endpoint=url)
+
+    data = await client.async_get_full_device_data(include_trips=True)
+
+    stats = client.transport_stats
+    assert len(data) == 50
+    assert stats["compress_requests"]
+    assert stats["bytes_received"] * 3 < stats["bytes_decoded"]
+
+
+async def test_uncompressed_server_falls_back(emulator_server):
+    """A server that rejects compressed requests gets plain ones from then on."""
+    url, emulator = await emulator_server(
+        devices=50, trip_days=1, compress_responses=False, accept_compressed_requests=False
+    )
+    client = GeotabApiClient("user", "pass", "db", None, endpoint=url)
+
+    for _ in range(2):
+        data = await client.async_get_full_device_data(include_trips=True)
+
+    stats = client.transport_stats
+    assert len(data) == 50
+    assert not stats["compress_requests"]
+    assert stats["bytes_received"] == stats["bytes_decoded"]
+    assert emulator.requests["ExecuteMultiCall"] == 2
+
+
+async def test_over_limit_raises_api_error(emulator_server):
+    """OverLimitException responses surface as ApiError."""
+    url, _ = await emulator_server(devices=5, trip_days=1, over_limit_every=2)
+    client = GeotabApiClient("user", "pass", "db", None, endpoint=url)
+    await client.async_authenticate()
+
+    with pytest.raises(ApiError, match="OverLimitException"):
+        await client.async_get_full_device_data(include_trips=False)
+
+
+async def test_emulated_fetch(device_count, emulator_server, abench):
+    """Benchmark a trip-less fetch over HTTP with 20 ms of emulated latency."""
+    url, _ = await emulator_server(devices=device_count, trip_days=1, latency=0.02)
+    client = GeotabApiClient("user", "pass", "db", None, endpoint=url)
+    await client.async_authenticate()
+
+    await abench(lambda: client.async_get_full_device_data(include_trips=False))
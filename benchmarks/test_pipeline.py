@@ -0,0 +1,91 @@
+"""Benchmarks for the Geotab data pipeline on synthetic fleets."""
+
+from __future__ import annotations
+
+import os
+from unittest.mock import patch
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.geotab import trip_stats
+from custom_components.geotab.api import GeotabApiClient
+from custom_components.geotab.binary_sensor import _format_fault_attributes
+from custom_components.geotab.const import DOMAIN
+from custom_components.geotab.decoder import decode_faults, decode_trips
+from fleet import FakeGeotabAPI, go_fault_diagnostics
+
+# Full Home Assistant setups create ~50 entities per vehicle, so cap their size
+E2E_MAX_DEVICES = int(os.environ.get("GEOTAB_BENCH_E2E_MAX", "100"))
+
+TRIP_FUNCTIONS = [
+    trip_stats.daily_distance,
+    trip_stats.weekly_distance,
+    trip_stats.monthly_distance,
+    trip_stats.daily_trip_count,
+    trip_stats.weekly_trip_count,
+    trip_stats.average_trip_speed,
+    trip_stats.total_idle_time_weekly,
+]
+
+
+async def test_full_device_data(fleet, abench):
+    """Benchmark async_get_full_device_data including trips."""
+    with patch(
+        "custom_components.geotab.transport.GeotabJsonRpc", return_value=FakeGeotabAPI(fleet)
+    ):
+        client = GeotabApiClient("user", "pass", "db", None)
+        await abench(lambda: client.async_get_full_device_data(include_trips=True))
+
+
+async def test_live_device_data(fleet, abench):
+    """Benchmark async_get_full_device_data on a cycle that skips trips."""
+    with patch(
+        "custom_components.geotab.transport.GeotabJsonRpc", return_value=FakeGeotabAPI(fleet)
+    ):
+        client = GeotabApiClient("user", "pass", "db", None)
+        await abench(lambda: client.async_get_full_device_data(include_trips=False))
+
+
+@pytest.mark.parametrize("func", TRIP_FUNCTIONS, ids=lambda func: func.__name__)
+def test_trip_stats(fleet, bench, func):
+    """Benchmark one trip statistic across every vehicle's 30-day history."""
+    histories = [decode_trips(trips) for trips in fleet.trips.values()]
+    bench(lambda: [func(trips) for trips in histories])
+
+
+def test_fault_formatting(fleet, bench):
+    """Benchmark rendering active-fault attributes for every vehicle."""
+    lookup = {item["id"]: item["name"] for item in go_fault_diagnostics()[:3]}
+    faults_by_device: dict[str, list] = {}
+    for fault in decode_faults(fleet.faults):
+        faults_by_device.setdefault(fault.device_id, []).append(fault.payload)
+    bench(
+        lambda: [
+            _format_fault_attributes(faults, lookup) for faults in faults_by_device.values()
+        ]
+    )
+
+
+async def test_coordinator_refresh(hass, fleet, device_count, abench):
+    """Benchmark a full coordinator refresh, including entity state writes."""
+    if device_count > E2E_MAX_DEVICES:
+        pytest.skip(f"end-to-end benchmark capped at {E2E_MAX_DEVICES} devices")
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={"username": "user", "password": "pass", "database": "db"},
+    )
+    entry.add_to_hass(hass)
+    with patch(
+        "custom_components.geotab.transport.GeotabJsonRpc", return_value=FakeGeotabAPI(fleet)
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        coordinator = hass.data[DOMAIN][entry.entry_id]
+
+        async def refresh() -> None:
+            await coordinator.async_refresh()
+            await hass.async_block_till_done()
+
+        await abench(refresh)
+        assert await hass.config_entries.async_unload(entry.entry_id)
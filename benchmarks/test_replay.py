@@ -0,0 +1,23 @@
+"""Benchmarks replaying captured production traffic from benchmarks/captures."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from custom_components.geotab.api import GeotabApiClient
+
+CAPTURES = sorted((Path(__file__).parent / "captures").glob("*.jsonl.gz"))
+
+
+@pytest.mark.skipif(not CAPTURES, reason="no captures in benchmarks/captures")
+@pytest.mark.parametrize("capture", CAPTURES, ids=lambda path: path.name.split(".")[0])
+async def test_replay(capture, abench):
+    """Benchmark async_get_full_device_data on a recorded refresh."""
+
+    async def replay() -> None:
+        client = GeotabApiClient("user", "pass", "db", None, replay_path=str(capture))
+        await client.async_get_full_device_data()
+
+    await abench(replay)
@@ -2,25 +2,44 @@
 
 from __future__ import annotations
 
-from datetime import timedelta
+import asyncio
 import logging
 
+import voluptuous as vol
+
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform, CONF_SCAN_INTERVAL
-from homeassistant.core import HomeAssistant, ServiceCall
-from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.const import Platform
+from homeassistant.core import (
+    HomeAssistant,
+    callback,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.helpers import config_validation as cv, device_registry as dr
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
-from homeassistant.util import dt as dt_util
+from homeassistant.helpers.storage import Store
 
-from .api import GeotabApiClient, ApiError, InvalidAuth
 from .const import (
+    ALL_STREAMS,
+    CAPTURE_FILE,
+    CONF_ACTIVE_DEVICES_ONLY,
+    CONF_CAPTURE_API,
+    CONF_DEVICE_GROUPS,
+    CONF_LIVE_FEED,
+    DATA_CLIENT_POOL,
+    DEFAULT_ACTIVE_DEVICES_ONLY,
+    DEFAULT_CAPTURE_API,
+    DEFAULT_DEVICE_GROUPS,
+    DEFAULT_LIVE_FEED,
     DOMAIN,
-    DEFAULT_SCAN_INTERVAL,
-    CIRCUIT_BREAKER_MAX_FAILURES,
-    CIRCUIT_BREAKER_RESET_DELAY,
-    TRIP_FETCH_INTERVAL,
+    REFRESH_CONCURRENCY,
+    SESSION_STORAGE_KEY,
+    SESSION_STORAGE_VERSION,
 )
+from .coordinator import GeotabDataUpdateCoordinator
+from .pool import GeotabClientPool
+from .profiling import DEFAULT_PROFILE_REFRESHES, DEFAULT_PROFILE_TOP
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -32,121 +51,77 @@ PLATFORMS: list[Platform] = [
 ]
 
 SERVICE_REFRESH = "refresh"
+SERVICE_PROFILE = "profile"
+
+REFRESH_SCHEMA = vol.Schema(
+    {
+        vol.Optional("entry_id"): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional("device_id"): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional("stream"): vol.All(cv.ensure_list, [vol.In(sorted(ALL_STREAMS))]),
+    }
+)
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional("refreshes", default=DEFAULT_PROFILE_REFRESHES): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=20)
+        ),
+        vol.Optional("top", default=DEFAULT_PROFILE_TOP): vol.All(
+            vol.Coerce(int), vol.Range(min=5, max=100)
+        ),
+    }
+)
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Geotab from a config entry."""
     hass.data.setdefault(DOMAIN, {})
+    pool: GeotabClientPool = hass.data.setdefault(DATA_CLIENT_POOL, GeotabClientPool())
 
-    # Create the API client
-    session = async_get_clientsession(hass)
-    client = GeotabApiClient(
+    # Get the API client; per-server state is shared once its server is known
+    client = pool.acquire(
+        entry.entry_id,
         username=entry.data["username"],
         password=entry.data["password"],
         database=entry.data["database"],
-        session=session,
+        session=async_get_clientsession(hass),
+        capture_path=(
+            hass.config.path(CAPTURE_FILE.format(entry.entry_id))
+            if entry.options.get(CONF_CAPTURE_API, DEFAULT_CAPTURE_API)
+            else None
+        ),
+        device_groups=entry.options.get(CONF_DEVICE_GROUPS, DEFAULT_DEVICE_GROUPS),
+        active_only=entry.options.get(
+            CONF_ACTIVE_DEVICES_ONLY, DEFAULT_ACTIVE_DEVICES_ONLY
+        ),
     )
 
-    # Circuit breaker state
-    consecutive_failures = 0
-    circuit_open_since = None
-
-    # Trip fetch caching state
-    last_trip_fetch: float = 0.0
-    cached_trip_data: dict[str, dict] = {}
-
-    # Create the DataUpdateCoordinator
-    async def async_update_data():
-        """Fetch data from API endpoint."""
-        nonlocal consecutive_failures, circuit_open_since
-        nonlocal last_trip_fetch, cached_trip_data
-
-        # If the circuit is open, skip the update until the reset delay has elapsed
-        if circuit_open_since is not None:
-            elapsed = (dt_util.utcnow() - circuit_open_since).total_seconds()
-            if elapsed < CIRCUIT_BREAKER_RESET_DELAY:
-                remaining = int(CIRCUIT_BREAKER_RESET_DELAY - elapsed)
-                _LOGGER.warning(
-                    "Geotab circuit breaker open, skipping update. Retrying in %ds.",
-                    remaining,
-                )
-                raise UpdateFailed(f"Circuit breaker open, retrying in {remaining}s")
-            _LOGGER.info("Geotab circuit breaker: attempting reset.")
-            circuit_open_since = None
-            consecutive_failures = 0
-
-        # Determine if we should fetch trips this cycle
-        now = dt_util.utcnow().timestamp()
-        include_trips = (now - last_trip_fetch) >= TRIP_FETCH_INTERVAL
-
-        try:
-            data = await client.async_get_full_device_data(include_trips=include_trips)
-
-            if include_trips:
-                last_trip_fetch = now
-                # Cache trip data for cycles where trips are skipped
-                cached_trip_data = {}
-                for device_id, device_data in data.items():
-                    if "last_trip" in device_data:
-                        cached_trip_data[device_id] = {
-                            "last_trip": device_data["last_trip"],
-                            "trip_history": device_data.get("trip_history", []),
-                        }
-            else:
-                # Inject cached trip data
-                for device_id, trip_cache in cached_trip_data.items():
-                    if device_id in data:
-                        data[device_id].update(trip_cache)
-
-            if consecutive_failures:
-                _LOGGER.info(
-                    "Geotab API recovered after %d failure(s).", consecutive_failures
-                )
-            consecutive_failures = 0
-
-            device_count = len(data)
-            _LOGGER.debug(
-                "Geotab update: %d device(s), trips=%s",
-                device_count,
-                "fetched" if include_trips else "cached",
-            )
-
-            return data
-        except InvalidAuth as err:
-            # Auth errors won't fix themselves; notify HA to prompt re-auth
-            raise ConfigEntryAuthFailed(f"Invalid authentication: {err}") from err
-        except (ApiError, Exception) as err:
-            consecutive_failures += 1
-            if consecutive_failures >= CIRCUIT_BREAKER_MAX_FAILURES:
-                circuit_open_since = dt_util.utcnow()
-                _LOGGER.error(
-                    "Geotab circuit breaker opened after %d consecutive failures. "
-                    "Pausing updates for %ds.",
-                    consecutive_failures,
-                    CIRCUIT_BREAKER_RESET_DELAY,
-                )
-            raise UpdateFailed(f"Error communicating with API: {err}") from err
-
-    scan_interval = entry.options.get(
-        CONF_SCAN_INTERVAL,
-        entry.data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
-    )
-    coordinator = DataUpdateCoordinator(
-        hass,
-        _LOGGER,
-        name="geotab_devices",
-        update_method=async_update_data,
-        update_interval=timedelta(seconds=scan_interval),
-    )
-
-    # Fetch initial data so we have our devices ready
-    await coordinator.async_config_entry_first_refresh()
+    coordinator = GeotabDataUpdateCoordinator(hass, entry, client)
+
+    # Fetch initial data so we have our devices ready. A restored session
+    # already names the entry's server, so its first refresh can use the
+    # fault names other entries on that server have loaded.
+    try:
+        await coordinator.async_restore_session()
+        pool.resolve(entry.entry_id)
+        await coordinator.async_config_entry_first_refresh()
+    except Exception:
+        pool.release(entry.entry_id)
+        raise
+    pool.resolve(entry.entry_id)
+    if coordinator.update_interval:
+        # Polls are scheduled once the platforms add listeners
+        coordinator.stagger_first_poll(
+            pool.stagger_seconds(entry.entry_id, coordinator.update_interval.total_seconds())
+        )
+
+    if entry.options.get(CONF_LIVE_FEED, DEFAULT_LIVE_FEED):
+        coordinator.async_start_live_feed()
 
     # Add update listener for options
     entry.async_on_unload(entry.add_update_listener(async_reload_entry))
 
     # Store the coordinator in hass.data
-    coordinator.config_entry = entry
     hass.data[DOMAIN][entry.entry_id] = coordinator
 
     # Register the refresh service (once per domain)
@@ -155,11 +130,66 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         async def handle_refresh(call: ServiceCall) -> None:
             """Handle the geotab.refresh service call."""
             _LOGGER.info("Geotab manual refresh requested via service call")
-            for coord in hass.data.get(DOMAIN, {}).values():
-                if isinstance(coord, DataUpdateCoordinator):
-                    await coord.async_request_refresh()
+            entry_ids = call.data.get("entry_id")
+            streams = frozenset(call.data.get("stream") or ALL_STREAMS)
+            targets: dict[str, list[str] | None] = {
+                entry_id: None
+                for entry_id, coord in hass.data.get(DOMAIN, {}).items()
+                if isinstance(coord, GeotabDataUpdateCoordinator)
+                and (entry_ids is None or entry_id in entry_ids)
+            }
+            if device_ids := call.data.get("device_id"):
+                targets = {
+                    entry_id: ids
+                    for entry_id, ids in _async_geotab_device_ids(hass, device_ids).items()
+                    if entry_id in targets
+                }
+
+            # Entries refresh in parallel, a few at a time
+            semaphore = asyncio.Semaphore(REFRESH_CONCURRENCY)
+
+            async def _refresh(entry_id: str, ids: list[str] | None) -> None:
+                async with semaphore:
+                    await hass.data[DOMAIN][entry_id].async_refresh_scope(ids, streams)
+
+            await asyncio.gather(
+                *(_refresh(entry_id, ids) for entry_id, ids in targets.items())
+            )
 
-        hass.services.async_register(DOMAIN, SERVICE_REFRESH, handle_refresh)
+        hass.services.async_register(
+            DOMAIN, SERVICE_REFRESH, handle_refresh, schema=REFRESH_SCHEMA
+        )
+
+    # Register the profile service (once per domain)
+    if not hass.services.has_service(DOMAIN, SERVICE_PROFILE):
+
+        async def handle_profile(call: ServiceCall) -> ServiceResponse:
+            """Handle the geotab.profile service call."""
+            refreshes = call.data["refreshes"]
+            coordinators = [
+                coord
+                for coord in hass.data.get(DOMAIN, {}).values()
+                if isinstance(coord, GeotabDataUpdateCoordinator)
+            ]
+            for coord in coordinators:
+                coord.async_start_profile(refreshes, call.data["top"])
+            if not call.return_response:
+                # Profile the scheduled refreshes; summaries go to the diagnostics
+                return None
+            for _ in range(refreshes):
+                for coord in coordinators:
+                    await coord.async_refresh()
+            return {
+                coord.config_entry.entry_id: coord.profile_summary for coord in coordinators
+            }
+
+        hass.services.async_register(
+            DOMAIN,
+            SERVICE_PROFILE,
+            handle_profile,
+            schema=PROFILE_SCHEMA,
+            supports_response=SupportsResponse.OPTIONAL,
+        )
 
     # Set up the platforms
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
@@ -167,6 +197,24 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return True
 
 
+@callback
+def _async_geotab_device_ids(
+    hass: HomeAssistant, device_ids: list[str]
+) -> dict[str, list[str]]:
+    """Map device registry IDs to Geotab device IDs per config entry."""
+    device_registry = dr.async_get(hass)
+    targets: dict[str, list[str]] = {}
+    for device_id in device_ids:
+        if (device := device_registry.async_get(device_id)) is None:
+            continue
+        for domain, geotab_id in device.identifiers:
+            if domain != DOMAIN:
+                continue
+            for entry_id in device.config_entries:
+                targets.setdefault(entry_id, []).append(geotab_id)
+    return targets
+
+
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Reload config entry."""
     await hass.config_entries.async_reload(entry.entry_id)
@@ -177,5 +225,14 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
         if DOMAIN in hass.data:
             hass.data[DOMAIN].pop(entry.entry_id, None)
+        if (pool := hass.data.get(DATA_CLIENT_POOL)) is not None:
+            pool.release(entry.entry_id)
 
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the persisted API session of a removed entry."""
+    await Store(
+        hass, SESSION_STORAGE_VERSION, SESSION_STORAGE_KEY.format(entry.entry_id)
+    ).async_remove()
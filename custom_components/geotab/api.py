@@ -5,19 +5,123 @@ from __future__ import annotations
 import asyncio
 import logging
 import socket
-from collections import defaultdict
+import time
+import zlib
+from collections import Counter, defaultdict
+from collections.abc import Callable, Hashable, Mapping
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
-from typing import Any
+from functools import partial
+from typing import TYPE_CHECKING, Any, TypeVar
 
 import aiohttp
 
-from .const import DIAGNOSTICS_TO_FETCH
+from .batching import BatchSizeController
+from .const import (
+    ALL_STREAMS,
+    DIAGNOSTICS_TO_FETCH,
+    LIVE_STREAMS,
+    STREAM_FAULTS,
+    STREAM_STATUS,
+    STREAM_TRIPS,
+)
+from .decoder import (
+    PositionRecord,
+    decode_faults,
+    decode_log_records,
+    decode_statuses,
+    decode_trips,
+)
+from .executor import BoundedExecutor
+from .feed import FEED_RESULTS_LIMIT
+from .models import EMPTY_LAYER, DeviceSnapshot
+from .performance import (
+    PHASE_DEVICE_FETCH,
+    PHASE_FAULT_LOOKUP,
+    PHASE_MERGE,
+    PHASE_MULTI_CALL,
+    PHASE_PARSE,
+    CacheStats,
+    PollTimer,
+    RefreshDeadline,
+)
+from .profiling import RefreshProfiler
+
+if TYPE_CHECKING:
+    import requests
 
 _LOGGER = logging.getLogger(__name__)
 
 TRIP_HISTORY_DAYS = 30
 TRIP_RESULTS_LIMIT = 250
 FAULT_RESULTS_PER_DEVICE = 10
+# Seconds allowed per call when no refresh deadline is given
+AUTH_TIMEOUT = 10
+FETCH_TIMEOUT = 45
+FAULT_LOOKUP_TIMEOUT = 20
+GROUP_FETCH_TIMEOUT = 20
+FEED_TIMEOUT = 30
+# The fault-name lookup is deferred when less than this is left of a deadline
+FAULT_LOOKUP_RESERVE = 5
+# Extra requests one refresh may spend isolating the sub-calls of a failed multi_call
+MULTI_CALL_RETRY_REQUESTS = 6
+# Server errors that fail a multi_call whatever sub-calls it holds
+_BATCH_ERRORS = frozenset(
+    {"InvalidUserException", "OverLimitException", "DbUnavailableException"}
+)
+# Result of a sub-call that kept failing
+_FAILED: Any = object()
+
+_T = TypeVar("_T")
+
+
+@dataclass
+class _ParsedResults:
+    """Decoded multi_call results, keyed by device ID."""
+
+    status: dict[str, dict[str, Any]] = field(default_factory=dict)
+    diagnostics: defaultdict[str, dict[str, Any]] = field(
+        default_factory=lambda: defaultdict(dict)
+    )
+    faults: defaultdict[str, list[dict[str, Any]]] = field(
+        default_factory=lambda: defaultdict(list)
+    )
+    trips: dict[str, list[dict[str, Any]]] = field(default_factory=dict)
+    # Position-only status of every device, from the light call of a sharded refresh
+    positions: dict[str, dict[str, Any]] = field(default_factory=dict)
+    # call_map keys whose sub-call failed or could not be decoded
+    failed: set[str] = field(default_factory=set)
+
+    def stream_failed(self, stream: str, device_id: str) -> bool:
+        """Return True if a device's data for a stream could not be fetched."""
+        if stream == STREAM_TRIPS:
+            return f"trip_{device_id}" in self.failed
+        return stream in self.failed or f"{stream}_{device_id}" in self.failed
+
+
+def device_shard(device_id: str, shards: int) -> int:
+    """Return the polling shard of a device, stable across restarts."""
+    return zlib.crc32(device_id.encode()) % shards
+
+
+class DiagnosticsLookup:
+    """Fault diagnostic names, shareable by the clients of one server."""
+
+    __slots__ = ("names", "version")
+
+    def __init__(self) -> None:
+        """Initialize an empty lookup."""
+        self.names: Mapping[str, str] = {}
+        # Bumped whenever the names change so consumers can cache anything
+        # derived from them
+        self.version = 0
+
+    def merge(self, loaded: Mapping[str, str]) -> None:
+        """Add loaded names, replacing the mapping only when something changed."""
+        if any(self.names.get(key) != name for key, name in loaded.items()):
+            # Copy on change: snapshots from earlier polls keep their lookup
+            self.names = {**self.names, **loaded}
+            self.version += 1
 
 
 class GeotabApiClientError(Exception):
@@ -32,6 +136,10 @@ class ApiError(GeotabApiClientError):
     """Exception for API errors."""
 
 
+class FetchTimeout(ApiError):
+    """Exception for a fetch that did not finish within its deadline."""
+
+
 class GeotabApiClient:
     """Geotab API Client."""
 
@@ -41,32 +149,134 @@ class GeotabApiClient:
         password: str,
         database: str | None,
         session: aiohttp.ClientSession,
+        endpoint: str | None = None,
+        capture_path: str | None = None,
+        replay_path: str | None = None,
+        diagnostics_lookup: DiagnosticsLookup | None = None,
+        http_session: requests.Session | None = None,
+        device_groups: list[str] | None = None,
+        active_only: bool = False,
     ) -> None:
-        """Initialize the API client."""
-        import mygeotab
-
+        """Initialize the API client.
+
+        Requests go through GeotabJsonRpc to the server federation resolves.
+        endpoint points the client at a specific JSON-RPC URL instead, such
+        as a local emulator. capture_path records every request and response
+        to a redacted capture file and replay_path answers requests from such
+        a file instead of the network. diagnostics_lookup may be shared with
+        other clients of the same server and http_session with any other
+        client. device_groups (Geotab
+        group IDs) and active_only limit the fleet to the devices in those
+        groups and to devices that are still active, in the search itself.
+        """
         self._username = username
         self._password = password
         self._database = database
         self._session = session
-        self.client = mygeotab.API(
-            username=self._username,
-            password=self._password,
-            database=self._database,
-        )
+        self.device_groups = list(device_groups or [])
+        self.active_only = active_only
+        if replay_path:
+            from .capture import ReplayTransport
+
+            self.client = ReplayTransport(replay_path)
+        else:
+            from .transport import GeotabJsonRpc
+
+            self.client = GeotabJsonRpc(
+                username=self._username,
+                password=self._password,
+                database=self._database,
+                endpoint=endpoint,
+                http_session=http_session,
+            )
+        if capture_path:
+            from .capture import CaptureTransport
+
+            self.client = CaptureTransport(self.client, capture_path)
         self._diagnostic_keys_by_id = {
             diagnostic_id: key for key, diagnostic_id in DIAGNOSTICS_TO_FETCH.items()
         }
-        self._diagnostics_lookup_cache: dict[str, str] = {}
+        self.diagnostics_lookup = diagnostics_lookup or DiagnosticsLookup()
+        # Device metadata from the previous poll, reused while unchanged
+        self._device_cache: dict[str, dict[str, Any]] = {}
+        # Diagnostics counters: API calls per method and cache effectiveness
+        self.call_counts: Counter[str] = Counter()
+        self.device_cache_stats = CacheStats()
+        self.diagnostics_lookup_stats = CacheStats()
+        # Fault-name lookups put off because the refresh deadline was close
+        self.deferred_fault_lookups = 0
+        # Set by the coordinator while a profile is being recorded
+        self.profiler: RefreshProfiler | None = None
+        # Blocking calls run on this client's own threads, never HA's executor
+        self.executor = BoundedExecutor()
+        # Sub-calls per ExecuteMultiCall, adapted to the server's latency
+        self.batch_sizer = BatchSizeController()
+
+    @property
+    def diagnostics_lookup_size(self) -> int:
+        """Return the number of cached fault diagnostic names."""
+        return len(self.diagnostics_lookup.names)
+
+    @property
+    def session(self) -> dict[str, str] | None:
+        """Return the authenticated session and resolved server, for persisting."""
+        credentials = getattr(self.client, "credentials", None)
+        if credentials is None or not credentials.session_id:
+            return None
+        return {
+            "username": self._username,
+            "database": self._database or "",
+            "session_id": credentials.session_id,
+            "session_database": credentials.database,
+            "server": credentials.server,
+        }
+
+    @property
+    def server(self) -> str | None:
+        """Return the server of the client's session, None until one is resolved."""
+        credentials = getattr(self.client, "credentials", None)
+        if credentials is None or not credentials.session_id:
+            return None
+        return credentials.server
+
+    @property
+    def transport_stats(self) -> dict[str, Any] | None:
+        """Return codec and traffic counters of transports that keep them."""
+        if (as_dict := getattr(self.client, "as_dict", None)) is None:
+            return None
+        return as_dict()
+
+    def restore_session(self, stored: Mapping[str, Any]) -> bool:
+        """Reuse a persisted session so the first call skips authentication.
+
+        Only applies to a client that has no session yet and to a session
+        stored for the same user and database. Returns True if it was used.
+        """
+        credentials = getattr(self.client, "credentials", None)
+        if (
+            credentials is None
+            or credentials.session_id
+            or not stored.get("session_id")
+            or stored.get("username", "").lower() != self._username.lower()
+            or stored.get("database", "").lower() != (self._database or "").lower()
+        ):
+            return False
+        credentials.session_id = stored["session_id"]
+        credentials.database = stored.get("session_database") or credentials.database
+        credentials.server = stored.get("server") or credentials.server
+        return True
 
     async def async_authenticate(self) -> None:
         """Authenticate with the Geotab API."""
         from mygeotab.exceptions import AuthenticationException
 
         try:
-            loop = asyncio.get_running_loop()
+            self.call_counts["Authenticate"] += 1
             await asyncio.wait_for(
-                loop.run_in_executor(None, self.client.authenticate), timeout=10
+                self._run_blocking(
+                    self.client.authenticate, "authenticate", reauthenticate=False
+                ),
+                timeout=AUTH_TIMEOUT,
             )
         except AuthenticationException as err:
             raise InvalidAuth("Invalid username, password, or database") from err
@@ -77,38 +287,120 @@ class GeotabApiClient:
         except Exception as err:
             raise ApiError(f"An unexpected error occurred: {err}") from err
 
-    def _blocking_fetch_all(self, include_trips: bool = True) -> tuple[list, list, list]:
-        """Fetch devices and supporting data synchronously."""
-        devices = self.client.get("Device")
-        if not devices:
-            return [], [], []
+    def _blocking_with_session(self, func: Callable[[], _T]) -> _T:
+        """Run a blocking call, authenticating afresh once if the session is rejected."""
+        from mygeotab.exceptions import AuthenticationException
 
-        device_ids = [device["id"] for device in devices if device.get("id")]
-        diagnostics = [{"id": diagnostic_id} for diagnostic_id in DIAGNOSTICS_TO_FETCH.values()]
-
-        calls: list[tuple[str, dict[str, Any]]] = [
-            (
-                "Get",
-                {
-                    "typeName": "DeviceStatusInfo",
-                    "search": {"diagnostics": diagnostics},
-                },
-            ),
-            (
-                "Get",
-                {
-                    "typeName": "FaultData",
-                    "search": {
-                        "deviceSearch": {"deviceIds": device_ids},
-                        "state": "Active",
+        try:
+            return func()
+        except AuthenticationException:
+            credentials = getattr(self.client, "credentials", None)
+            if credentials is None:
+                raise
+        _LOGGER.debug("Geotab session rejected, authenticating again")
+        # Authenticate with the password even if the credentials no longer hold it
+        credentials.session_id = None
+        credentials.password = self._password
+        self.call_counts["Authenticate"] += 1
+        try:
+            return func()
+        except AuthenticationException as err:
+            raise InvalidAuth("Invalid username, password, or database") from err
+
+    def _run_blocking(
+        self,
+        func: Callable[[], _T],
+        key: Hashable | None = None,
+        reauthenticate: bool = True,
+    ) -> asyncio.Future[_T]:
+        """Run a blocking call on the client executor.
+
+        Calls with the same key as a pending one share its result. The
+        returned future is shielded so a timed-out waiter does not cancel a
+        call that others are waiting for; the executor bounds the threads.
+        """
+        if reauthenticate:
+            func = partial(self._blocking_with_session, func)
+        if (profiler := self.profiler) is not None:
+            func = partial(profiler.call, func)
+        return asyncio.shield(asyncio.wrap_future(self.executor.submit(func, key)))
+
+    def close(self) -> None:
+        """Release the client's threads and any connections it does not share."""
+        self.executor.shutdown()
+        if (close := getattr(self.client, "close", None)) is not None:
+            close()
+
+    def _device_search(self) -> dict[str, Any]:
+        """Return the DeviceSearch limiting the fleet, empty for every device."""
+        search: dict[str, Any] = {}
+        if self.device_groups:
+            search["groups"] = [{"id": group_id} for group_id in self.device_groups]
+        if self.active_only:
+            # Devices active at or after now, so archived ones are left out
+            search["fromDate"] = datetime.now(timezone.utc).isoformat()
+        return search
+
+    def _build_position_call(self) -> tuple[str, dict[str, Any]]:
+        """Build the light fleet-wide status call, without any diagnostics."""
+        search: dict[str, Any] = {}
+        if device_search := self._device_search():
+            search["deviceSearch"] = device_search
+        return ("Get", {"typeName": "DeviceStatusInfo", "search": search})
+
+    def _build_calls(
+        self,
+        device_ids: list[str],
+        streams: frozenset[str],
+        fleet_status: bool = True,
+    ) -> tuple[list[tuple[str, dict[str, Any]]], list[str]]:
+        """Build the multi_call sub-calls for the given devices and streams.
+
+        With fleet_status, live status comes from one fleet-wide call;
+        otherwise it is requested per device.
+        """
+        calls: list[tuple[str, dict[str, Any]]] = []
+        call_map: list[str] = []
+
+        if STREAM_STATUS in streams:
+            diagnostics = [
+                {"id": diagnostic_id} for diagnostic_id in DIAGNOSTICS_TO_FETCH.values()
+            ]
+            fleet_search: dict[str, Any] = {"diagnostics": diagnostics}
+            if device_search := self._device_search():
+                fleet_search["deviceSearch"] = device_search
+            status_searches = (
+                [("status", fleet_search)]
+                if fleet_status
+                else [
+                    (
+                        f"status_{device_id}",
+                        {"deviceSearch": {"id": device_id}, "diagnostics": diagnostics},
+                    )
+                    for device_id in device_ids
+                ]
+            )
+            for key, search in status_searches:
+                calls.append(("Get", {"typeName": "DeviceStatusInfo", "search": search}))
+                call_map.append(key)
+
+        if STREAM_FAULTS in streams:
+            calls.append(
+                (
+                    "Get",
+                    {
+                        "typeName": "FaultData",
+                        "search": {
+                            "deviceSearch": {"deviceIds": device_ids},
+                            "state": "Active",
+                        },
+                        "resultsLimit": max(len(device_ids) * FAULT_RESULTS_PER_DEVICE, 20),
                     },
-                    "resultsLimit": max(len(device_ids) * FAULT_RESULTS_PER_DEVICE, 20),
-                },
-            ),
-        ]
-        call_map = ["status", "faults"]
+                )
+            )
+            call_map.append("faults")
 
-        if include_trips:
+        if STREAM_TRIPS in streams:
             from_date = (
                 datetime.now(timezone.utc) - timedelta(days=TRIP_HISTORY_DAYS)
             ).isoformat()
@@ -128,11 +420,177 @@ class GeotabApiClient:
                 )
                 call_map.append(f"trip_{device_id}")
 
-        results = self.client.multi_call(calls)
-        return devices, results, call_map
+        return calls, call_map
+
+    def _blocking_multi_call(
+        self,
+        calls: list[tuple[str, dict[str, Any]]],
+        timer: PollTimer,
+        record: bool = True,
+    ) -> list[Any]:
+        """Execute sub-calls as one ExecuteMultiCall and count them.
+
+        With record, the round trip feeds the batch size controller. Quota and
+        session errors say nothing about the batch size and are not recorded.
+        """
+        from mygeotab.exceptions import AuthenticationException
+
+        self.call_counts["ExecuteMultiCall"] += 1
+        self.call_counts.update(f"{method}({params['typeName']})" for method, params in calls)
+        start = time.monotonic()
+        try:
+            with timer.phase(PHASE_MULTI_CALL):
+                results = self.client.multi_call(calls)
+        except Exception as err:
+            if record and not (
+                isinstance(err, AuthenticationException)
+                or getattr(err, "name", None) in _BATCH_ERRORS
+            ):
+                self.batch_sizer.record(len(calls), time.monotonic() - start, success=False)
+            raise
+        if record:
+            self.batch_sizer.record(len(calls), time.monotonic() - start, success=True)
+        return results
+
+    def _blocking_isolated_multi_call(
+        self, calls: list[tuple[str, dict[str, Any]]], timer: PollTimer
+    ) -> list[Any]:
+        """Execute sub-calls in adaptive batches, isolating sub-calls that fail.
+
+        The batch size controller decides how many sub-calls go into one
+        ExecuteMultiCall; live sub-calls come first, so they share the first
+        batch. Geotab fails a whole ExecuteMultiCall when one of its sub-calls
+        fails. The live and the trip sub-calls of a failed batch are then
+        retried as separate batches and batches that fail again are halved,
+        within a budget of extra requests. Sub-calls that keep failing get
+        _FAILED as their result.
+        """
+        from mygeotab.exceptions import MyGeotabException
+
+        results: list[Any] = [_FAILED] * len(calls)
+        pending: list[list[int]] = []
+        error: MyGeotabException | None = None
+        for batch in self.batch_sizer.split(len(calls)):
+            try:
+                batch_results = self._blocking_multi_call(
+                    [calls[index] for index in batch], timer
+                )
+            except MyGeotabException as err:
+                if err.name in _BATCH_ERRORS:
+                    raise
+                _LOGGER.debug(
+                    "multi_call of %d sub-calls failed (%s), isolating", len(batch), err
+                )
+                error = err
+                if len(batch) > 1:
+                    pending += [
+                        group
+                        for group in (
+                            [index for index in batch if calls[index][1]["typeName"] != "Trip"],
+                            [index for index in batch if calls[index][1]["typeName"] == "Trip"],
+                        )
+                        if group
+                    ]
+                continue
+            for index, result in zip(batch, batch_results):
+                results[index] = result
+        if error is None:
+            return results
+
+        budget = MULTI_CALL_RETRY_REQUESTS
+        while pending and budget:
+            group = pending.pop(0)
+            budget -= 1
+            self.call_counts["ExecuteMultiCall(retry)"] += 1
+            try:
+                batch_results = self._blocking_multi_call(
+                    [calls[index] for index in group], timer, record=False
+                )
+            except MyGeotabException as err:
+                if err.name in _BATCH_ERRORS:
+                    raise
+                if len(group) > 1:
+                    half = len(group) // 2
+                    pending += [group[:half], group[half:]]
+                continue
+            for index, result in zip(group, batch_results):
+                results[index] = result
+
+        failed = sum(1 for result in results if result is _FAILED)
+        if failed == len(calls):
+            raise error
+        self.call_counts["failed_sub_calls"] += failed
+        return results
+
+    def _blocking_fetch_all(
+        self,
+        include_trips: bool,
+        timer: PollTimer,
+        shard: tuple[int, int] | None = None,
+        known: frozenset[str] = frozenset(),
+    ) -> tuple[list, list, list, set[str] | None]:
+        """Fetch devices and supporting data synchronously.
+
+        With a shard (index, count), only the devices of that shard and
+        devices not in known get their status, faults and trips; the rest of
+        the fleet gets positions from one light call. The IDs of the devices
+        fetched in full are returned, or None when that is every device.
+        """
+        self.call_counts["Get(Device)"] += 1
+        with timer.phase(PHASE_DEVICE_FETCH):
+            if search := self._device_search():
+                devices = self.client.get("Device", search=search)
+            else:
+                devices = self.client.get("Device")
+        timer.count("device", devices)
+        if not devices:
+            return [], [], [], None
+
+        device_ids = [device["id"] for device in devices if device.get("id")]
+        streams = ALL_STREAMS if include_trips else LIVE_STREAMS
+        if shard is None:
+            calls, call_map = self._build_calls(device_ids, streams)
+            detail_ids = None
+        else:
+            index, count = shard
+            detail = [
+                device_id
+                for device_id in device_ids
+                if device_id not in known or device_shard(device_id, count) == index
+            ]
+            detail_calls, detail_map = self._build_calls(detail, streams, fleet_status=False)
+            calls = [self._build_position_call(), *detail_calls]
+            call_map = ["position", *detail_map]
+            detail_ids = set(detail)
+        return (
+            devices,
+            self._blocking_isolated_multi_call(calls, timer),
+            call_map,
+            detail_ids,
+        )
+
+    def _blocking_get_groups(self) -> dict[str, str]:
+        """Return the names of the database's groups by ID."""
+        self.call_counts["Get(Group)"] += 1
+        groups: dict[str, str] = {}
+        for group in self.client.get("Group"):
+            if isinstance(group, dict) and (group_id := group.get("id")):
+                groups[group_id] = group.get("name") or group_id
+        return groups
+
+    def _blocking_get_log_feed(self, from_version: str | None) -> dict[str, Any]:
+        """Get the LogRecords logged since a feed version, or from now without one."""
+        self.call_counts["GetFeed(LogRecord)"] += 1
+        params: dict[str, Any] = {"typeName": "LogRecord", "resultsLimit": FEED_RESULTS_LIMIT}
+        if from_version is None:
+            params["search"] = {"fromDate": datetime.now(timezone.utc).isoformat()}
+        else:
+            params["fromVersion"] = from_version
+        return self.client.call("GetFeed", **params)
 
     def _blocking_load_fault_diagnostics(self) -> dict[str, str]:
         """Load diagnostic names for Geotab Go faults on demand."""
+        self.call_counts["Get(Diagnostic)"] += 1
         result = self.client.get("Diagnostic", search={"diagnosticType": "GoFault"})
         lookup: dict[str, str] = {}
         for diagnostic in result:
@@ -144,100 +602,263 @@ class GeotabApiClient:
                 lookup[diagnostic_id] = diagnostic_name
         return lookup
 
-    def _extract_status_diagnostics(self, status_info: dict[str, Any]) -> dict[str, Any]:
-        """Extract latest diagnostics already embedded in DeviceStatusInfo."""
-        diagnostics: dict[str, Any] = {}
-        for item in status_info.get("statusData", []):
-            if not isinstance(item, dict):
-                continue
-            diagnostic = item.get("diagnostic")
-            if not isinstance(diagnostic, dict):
-                continue
-            diagnostic_id = diagnostic.get("id")
-            diagnostic_key = self._diagnostic_keys_by_id.get(diagnostic_id)
-            if diagnostic_key is None or item.get("data") is None:
-                continue
-            diagnostics[diagnostic_key] = item["data"]
-        return diagnostics
+    async def _async_parse_results(
+        self,
+        results: list[Any],
+        call_map: list[str],
+        timer: PollTimer,
+        deadline: RefreshDeadline | None = None,
+    ) -> _ParsedResults:
+        """Decode multi_call results and resolve unknown fault diagnostic names.
+
+        The name lookup is optional: close to the deadline, or when it runs
+        out of time, it is left to a later refresh.
+        """
+        parsed = _ParsedResults()
+        diagnostics_lookup = self.diagnostics_lookup.names
+        unknown_fault_diagnostic_ids: set[str] = set()
+
+        with timer.phase(PHASE_PARSE):
+            for index, key in enumerate(call_map):
+                result = results[index]
+                if result is _FAILED:
+                    parsed.failed.add(key)
+                    continue
+
+                # A result that cannot be decoded only costs its own sub-call
+                try:
+                    if key == "position":
+                        timer.count("status", result)
+                        for status in decode_statuses(result, self._diagnostic_keys_by_id):
+                            parsed.positions[status.device_id] = status.payload
+
+                    elif key == STREAM_STATUS or key.startswith("status_"):
+                        timer.count("status", result)
+                        statuses = decode_statuses(result, self._diagnostic_keys_by_id)
+                        for status in statuses:
+                            parsed.diagnostics[status.device_id].update(status.diagnostics)
+                            parsed.status[status.device_id] = status.payload
+
+                    elif key == STREAM_FAULTS:
+                        timer.count("faults", result)
+                        for fault in decode_faults(result):
+                            parsed.faults[fault.device_id].append(fault.payload)
+                            diagnostic_id = fault.diagnostic_id
+                            if not diagnostic_id:
+                                continue
+                            if diagnostic_id in diagnostics_lookup:
+                                self.diagnostics_lookup_stats.hit()
+                            else:
+                                self.diagnostics_lookup_stats.miss()
+                                unknown_fault_diagnostic_ids.add(diagnostic_id)
+
+                    elif key.startswith("trip_"):
+                        timer.count("trips", result)
+                        if trips := decode_trips(result):
+                            parsed.trips[key[5:]] = trips
+                except Exception as err:
+                    _LOGGER.warning("Could not decode Geotab %s result: %s", key, err)
+                    self.call_counts["failed_sub_calls"] += 1
+                    parsed.failed.add(key)
+
+        if unknown_fault_diagnostic_ids:
+            if deadline is not None and not deadline.allows(FAULT_LOOKUP_RESERVE):
+                self.deferred_fault_lookups += 1
+                return parsed
+            try:
+                with timer.phase(PHASE_FAULT_LOOKUP):
+                    loaded_lookup = await asyncio.wait_for(
+                        self._run_blocking(
+                            self._blocking_load_fault_diagnostics, "fault_lookup"
+                        ),
+                        timeout=(
+                            deadline.timeout(FAULT_LOOKUP_TIMEOUT)
+                            if deadline is not None
+                            else FAULT_LOOKUP_TIMEOUT
+                        ),
+                    )
+            except asyncio.TimeoutError:
+                if deadline is None:
+                    raise
+                _LOGGER.debug("Geotab fault name lookup ran out of time, deferred")
+                self.deferred_fault_lookups += 1
+                return parsed
+            timer.count("diagnostics", loaded_lookup)
+            self.diagnostics_lookup.merge(loaded_lookup)
+
+        return parsed
+
+    def _build_snapshot(
+        self,
+        device: Mapping[str, Any],
+        diag_data: Mapping[str, Any],
+        status_info: Mapping[str, Any] | None,
+        active_faults: list[dict[str, Any]] | None,
+        trip_list: list[dict[str, Any]] | None,
+        stale: frozenset[str] = frozenset(),
+        refreshed_at: datetime | None = None,
+    ) -> DeviceSnapshot:
+        """Assemble one device's snapshot and its derived values."""
+        device_name = device.get("name", device.get("id"))
+        derived: dict[str, Any] = {}
+
+        if diag_data.get("odometer", device.get("odometer")) is None:
+            if diag_data.get("odometer_raw") is not None:
+                derived["odometer"] = diag_data["odometer_raw"]
+            elif diag_data.get("total_distance") is not None:
+                derived["odometer"] = diag_data["total_distance"]
+
+        engine_hours = diag_data.get("engine_hours", device.get("engine_hours"))
+        if engine_hours is None and diag_data.get("engine_hours_raw") is not None:
+            derived["engine_hours"] = engine_hours = diag_data["engine_hours_raw"]
+
+        if diag_data:
+            _LOGGER.debug("[%s] %d diagnostic values available", device_name, len(diag_data))
+
+        if trip_list:
+            if engine_hours is None and "engineHours" in trip_list[0]:
+                derived["engine_hours"] = trip_list[0]["engineHours"]
+            _LOGGER.debug("[%s] %d valid trips loaded", device_name, len(trip_list))
+
+        if status_info:
+            if diag_data.get("rpm", 0) > 0:
+                derived["ignition"] = 1
+            elif status_info.get("isIgnitionOn") is not None:
+                derived["ignition"] = 1 if status_info["isIgnitionOn"] else 0
+            elif status_info.get("isDriving") is False and status_info.get("speed", 0) == 0:
+                derived["ignition"] = 0
+
+        return DeviceSnapshot(
+            device=device,
+            diagnostics=diag_data,
+            status=status_info or EMPTY_LAYER,
+            derived=derived or EMPTY_LAYER,
+            active_faults=active_faults,
+            trip_history=trip_list or None,
+            diagnostics_lookup=self.diagnostics_lookup.names,
+            diagnostics_lookup_version=self.diagnostics_lookup.version,
+            stale=stale,
+            refreshed_at=refreshed_at,
+        )
+
+    def _merge_device(
+        self,
+        device: Mapping[str, Any],
+        parsed: _ParsedResults,
+        streams: frozenset[str],
+        old: DeviceSnapshot | None,
+    ) -> DeviceSnapshot:
+        """Build a device's snapshot from the fetched streams.
+
+        Streams that were not fetched keep their values from old, except
+        that a position from a sharded refresh replaces the old status. So do
+        streams whose sub-call failed, which are marked stale until a later
+        refresh fetches them.
+        """
+        device_id = device["id"]
+        failed = {stream for stream in streams if parsed.stream_failed(stream, device_id)}
+        stale = frozenset(failed | (old.stale - streams if old is not None else set()))
+
+        refreshed_at = old.refreshed_at if old is not None else None
+        if STREAM_STATUS in streams and STREAM_STATUS not in failed:
+            diag_data = parsed.diagnostics.get(device_id, EMPTY_LAYER)
+            status_info = parsed.status.get(device_id)
+            refreshed_at = datetime.now(timezone.utc)
+        elif old is not None:
+            diag_data, status_info = old.diagnostics, old.status
+        else:
+            diag_data, status_info = EMPTY_LAYER, None
+        if STREAM_STATUS not in streams and device_id in parsed.positions:
+            status_info = parsed.positions[device_id]
+
+        if STREAM_FAULTS in streams and STREAM_FAULTS not in failed:
+            active_faults = parsed.faults.get(device_id)
+        else:
+            active_faults = old.active_faults if old is not None else None
+
+        if STREAM_TRIPS in streams and STREAM_TRIPS not in failed:
+            trip_list = parsed.trips.get(device_id)
+        else:
+            trip_list = old.trip_history if old is not None else None
+
+        return self._build_snapshot(
+            device, diag_data, status_info, active_faults, trip_list, stale, refreshed_at
+        )
+
+    async def async_get_groups(self) -> dict[str, str]:
+        """Get the names of the database's groups by ID."""
+        try:
+            return await asyncio.wait_for(
+                self._run_blocking(self._blocking_get_groups, "groups"),
+                timeout=GROUP_FETCH_TIMEOUT,
+            )
+        except asyncio.TimeoutError as err:
+            raise ApiError("Group fetch timed out") from err
+        except InvalidAuth:
+            raise
+        except Exception as err:
+            raise ApiError(f"Failed to get groups: {err}") from err
+
+    async def async_get_log_feed(
+        self, from_version: str | None = None
+    ) -> tuple[list[PositionRecord], str | None]:
+        """Get the GPS fixes logged since a feed version and the version to poll next."""
+        try:
+            page = await asyncio.wait_for(
+                self._run_blocking(
+                    partial(self._blocking_get_log_feed, from_version),
+                    ("feed", from_version),
+                ),
+                timeout=FEED_TIMEOUT,
+            )
+        except asyncio.TimeoutError as err:
+            raise ApiError("Feed poll timed out") from err
+        except InvalidAuth:
+            raise
+        except Exception as err:
+            raise ApiError(f"Failed to poll the LogRecord feed: {err}") from err
+        if not isinstance(page, dict):
+            return [], from_version
+        return decode_log_records(page.get("data")), page.get("toVersion") or from_version
 
     async def async_get_full_device_data(
-        self, include_trips: bool = True
-    ) -> dict[str, dict[str, Any]]:
-        """Get combined device and status info from the API using multi-calls."""
+        self,
+        include_trips: bool = True,
+        timer: PollTimer | None = None,
+        previous: Mapping[str, DeviceSnapshot] | None = None,
+        deadline: RefreshDeadline | None = None,
+        shard: tuple[int, int] | None = None,
+    ) -> dict[str, DeviceSnapshot]:
+        """Get combined device and status info from the API using multi-calls.
+
+        Data of sub-calls that fail is taken from the previous snapshots, if
+        given, and marked stale. With a deadline, the whole fetch must finish
+        within it; otherwise it may take FETCH_TIMEOUT seconds. With a shard
+        (index, count), only that shard's devices and devices missing from
+        previous are fetched in full; the others keep their previous data
+        with a fresh position.
+        """
+        if timer is None:
+            timer = PollTimer()
+        if deadline is None:
+            deadline = RefreshDeadline(FETCH_TIMEOUT)
         try:
-            loop = asyncio.get_running_loop()
-            devices, results, call_map = await asyncio.wait_for(
-                loop.run_in_executor(None, lambda: self._blocking_fetch_all(include_trips)),
-                timeout=45,
+            known = frozenset(previous or ())
+            devices, results, call_map, detail_ids = await asyncio.wait_for(
+                self._run_blocking(
+                    lambda: self._blocking_fetch_all(include_trips, timer, shard, known),
+                    ("fetch", include_trips, shard),
+                ),
+                timeout=deadline.remaining(),
             )
 
             if not devices:
                 return {}
 
-            status_map: dict[str, dict[str, Any]] = {}
-            diagnostics_map: defaultdict[str, dict[str, Any]] = defaultdict(dict)
-            fault_map: defaultdict[str, list[dict[str, Any]]] = defaultdict(list)
-            trip_results_dict: dict[str, list[dict[str, Any]]] = {}
-            diagnostics_lookup = dict(self._diagnostics_lookup_cache)
-            unknown_fault_diagnostic_ids: set[str] = set()
-
-            for index, key in enumerate(call_map):
-                result = results[index]
-
-                if key == "status" and isinstance(result, list):
-                    for status in result:
-                        if not isinstance(status, dict):
-                            continue
-                        device = status.get("device")
-                        if not isinstance(device, dict) or not device.get("id"):
-                            continue
-                        device_id = device["id"]
-                        status_map[device_id] = status
-                        diagnostics_map[device_id].update(
-                            self._extract_status_diagnostics(status)
-                        )
-
-                elif key == "faults" and isinstance(result, list):
-                    sorted_faults = sorted(
-                        (fault for fault in result if isinstance(fault, dict)),
-                        key=lambda item: item.get("dateTime", ""),
-                        reverse=True,
-                    )
-                    for fault in sorted_faults:
-                        device = fault.get("device")
-                        if isinstance(device, dict) and device.get("id"):
-                            fault_map[device["id"]].append(fault)
-                            diagnostic = fault.get("diagnostic")
-                            if isinstance(diagnostic, dict):
-                                diagnostic_id = diagnostic.get("id")
-                                if diagnostic_id and diagnostic_id not in diagnostics_lookup:
-                                    unknown_fault_diagnostic_ids.add(diagnostic_id)
-
-                elif key.startswith("trip_") and isinstance(result, list):
-                    device_id = key[5:]
-                    real_trips = [
-                        trip
-                        for trip in result
-                        if isinstance(trip, dict) and trip.get("distance", 0) > 0
-                    ]
-                    if real_trips:
-                        trip_results_dict[device_id] = sorted(
-                            real_trips,
-                            key=lambda trip: trip.get("start", ""),
-                            reverse=True,
-                        )
+            parsed = await self._async_parse_results(results, call_map, timer, deadline)
+            streams = ALL_STREAMS if include_trips else LIVE_STREAMS
 
-            if unknown_fault_diagnostic_ids:
-                diagnostics_lookup.update(
-                    await asyncio.wait_for(
-                        loop.run_in_executor(None, self._blocking_load_fault_diagnostics),
-                        timeout=20,
-                    )
-                )
-
-            self._diagnostics_lookup_cache = diagnostics_lookup
-
-            total_diagnostics = sum(len(values) for values in diagnostics_map.values())
+            total_diagnostics = sum(len(values) for values in parsed.diagnostics.values())
             _LOGGER.debug(
                 "Fetched data for %d device(s), %d diagnostic values, trips=%s",
                 len(devices),
@@ -245,62 +866,97 @@ class GeotabApiClient:
                 "included" if include_trips else "cached",
             )
 
-            combined_data: dict[str, dict[str, Any]] = {}
-            for device in devices:
-                device_id = device.get("id")
-                if not device_id:
-                    continue
-
-                device_name = device.get("name", device_id)
-                data: dict[str, Any] = device.copy()
-                diag_data = diagnostics_map.get(device_id, {})
-                data.update(diag_data)
-
-                if data.get("odometer") is None:
-                    if diag_data.get("odometer") is not None:
-                        data["odometer"] = diag_data["odometer"]
-                    elif diag_data.get("odometer_raw") is not None:
-                        data["odometer"] = diag_data["odometer_raw"]
-                    elif diag_data.get("total_distance") is not None:
-                        data["odometer"] = diag_data["total_distance"]
-
-                if data.get("engine_hours") is None and diag_data.get("engine_hours_raw") is not None:
-                    data["engine_hours"] = diag_data["engine_hours_raw"]
-
-                if diag_data:
-                    _LOGGER.debug("[%s] %d diagnostic values available", device_name, len(diag_data))
-
-                data["_diagnostics_lookup"] = diagnostics_lookup
-                if device_id in fault_map:
-                    data["active_faults"] = fault_map[device_id]
-
-                if trip_list := trip_results_dict.get(device_id):
-                    data["last_trip"] = trip_list[0]
-                    data["trip_history"] = trip_list
-                    if data.get("engine_hours") is None and "engineHours" in trip_list[0]:
-                        data["engine_hours"] = trip_list[0]["engineHours"]
-                    _LOGGER.debug("[%s] %d valid trips loaded", device_name, len(trip_list))
-
-                if status_info := status_map.get(device_id):
-                    status_data_ignition = data.get("ignition")
-                    status_payload = dict(status_info)
-                    status_payload.pop("statusData", None)
-                    data.update(status_payload)
-
-                    if data.get("rpm", 0) > 0:
-                        data["ignition"] = 1
-                    elif status_info.get("isIgnitionOn") is not None:
-                        data["ignition"] = 1 if status_info["isIgnitionOn"] else 0
-                    elif status_info.get("isDriving") is False and status_info.get("speed", 0) == 0:
-                        data["ignition"] = 0
-                    elif status_data_ignition is not None:
-                        data["ignition"] = status_data_ignition
-
-                combined_data[device_id] = data
+            with timer.phase(PHASE_MERGE):
+                combined_data: dict[str, DeviceSnapshot] = {}
+                device_cache: dict[str, dict[str, Any]] = {}
+                for device in devices:
+                    device_id = device.get("id")
+                    if not device_id:
+                        continue
+
+                    cached_device = self._device_cache.get(device_id)
+                    if cached_device is not None and cached_device == device:
+                        device = cached_device
+                        self.device_cache_stats.hit()
+                    else:
+                        self.device_cache_stats.miss()
+                    device_cache[device_id] = device
+
+                    combined_data[device_id] = self._merge_device(
+                        device,
+                        parsed,
+                        (
+                            streams
+                            if detail_ids is None or device_id in detail_ids
+                            else frozenset()
+                        ),
+                        previous.get(device_id) if previous is not None else None,
+                    )
 
+            self._device_cache = device_cache
             return combined_data
 
         except asyncio.TimeoutError as err:
-            raise ApiError("Data fetch timed out after 45 seconds") from err
+            raise FetchTimeout(
+                f"Data fetch timed out after {deadline.budget:.0f} seconds"
+            ) from err
+        except InvalidAuth:
+            raise
+        except Exception as err:
+            raise ApiError(f"Failed to get device data: {err}") from err
+
+    async def async_get_scoped_data(
+        self,
+        previous: Mapping[str, DeviceSnapshot],
+        device_ids: list[str] | None = None,
+        streams: frozenset[str] = ALL_STREAMS,
+        timer: PollTimer | None = None,
+        deadline: RefreshDeadline | None = None,
+    ) -> dict[str, DeviceSnapshot]:
+        """Refresh some streams of some known devices with one multi_call.
+
+        Devices come from previous, so no Device call is made; streams that
+        are not requested keep their previous values. Returns new snapshots
+        for the refreshed devices only. Without a deadline the fetch may take
+        FETCH_TIMEOUT seconds.
+        """
+        if timer is None:
+            timer = PollTimer()
+        if deadline is None:
+            deadline = RefreshDeadline(FETCH_TIMEOUT)
+        targets = [
+            device_id
+            for device_id in (device_ids if device_ids is not None else previous)
+            if device_id in previous
+        ]
+        if not targets or not streams:
+            return {}
+        # One fleet-wide status call beats one call per device for whole-fleet scopes
+        calls, call_map = self._build_calls(
+            targets, streams, fleet_status=device_ids is None
+        )
+        try:
+            results = await asyncio.wait_for(
+                self._run_blocking(
+                    lambda: self._blocking_isolated_multi_call(calls, timer),
+                    ("scoped", tuple(targets), streams),
+                ),
+                timeout=deadline.remaining(),
+            )
+            parsed = await self._async_parse_results(results, call_map, timer, deadline)
+
+            with timer.phase(PHASE_MERGE):
+                scoped: dict[str, DeviceSnapshot] = {}
+                for device_id in targets:
+                    old = previous[device_id]
+                    scoped[device_id] = self._merge_device(old.device, parsed, streams, old)
+            return scoped
+
+        except asyncio.TimeoutError as err:
+            raise FetchTimeout(
+                f"Scoped fetch timed out after {deadline.budget:.0f} seconds"
+            ) from err
+        except InvalidAuth:
+            raise
         except Exception as err:
             raise ApiError(f"Failed to get device data: {err}") from err
@@ -0,0 +1,97 @@
+"""Adaptive multi_call batch sizing.
+
+BatchSizeController picks how many sub-calls go into one ExecuteMultiCall
+with an AIMD (additive increase, multiplicative decrease) rule. A full batch
+that answers within the target latency lets the size grow by a fixed step.
+A batch that fails or answers slower than the target halves it. Each account
+therefore settles near the largest batch its server handles comfortably.
+Pure Python with no Home Assistant dependencies.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any
+
+MIN_BATCH_SIZE = 5
+MAX_BATCH_SIZE = 1000
+# Start from one batch for most fleets and only shrink when the server struggles
+DEFAULT_BATCH_SIZE = MAX_BATCH_SIZE
+BATCH_SIZE_STEP = 10
+# Seconds one batch may take before the size is cut
+BATCH_TARGET_LATENCY = 10.0
+BATCH_DECREASE_FACTOR = 0.5
+# Weight of the newest batch in the latency moving average
+_LATENCY_SMOOTHING = 0.2
+
+
+class BatchSizeController:
+    """AIMD controller for the number of sub-calls per multi_call."""
+
+    def __init__(
+        self,
+        size: int = DEFAULT_BATCH_SIZE,
+        min_size: int = MIN_BATCH_SIZE,
+        max_size: int = MAX_BATCH_SIZE,
+        step: int = BATCH_SIZE_STEP,
+        target_latency: float = BATCH_TARGET_LATENCY,
+    ) -> None:
+        """Initialize the controller."""
+        self.size = size
+        self.min_size = min_size
+        self.max_size = max_size
+        self.step = step
+        self.target_latency = target_latency
+        self._lock = threading.Lock()
+        self.average_latency: float | None = None
+        self.last_latency: float | None = None
+        self.batches = 0
+        self.errors = 0
+        self.increases = 0
+        self.decreases = 0
+
+    def split(self, count: int) -> list[range]:
+        """Return index ranges covering count sub-calls, one per batch."""
+        size = self.size
+        return [range(start, min(start + size, count)) for start in range(0, count, size)]
+
+    def record(self, sub_calls: int, seconds: float, success: bool) -> None:
+        """Adjust the size after one batch of sub_calls took seconds."""
+        with self._lock:
+            self.batches += 1
+            self.last_latency = seconds
+            self.average_latency = (
+                seconds
+                if self.average_latency is None
+                else self.average_latency + _LATENCY_SMOOTHING * (seconds - self.average_latency)
+            )
+            if not success:
+                self.errors += 1
+            if not success or seconds > self.target_latency:
+                size = max(int(self.size * BATCH_DECREASE_FACTOR), self.min_size)
+                if size < self.size:
+                    self.decreases += 1
+                self.size = size
+            elif sub_calls >= self.size and self.size < self.max_size:
+                # Only a full batch shows that a bigger one is needed
+                self.size = min(self.size + self.step, self.max_size)
+                self.increases += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the controller state for diagnostics."""
+        return {
+            "batch_size": self.size,
+            "min_size": self.min_size,
+            "max_size": self.max_size,
+            "target_latency": self.target_latency,
+            "last_latency": (
+                round(self.last_latency, 3) if self.last_latency is not None else None
+            ),
+            "average_latency": (
+                round(self.average_latency, 3) if self.average_latency is not None else None
+            ),
+            "batches": self.batches,
+            "errors": self.errors,
+            "increases": self.increases,
+            "decreases": self.decreases,
+        }
@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable
+from collections.abc import Callable, Hashable, Iterable
 from dataclasses import dataclass
+from functools import lru_cache
+import re
 from typing import Any
 
 from homeassistant.components.binary_sensor import (
@@ -12,7 +14,9 @@ from homeassistant.components.binary_sensor import (
     BinarySensorEntityDescription,
 )
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import StateType
@@ -21,8 +25,45 @@ from homeassistant.helpers.update_coordinator import (
 )
 from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN, FAULT_DIAGNOSTIC_NAMES
-from .entity import GeotabEntity
+from .const import (
+    DOMAIN,
+    FAULT_DIAGNOSTIC_NAMES,
+    GROUP_CHASSIS,
+    GROUP_ENGINE,
+    GROUP_STATUS,
+    GROUP_VEHICLE,
+    SIGNAL_DEVICES_ADDED,
+)
+from .entity import GeotabEntity, async_profile_descriptions
+
+# Single pass over a diagnostic ID instead of one substring scan per known fault
+_KNOWN_FAULT_PATTERN = re.compile(
+    "|".join(re.escape(fragment) for fragment in FAULT_DIAGNOSTIC_NAMES)
+)
+
+
+@lru_cache(maxsize=512)
+def _known_fault_info(diagnostic_id: str) -> dict[str, str] | None:
+    """Return the known fault name and code for a diagnostic ID, if any."""
+    if match := _KNOWN_FAULT_PATTERN.search(diagnostic_id):
+        return FAULT_DIAGNOSTIC_NAMES[match.group(0)]
+    return None
+
+
+def _fault_attributes_cache_key(data: dict) -> Hashable | None:
+    """Return a key identifying the rendered fault attributes, or None if uncacheable."""
+    fault_keys = []
+    for fault in data.get("active_faults", []):
+        fault_id = fault.get("id")
+        if not isinstance(fault_id, str):
+            return None
+        # State and timestamp are rendered, so a record updated in place must miss
+        fault_keys.append((fault_id, fault.get("dateTime"), fault.get("faultState")))
+    return (
+        tuple(fault_keys),
+        data.get("_diagnostics_lookup_version"),
+        str(dt_util.DEFAULT_TIME_ZONE),
+    )
 
 
 def _has_active_fault(data: dict, diagnostic_fragment: str) -> bool:
@@ -64,14 +105,12 @@ def _format_fault_attributes(faults: list, diagnostics_lookup: dict | None = Non
             if diag_id in diagnostics_lookup:
                 diagnostic_name = diagnostics_lookup[diag_id]
             # 2. Try known mappings (defined in const.py)
+            elif info := _known_fault_info(diag_id):
+                diagnostic_name = info["name"]
+                fault_code = info["code"]
+            # 3. Extract readable name from ID as last resort
             else:
-                # Extract readable name from ID as last resort
                 diagnostic_name = diag_id.replace("Diagnostic", "").replace("Id", " ").strip()
-                for key, info in FAULT_DIAGNOSTIC_NAMES.items():
-                    if key in diag_id:
-                        diagnostic_name = info["name"]
-                        fault_code = info["code"]
-                        break
 
         # Extract description
         description = fault.get("faultDescription") or fault.get("description") or diagnostic_name
@@ -121,20 +160,25 @@ def _format_fault_attributes(faults: list, diagnostics_lookup: dict | None = Non
 class GeotabBinarySensorEntityDescription(BinarySensorEntityDescription):
     """Describes a Geotab binary sensor entity."""
 
+    group: str = GROUP_STATUS
     is_on_fn: Callable[[dict], bool] = lambda _: False
     attr_fn: Callable[[dict], dict[str, StateType]] | None = None
+    # When set, attr_fn output is reused while this key stays the same
+    attr_cache_key_fn: Callable[[dict], Hashable | None] | None = None
 
 
 BINARY_SENSORS: tuple[GeotabBinarySensorEntityDescription, ...] = (
     # ── Operation ───────────────────────────────────────────────────────
     GeotabBinarySensorEntityDescription(
         key="is_driving",
+        group=GROUP_STATUS,
         translation_key="is_driving",
         device_class=BinarySensorDeviceClass.MOVING,
         is_on_fn=lambda data: bool(data.get("isDriving")),
     ),
     GeotabBinarySensorEntityDescription(
         key="ignition",
+        group=GROUP_STATUS,
         translation_key="ignition",
         device_class=BinarySensorDeviceClass.POWER,
         entity_category=EntityCategory.DIAGNOSTIC,
@@ -143,6 +187,7 @@ BINARY_SENSORS: tuple[GeotabBinarySensorEntityDescription, ...] = (
     # ── Health (Diagnostics) ────────────────────────────────────────────
     GeotabBinarySensorEntityDescription(
         key="active_faults",
+        group=GROUP_STATUS,
         translation_key="active_faults",
         device_class=BinarySensorDeviceClass.PROBLEM,
         entity_category=EntityCategory.DIAGNOSTIC,
@@ -151,9 +196,11 @@ BINARY_SENSORS: tuple[GeotabBinarySensorEntityDescription, ...] = (
             data.get("active_faults", []),
             data.get("_diagnostics_lookup"),
         ),
+        attr_cache_key_fn=_fault_attributes_cache_key,
     ),
     GeotabBinarySensorEntityDescription(
         key="device_communicating",
+        group=GROUP_VEHICLE,
         translation_key="device_communicating",
         device_class=BinarySensorDeviceClass.CONNECTIVITY,
         entity_category=EntityCategory.DIAGNOSTIC,
@@ -162,6 +209,7 @@ BINARY_SENSORS: tuple[GeotabBinarySensorEntityDescription, ...] = (
     ),
     GeotabBinarySensorEntityDescription(
         key="low_vehicle_battery",
+        group=GROUP_ENGINE,
         translation_key="low_vehicle_battery",
         device_class=BinarySensorDeviceClass.BATTERY,
         entity_category=EntityCategory.DIAGNOSTIC,
@@ -171,6 +219,7 @@ BINARY_SENSORS: tuple[GeotabBinarySensorEntityDescription, ...] = (
     # ── Safety & Environment ────────────────────────────────────────────
     GeotabBinarySensorEntityDescription(
         key="door_status",
+        group=GROUP_CHASSIS,
         translation_key="door_status",
         device_class=BinarySensorDeviceClass.DOOR,
         entity_category=EntityCategory.DIAGNOSTIC,
@@ -179,6 +228,7 @@ BINARY_SENSORS: tuple[GeotabBinarySensorEntityDescription, ...] = (
     ),
     GeotabBinarySensorEntityDescription(
         key="seatbelt_status",
+        group=GROUP_CHASSIS,
         translation_key="seatbelt_status",
         device_class=BinarySensorDeviceClass.SAFETY,
         icon="mdi:seatbelt",
@@ -195,24 +245,27 @@ async def async_setup_entry(
 ) -> None:
     """Set up the Geotab binary sensor platform."""
     coordinator: DataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
-
-    known_devices = set()
+    descriptions = async_profile_descriptions(
+        hass, entry, Platform.BINARY_SENSOR, BINARY_SENSORS
+    )
 
     @callback
-    def async_add_new_entities():
-        """Add new entities when a new device is discovered."""
-        new_entities = []
-        for device_id in coordinator.data:
-            if device_id not in known_devices:
-                for description in BINARY_SENSORS:
-                    new_entities.append(GeotabBinarySensor(coordinator, device_id, description))
-                known_devices.add(device_id)
-
+    def async_add_devices(device_ids: Iterable[str]) -> None:
+        """Add entities for newly discovered devices."""
+        new_entities = [
+            GeotabBinarySensor(coordinator, device_id, description)
+            for device_id in device_ids
+            for description in descriptions
+        ]
         if new_entities:
             async_add_entities(new_entities)
 
-    async_add_new_entities()
-    entry.async_on_unload(coordinator.async_add_listener(async_add_new_entities))
+    async_add_devices(coordinator.data)
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_DEVICES_ADDED.format(entry.entry_id), async_add_devices
+        )
+    )
 
 
 class GeotabBinarySensor(GeotabEntity, BinarySensorEntity):
@@ -230,6 +283,8 @@ class GeotabBinarySensor(GeotabEntity, BinarySensorEntity):
         super().__init__(coordinator, device_id)
         self.entity_description = description
         self._attr_unique_id = f"{device_id}_{description.key}"
+        self._attr_cache_key: Hashable | None = None
+        self._attr_cache: dict[str, Any] | None = None
 
     @property
     def is_on(self) -> bool:
@@ -239,6 +294,18 @@ class GeotabBinarySensor(GeotabEntity, BinarySensorEntity):
     @property
     def extra_state_attributes(self) -> dict[str, Any] | None:
         """Return extra state attributes."""
-        if self.entity_description.attr_fn:
-            return self.entity_description.attr_fn(self.device_data)
-        return None
+        description = self.entity_description
+        if not description.attr_fn:
+            return None
+
+        data = self.device_data
+        if description.attr_cache_key_fn is None:
+            return description.attr_fn(data)
+
+        cache_key = description.attr_cache_key_fn(data)
+        if cache_key is None:
+            return description.attr_fn(data)
+        if cache_key != self._attr_cache_key:
+            self._attr_cache = description.attr_fn(data)
+            self._attr_cache_key = cache_key
+        return self._attr_cache
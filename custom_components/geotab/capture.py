@@ -0,0 +1,212 @@
+"""Record and replay Geotab API traffic.
+
+CaptureTransport wraps the client transport (mygeotab.API or GeotabJsonRpc)
+and appends every authenticate, get, call and multi_call request with its result or
+error to a gzip-compressed JSON Lines file, with credentials redacted.
+ReplayTransport answers the same calls from such a file in recorded order, so
+a production fleet's refresh can be reproduced offline.
+"""
+
+from __future__ import annotations
+
+import gzip
+import logging
+from pathlib import Path
+import threading
+from typing import Any
+
+from mygeotab.exceptions import (
+    AuthenticationException,
+    MyGeotabException,
+    TimeoutException,
+)
+from mygeotab.serializers import json_deserialize, json_serialize
+
+_LOGGER = logging.getLogger(__name__)
+
+CAPTURE_MAX_REQUESTS = 500
+REDACTED = "**REDACTED**"
+REDACT_KEYS = frozenset({"password", "sessionId", "userName", "username", "database"})
+
+
+class CaptureMismatch(Exception):
+    """Error to indicate a replayed call differs from the recorded one."""
+
+
+def redact(value: Any) -> Any:
+    """Return value with credential fields replaced, at any depth."""
+    if isinstance(value, dict):
+        return {
+            key: REDACTED if key in REDACT_KEYS else redact(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, (list, tuple)):
+        return [redact(item) for item in value]
+    return value
+
+
+def _error_record(err: Exception) -> dict[str, Any]:
+    """Describe an exception so replay can raise an equivalent one."""
+    if isinstance(err, AuthenticationException):
+        # Its message names the user and database
+        return {"type": "AuthenticationException", "name": None, "message": REDACTED}
+    return {
+        "type": type(err).__name__,
+        "name": getattr(err, "name", None),
+        "message": str(getattr(err, "message", err)),
+    }
+
+
+def _rebuild_error(error: dict[str, Any]) -> Exception:
+    """Return an exception equivalent to a recorded error."""
+    if error["type"] == "MyGeotabException":
+        return MyGeotabException(
+            {"errors": [{"name": error["name"], "message": error["message"]}]}
+        )
+    if error["type"] == "AuthenticationException":
+        return AuthenticationException(REDACTED, REDACTED, "replay")
+    if error["type"] == "TimeoutException":
+        return TimeoutException("replay")
+    return OSError(error["message"])
+
+
+def load_capture(path: str | Path) -> list[dict[str, Any]]:
+    """Load the records of a capture file."""
+    with gzip.open(path, "rt", encoding="utf-8") as capture:
+        return [json_deserialize(line) for line in capture if line.strip()]
+
+
+class CaptureTransport:
+    """Transport wrapper that records every call to a capture file."""
+
+    def __init__(
+        self, api: Any, path: str | Path, max_requests: int = CAPTURE_MAX_REQUESTS
+    ) -> None:
+        """Initialize the wrapper; the capture file is truncated on first write."""
+        self._api = api
+        self.path = Path(path)
+        self.max_requests = max_requests
+        self.recorded = 0
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name: str) -> Any:
+        """Expose the wrapped transport's other attributes."""
+        return getattr(self._api, name)
+
+    def _record(self, call: str, args: dict[str, Any], result: Any, error: Any) -> None:
+        """Append one record, until the request limit is reached."""
+        with self._lock:
+            if self.recorded >= self.max_requests:
+                return
+            record: dict[str, Any] = {"seq": self.recorded, "call": call, "args": redact(args)}
+            if error is not None:
+                record["error"] = _error_record(error)
+            else:
+                record["result"] = redact(result)
+            line = json_serialize(record) + "\n"
+            with gzip.open(self.path, "at" if self.recorded else "wt", encoding="utf-8") as out:
+                out.write(line)
+            self.recorded += 1
+            if self.recorded == self.max_requests:
+                _LOGGER.warning(
+                    "Geotab capture %s reached %s requests, recording stopped",
+                    self.path,
+                    self.max_requests,
+                )
+
+    def _run(self, call: str, args: dict[str, Any], func: Any) -> Any:
+        """Run a transport call and record it."""
+        try:
+            result = func()
+        except Exception as err:
+            self._record(call, args, None, err)
+            raise
+        self._record(call, args, None if call == "authenticate" else result, None)
+        return result
+
+    def authenticate(self) -> Any:
+        """Authenticate through the wrapped transport."""
+        return self._run("authenticate", {}, self._api.authenticate)
+
+    def get(self, type_name: str, **parameters: Any) -> Any:
+        """Get entities through the wrapped transport."""
+        return self._run(
+            "get",
+            {"type_name": type_name, **parameters},
+            lambda: self._api.get(type_name, **parameters),
+        )
+
+    def call(self, method: str, **parameters: Any) -> Any:
+        """Call an API method, such as GetFeed, through the wrapped transport."""
+        return self._run(
+            "call",
+            {"method": method, **parameters},
+            lambda: self._api.call(method, **parameters),
+        )
+
+    def multi_call(self, calls: list[tuple[str, dict[str, Any]]]) -> list[Any]:
+        """Execute a multi_call through the wrapped transport."""
+        return self._run("multi_call", {"calls": calls}, lambda: self._api.multi_call(calls))
+
+
+class ReplayTransport:
+    """Transport that answers calls from a capture file in recorded order."""
+
+    def __init__(self, path: str | Path) -> None:
+        """Initialize the transport; the file is read on the first call."""
+        self.path = Path(path)
+        self._records: list[dict[str, Any]] | None = None
+        self.position = 0
+        self._lock = threading.Lock()
+
+    def _next(self, call: str, name: str | None = None) -> Any:
+        """Return the next recorded result, or raise the recorded error.
+
+        name is the entity type of a get, or the method of a call.
+        """
+        with self._lock:
+            if self._records is None:
+                self._records = load_capture(self.path)
+            # Authentication is up to the transport, so it may be recorded
+            # where replay does not ask for it and vice versa
+            while call != "authenticate" and self._peek() == "authenticate":
+                self.position += 1
+            if call == "authenticate" and self._peek() != "authenticate":
+                return None
+            if self.position >= len(self._records):
+                raise CaptureMismatch(f"Capture exhausted before {call}")
+            record = self._records[self.position]
+            self.position += 1
+        recorded_name = record["args"].get(
+            "method" if record["call"] == "call" else "type_name"
+        )
+        if record["call"] != call or (name is not None and recorded_name != name):
+            raise CaptureMismatch(
+                f"Expected {record['call']}({recorded_name or ''}) at record "
+                f"{record['seq']}, got {call}({name or ''})"
+            )
+        if "error" in record:
+            raise _rebuild_error(record["error"])
+        return record.get("result")
+
+    def _peek(self) -> str | None:
+        """Return the call type of the next record."""
+        if self._records is None or self.position >= len(self._records):
+            return None
+        return self._records[self.position]["call"]
+
+    def authenticate(self) -> None:
+        """Replay an authentication."""
+        self._next("authenticate")
+
+    def get(self, type_name: str, **parameters: Any) -> Any:
+        """Replay a Get call."""
+        return self._next("get", type_name)
+
+    def call(self, method: str, **parameters: Any) -> Any:
+        """Replay a call of another API method."""
+        return self._next("call", method)
+
+    def multi_call(self, calls: list[tuple[str, dict[str, Any]]]) -> list[Any]:
+        """Replay an ExecuteMultiCall."""
+        return self._next("multi_call")
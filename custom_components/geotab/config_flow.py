@@ -11,9 +11,36 @@ from homeassistant.data_entry_flow import FlowResult
 from homeassistant.const import CONF_SCAN_INTERVAL
 from homeassistant.core import callback
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+import homeassistant.helpers.config_validation as cv
 
 from .api import ApiError, GeotabApiClient, InvalidAuth
-from .const import DEFAULT_SCAN_INTERVAL, DOMAIN
+from .const import (
+    CONF_ACTIVE_DEVICES_ONLY,
+    CONF_CAPTURE_API,
+    CONF_DEVICE_GROUPS,
+    CONF_ENTITY_GROUPS,
+    CONF_ENTITY_PROFILE,
+    CONF_LIVE_FEED,
+    CONF_MIN_WRITE_INTERVAL,
+    CONF_PERFORMANCE_SENSORS,
+    CONF_POLL_SHARDS,
+    CONF_STATE_DEADBANDS,
+    DEFAULT_ACTIVE_DEVICES_ONLY,
+    DEFAULT_CAPTURE_API,
+    DEFAULT_DEVICE_GROUPS,
+    DEFAULT_ENTITY_GROUPS,
+    DEFAULT_ENTITY_PROFILE,
+    DEFAULT_LIVE_FEED,
+    DEFAULT_MIN_WRITE_INTERVAL,
+    DEFAULT_PERFORMANCE_SENSORS,
+    DEFAULT_POLL_SHARDS,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_STATE_DEADBANDS,
+    DOMAIN,
+    ENTITY_GROUPS,
+    ENTITY_PROFILES,
+    MAX_POLL_SHARDS,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -98,6 +125,15 @@ class GeotabOptionsFlowHandler(config_entries.OptionsFlow):
         if user_input is not None:
             return self.async_create_entry(title="", data=user_input)
 
+        selected_groups = self._config_entry.options.get(
+            CONF_DEVICE_GROUPS, DEFAULT_DEVICE_GROUPS
+        )
+        groups = await self._async_get_groups()
+        # Keep selected groups selectable even if they could not be loaded
+        groups.update(
+            {group_id: group_id for group_id in selected_groups if group_id not in groups}
+        )
+
         return self.async_show_form(
             step_id="init",
             data_schema=vol.Schema(
@@ -111,6 +147,75 @@ class GeotabOptionsFlowHandler(config_entries.OptionsFlow):
                             ),
                         ),
                     ): vol.All(vol.Coerce(int), vol.Range(min=30)),
+                    vol.Optional(
+                        CONF_STATE_DEADBANDS,
+                        default=self._config_entry.options.get(
+                            CONF_STATE_DEADBANDS, DEFAULT_STATE_DEADBANDS
+                        ),
+                    ): bool,
+                    vol.Optional(
+                        CONF_MIN_WRITE_INTERVAL,
+                        default=self._config_entry.options.get(
+                            CONF_MIN_WRITE_INTERVAL, DEFAULT_MIN_WRITE_INTERVAL
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                    vol.Optional(
+                        CONF_ENTITY_PROFILE,
+                        default=self._config_entry.options.get(
+                            CONF_ENTITY_PROFILE, DEFAULT_ENTITY_PROFILE
+                        ),
+                    ): vol.In(ENTITY_PROFILES),
+                    vol.Optional(
+                        CONF_ENTITY_GROUPS,
+                        default=self._config_entry.options.get(
+                            CONF_ENTITY_GROUPS, DEFAULT_ENTITY_GROUPS
+                        ),
+                    ): cv.multi_select(ENTITY_GROUPS),
+                    vol.Optional(
+                        CONF_DEVICE_GROUPS, default=selected_groups
+                    ): cv.multi_select(groups),
+                    vol.Optional(
+                        CONF_ACTIVE_DEVICES_ONLY,
+                        default=self._config_entry.options.get(
+                            CONF_ACTIVE_DEVICES_ONLY, DEFAULT_ACTIVE_DEVICES_ONLY
+                        ),
+                    ): bool,
+                    vol.Optional(
+                        CONF_POLL_SHARDS,
+                        default=self._config_entry.options.get(
+                            CONF_POLL_SHARDS, DEFAULT_POLL_SHARDS
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=MAX_POLL_SHARDS)),
+                    vol.Optional(
+                        CONF_LIVE_FEED,
+                        default=self._config_entry.options.get(
+                            CONF_LIVE_FEED, DEFAULT_LIVE_FEED
+                        ),
+                    ): bool,
+                    vol.Optional(
+                        CONF_PERFORMANCE_SENSORS,
+                        default=self._config_entry.options.get(
+                            CONF_PERFORMANCE_SENSORS, DEFAULT_PERFORMANCE_SENSORS
+                        ),
+                    ): bool,
+                    vol.Optional(
+                        CONF_CAPTURE_API,
+                        default=self._config_entry.options.get(
+                            CONF_CAPTURE_API, DEFAULT_CAPTURE_API
+                        ),
+                    ): bool,
                 }
             ),
         )
+
+    async def _async_get_groups(self) -> dict[str, str]:
+        """Return the database's groups by ID, using the entry's running client."""
+        coordinator = self.hass.data.get(DOMAIN, {}).get(self._config_entry.entry_id)
+        if coordinator is None:
+            return {}
+        try:
+            groups = await coordinator.client.async_get_groups()
+        except (ApiError, InvalidAuth) as err:
+            _LOGGER.warning("Could not load Geotab groups: %s", err)
+            return {}
+        return dict(sorted(groups.items(), key=lambda item: item[1].lower()))
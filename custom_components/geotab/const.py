@@ -1,9 +1,100 @@
 """Constants for the Geotab integration."""
 
 DOMAIN = "geotab"
+# hass.data key of the API client pool shared by all entries
+DATA_CLIENT_POOL = f"{DOMAIN}_client_pool"
 DEFAULT_SCAN_INTERVAL = 60
 TRIP_FETCH_INTERVAL = 300  # Fetch trips every 5 minutes instead of every poll
+# A refresh must finish within this fraction of the scan interval, at most
+# REFRESH_BUDGET_MAX seconds, so it never runs into the next scheduled poll
+REFRESH_BUDGET_FRACTION = 0.8
+REFRESH_BUDGET_MAX = 120
+# Trips that do not fit the refresh budget are fetched in the background,
+# within this many refresh budgets (at most TRIP_FETCH_INTERVAL seconds)
+DEFERRED_TRIP_BUDGETS = 3
 AUTO_PRUNE_REPROBE_INTERVAL = 50  # Re-probe pruned diagnostics every 50 polls
+# Remove a vehicle's device and entities once it is missing from this many refreshes in a row
+DEVICE_REMOVAL_GRACE_REFRESHES = 3
+
+# Storage (formatted with the entry ID) of the API session and resolved server,
+# reused after a restart instead of authenticating again
+SESSION_STORAGE_KEY = f"{DOMAIN}.session.{{}}"
+SESSION_STORAGE_VERSION = 1
+
+# Dispatcher signal (formatted with the entry ID) carrying newly discovered device IDs
+SIGNAL_DEVICES_ADDED = f"{DOMAIN}_devices_added_{{}}"
+# Dispatcher signal (formatted with the entry ID) carrying the device IDs whose
+# position the live feed updated, and the data the update replaced
+SIGNAL_LIVE_POSITIONS = f"{DOMAIN}_live_positions_{{}}"
+# Dispatcher signal (formatted with the entry ID) sent after each refresh is timed
+SIGNAL_PERFORMANCE_UPDATED = f"{DOMAIN}_performance_updated_{{}}"
+
+# Options: skip state writes for sensor changes smaller than their deadband,
+# and optionally rate-limit writes of measurement sensors (seconds, 0 = off)
+CONF_STATE_DEADBANDS = "state_deadbands"
+CONF_MIN_WRITE_INTERVAL = "min_write_interval"
+DEFAULT_STATE_DEADBANDS = True
+DEFAULT_MIN_WRITE_INTERVAL = 0
+
+# Option: expose refresh timings as diagnostic sensors on a "Geotab API" device
+# and measure payload sizes (which costs a JSON re-encode per refresh)
+CONF_PERFORMANCE_SENSORS = "performance_sensors"
+DEFAULT_PERFORMANCE_SENSORS = False
+
+# Option: record API requests and responses (credentials redacted) to
+# <config>/geotab_capture_<entry_id>.jsonl.gz for offline replay
+CONF_CAPTURE_API = "capture_api_traffic"
+DEFAULT_CAPTURE_API = False
+CAPTURE_FILE = "geotab_capture_{}.jsonl.gz"
+
+# Options: only poll the devices in these Geotab groups (IDs, empty = all)
+# and leave out archived devices; both filter the server-side Device search
+CONF_DEVICE_GROUPS = "device_groups"
+CONF_ACTIVE_DEVICES_ONLY = "active_devices_only"
+DEFAULT_DEVICE_GROUPS: list[str] = []
+DEFAULT_ACTIVE_DEVICES_ONLY = False
+
+# Option: split the fleet into this many shards (1 = off). Each refresh
+# fetches the status, faults and trips of one shard, in turn, and only
+# positions for the rest, so the cost of a refresh stops growing with the fleet
+CONF_POLL_SHARDS = "poll_shards"
+DEFAULT_POLL_SHARDS = 1
+MAX_POLL_SHARDS = 20
+
+# Option: poll the LogRecord feed between refreshes and push positions and
+# speeds to the trackers and speed sensors as they arrive
+CONF_LIVE_FEED = "live_feed"
+DEFAULT_LIVE_FEED = False
+
+# Entity groups; every entity description belongs to exactly one
+GROUP_STATUS = "status"
+GROUP_VEHICLE = "vehicle"
+GROUP_ENGINE = "engine"
+GROUP_CHASSIS = "chassis"
+GROUP_TRIPS = "trips"
+ENTITY_GROUPS = [GROUP_STATUS, GROUP_VEHICLE, GROUP_ENGINE, GROUP_CHASSIS, GROUP_TRIPS]
+
+# Options: which entity descriptions are instantiated at all.
+# minimal: status group only; standard: entities enabled by default;
+# full: everything (previous behaviour); custom: the selected groups
+CONF_ENTITY_PROFILE = "entity_profile"
+CONF_ENTITY_GROUPS = "entity_groups"
+PROFILE_MINIMAL = "minimal"
+PROFILE_STANDARD = "standard"
+PROFILE_FULL = "full"
+PROFILE_CUSTOM = "custom"
+ENTITY_PROFILES = [PROFILE_MINIMAL, PROFILE_STANDARD, PROFILE_FULL, PROFILE_CUSTOM]
+DEFAULT_ENTITY_PROFILE = PROFILE_FULL
+DEFAULT_ENTITY_GROUPS = ENTITY_GROUPS
+
+# Data streams a refresh can be scoped to; live streams are fetched every poll
+STREAM_STATUS = "status"
+STREAM_FAULTS = "faults"
+STREAM_TRIPS = "trips"
+ALL_STREAMS = frozenset({STREAM_STATUS, STREAM_FAULTS, STREAM_TRIPS})
+LIVE_STREAMS = frozenset({STREAM_STATUS, STREAM_FAULTS})
+# geotab.refresh: how many entries refresh at the same time
+REFRESH_CONCURRENCY = 3
 
 # Circuit breaker: open after this many consecutive API failures
 CIRCUIT_BREAKER_MAX_FAILURES = 5
@@ -0,0 +1,599 @@
+"""Data update coordinator for the Geotab integration."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Hashable, Mapping
+from datetime import datetime, timedelta
+import logging
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_SCAN_INTERVAL
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryAuthFailed, HomeAssistantError
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
+
+from .api import ApiError, FetchTimeout, GeotabApiClient, InvalidAuth
+from .const import (
+    ALL_STREAMS,
+    STREAM_TRIPS,
+    CIRCUIT_BREAKER_MAX_FAILURES,
+    CIRCUIT_BREAKER_RESET_DELAY,
+    CONF_PERFORMANCE_SENSORS,
+    CONF_POLL_SHARDS,
+    DEFAULT_PERFORMANCE_SENSORS,
+    DEFAULT_POLL_SHARDS,
+    DEFAULT_SCAN_INTERVAL,
+    DEFERRED_TRIP_BUDGETS,
+    DEVICE_REMOVAL_GRACE_REFRESHES,
+    DOMAIN,
+    REFRESH_BUDGET_FRACTION,
+    REFRESH_BUDGET_MAX,
+    SESSION_STORAGE_KEY,
+    SESSION_STORAGE_VERSION,
+    SIGNAL_DEVICES_ADDED,
+    SIGNAL_LIVE_POSITIONS,
+    SIGNAL_PERFORMANCE_UPDATED,
+    TRIP_FETCH_INTERVAL,
+)
+from .decoder import PositionRecord
+from .feed import (
+    FEED_ERROR_BACKOFF,
+    FEED_POLL_INTERVAL,
+    FEED_RESULTS_LIMIT,
+    latest_positions,
+    merge_position,
+)
+from .models import DeviceSnapshot
+from .performance import (
+    PHASE_DISPATCH,
+    PHASE_TRIP_CACHE,
+    PHASE_MULTI_CALL,
+    CacheStats,
+    PerformanceHistory,
+    PollTimer,
+    RefreshDeadline,
+)
+from .profiling import RefreshProfiler
+
+_LOGGER = logging.getLogger(__name__)
+
+# Device metadata fields that, when changed, are pushed to the device registry
+_DEVICE_INFO_FIELDS = ("name", "version", "deviceType")
+
+
+class GeotabDataUpdateCoordinator(DataUpdateCoordinator[dict[str, DeviceSnapshot]]):
+    """Fetch Geotab data and track which vehicles belong to the fleet."""
+
+    def __init__(
+        self, hass: HomeAssistant, entry: ConfigEntry, client: GeotabApiClient
+    ) -> None:
+        """Initialize the coordinator."""
+        scan_interval = entry.options.get(
+            CONF_SCAN_INTERVAL,
+            entry.data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
+        )
+        super().__init__(
+            hass,
+            _LOGGER,
+            name="geotab_devices",
+            update_interval=timedelta(seconds=scan_interval),
+        )
+        self._scan_interval = timedelta(seconds=scan_interval)
+        # Set while the first scheduled poll is delayed to stagger entries
+        self._staggered = False
+        self.config_entry = entry
+        self.client = client
+
+        # Circuit breaker state
+        self.consecutive_failures = 0
+        self.circuit_open_since: datetime | None = None
+
+        # Time budget of each refresh, derived from the scan interval
+        self.refresh_budget = min(scan_interval * REFRESH_BUDGET_FRACTION, REFRESH_BUDGET_MAX)
+
+        # Sharded polling: the shard whose details the next refresh fetches
+        self.poll_shards = entry.options.get(CONF_POLL_SHARDS, DEFAULT_POLL_SHARDS)
+        self.next_shard = 0
+
+        # Trip fetch caching state
+        self._last_trip_fetch = 0.0
+        # Seconds the last multi_call with trips took, and how often trips
+        # were moved out of a refresh because they would not fit its deadline
+        self._trip_fetch_seconds = 0.0
+        self.deferred_trip_fetches = 0
+        self._cached_trip_history: dict[str, list[dict]] = {}
+        # Refreshes served from cached trips (hits) versus fetching them (misses)
+        self.trip_cache_stats = CacheStats()
+
+        # Fleet membership: known device IDs and, for devices missing from the
+        # latest data, how many refreshes in a row they have been missing
+        self.known_device_ids: set[str] = set()
+        self._missing_refreshes: dict[str, int] = {}
+        # Vehicles registered by an earlier run that no refresh has returned
+        # yet; they are removed like known vehicles if they stay missing, so
+        # vehicles retired or filtered out while the entry was down go too
+        self._registered_device_ids = self._registry_device_ids(hass, entry)
+        self._fleet_source: dict[str, DeviceSnapshot] | None = None
+
+        # DeviceInfo shared by all entities of a device, with the metadata it was built from
+        database = entry.data.get("database", "Unknown")
+        self._database = database
+        self._configuration_url = (
+            f"https://{database}" if "." in database else f"https://my.geotab.com/{database}"
+        )
+        self._device_info: dict[str, tuple[Mapping[str, Any], DeviceInfo]] = {}
+
+        # Per-refresh timings; payload sizes cost a re-encode so are opt-in
+        self.performance = PerformanceHistory()
+        self._measure_bytes = entry.options.get(
+            CONF_PERFORMANCE_SENSORS, DEFAULT_PERFORMANCE_SENSORS
+        )
+        self._timer: PollTimer | None = None
+
+        # On-demand profiling (geotab.profile) and the last finished summary
+        self.profiler: RefreshProfiler | None = None
+        self.profile_summary: dict[str, Any] | None = None
+
+        # Manual refreshes in flight, keyed by scope, so duplicates join them
+        self._manual_refreshes: dict[Hashable, asyncio.Task[None]] = {}
+
+        # API session persisted across restarts, and whether startup reused it
+        self._session_store: Store[dict[str, str]] = Store(
+            hass,
+            SESSION_STORAGE_VERSION,
+            SESSION_STORAGE_KEY.format(entry.entry_id),
+            private=True,
+        )
+        self._saved_session: dict[str, str] | None = None
+        self.session_restored = False
+
+        # Live feed: the LogRecord feed version to poll next and, once the
+        # feed runs, its counters
+        self._feed_version: str | None = None
+        self.live_feed_stats: dict[str, int] | None = None
+
+    async def async_restore_session(self) -> None:
+        """Reuse the API session saved by a previous run instead of authenticating."""
+        if (stored := await self._session_store.async_load()) is None:
+            return
+        self._saved_session = stored
+        self.session_restored = self.client.restore_session(stored)
+        if self.session_restored:
+            _LOGGER.debug("Reusing the saved Geotab session on %s", stored.get("server"))
+
+    async def _async_save_session(self) -> None:
+        """Persist the client's session when authentication has changed it."""
+        session = self.client.session
+        if session is None or session == self._saved_session:
+            return
+        self._saved_session = session
+        await self._session_store.async_save(session)
+
+    def stagger_first_poll(self, seconds: float) -> None:
+        """Delay the first scheduled poll so entries on one server do not burst together."""
+        if seconds > 0:
+            self.update_interval = self._scan_interval + timedelta(seconds=seconds)
+            self._staggered = True
+
+    async def _async_update_data(self) -> dict[str, DeviceSnapshot]:
+        """Fetch data from API endpoint."""
+        if self._staggered and self.data is not None:
+            # The delayed poll is running; poll on the plain interval from now on
+            self._staggered = False
+            self.update_interval = self._scan_interval
+        timer = self._timer = PollTimer(self._measure_bytes)
+        profiler = self.profiler
+        try:
+            if profiler is None:
+                return await self._async_fetch(timer)
+            with profiler.refresh():
+                return await self._async_fetch(timer)
+        except Exception:
+            # Failed refreshes may not reach the listeners, so record them here
+            self._timer = None
+            timer.finish(success=False)
+            self._async_record_timer(timer)
+            raise
+        finally:
+            if profiler is not None and profiler.done:
+                self._async_finish_profile(profiler)
+
+    async def async_refresh_scope(
+        self,
+        device_ids: list[str] | None = None,
+        streams: frozenset[str] = ALL_STREAMS,
+        budget: float | None = None,
+    ) -> None:
+        """Refresh on request, joining an identical refresh already in flight.
+
+        Without a scope this is a regular refresh. With device IDs or a subset
+        of streams, only those are fetched, in one multi_call, and merged into
+        the current data, within budget seconds if given.
+        """
+        key = (frozenset(device_ids) if device_ids is not None else None, streams)
+        if (task := self._manual_refreshes.get(key)) is None:
+            task = self.hass.async_create_task(
+                self._async_run_refresh(device_ids, streams, budget)
+            )
+            self._manual_refreshes[key] = task
+            task.add_done_callback(lambda _: self._manual_refreshes.pop(key, None))
+        await asyncio.shield(task)
+
+    async def _async_run_refresh(
+        self,
+        device_ids: list[str] | None,
+        streams: frozenset[str],
+        budget: float | None = None,
+    ) -> None:
+        """Run one manual refresh for a scope."""
+        if self.data is None or (device_ids is None and streams == ALL_STREAMS):
+            await self.async_refresh()
+            return
+        started = dt_util.utcnow().timestamp()
+        try:
+            scoped = await self.client.async_get_scoped_data(
+                self.data,
+                device_ids,
+                streams,
+                deadline=RefreshDeadline(budget) if budget is not None else None,
+            )
+        except InvalidAuth as err:
+            # Outside a coordinator refresh nothing starts reauth on its own
+            self.config_entry.async_start_reauth(self.hass)
+            raise ConfigEntryAuthFailed(f"Invalid authentication: {err}") from err
+        except ApiError as err:
+            raise HomeAssistantError(f"Geotab refresh failed: {err}") from err
+        if not scoped:
+            return
+        if STREAM_TRIPS in streams and device_ids is None:
+            # The whole fleet's trips are fresh; time them for later deadlines
+            self._last_trip_fetch = started
+            self._trip_fetch_seconds = dt_util.utcnow().timestamp() - started
+        if STREAM_TRIPS in streams:
+            for device_id, snapshot in scoped.items():
+                if snapshot.trip_history:
+                    self._cached_trip_history[device_id] = snapshot.trip_history
+                else:
+                    self._cached_trip_history.pop(device_id, None)
+        self.async_set_updated_data({**self.data, **scoped})
+
+    @callback
+    def _async_defer_trip_fetch(self) -> None:
+        """Fetch trips for the fleet in the background, outside the refresh deadline."""
+        key = (None, frozenset({STREAM_TRIPS}))
+        if key in self._manual_refreshes:
+            return
+        self.deferred_trip_fetches += 1
+        _LOGGER.debug(
+            "Geotab trips took at least %.1fs of the %.0fs refresh budget; "
+            "fetching them separately",
+            self._trip_fetch_seconds,
+            self.refresh_budget,
+        )
+        self.config_entry.async_create_background_task(
+            self.hass, self._async_fetch_deferred_trips(), "geotab_deferred_trips"
+        )
+
+    async def _async_fetch_deferred_trips(self) -> None:
+        """Run a deferred trip fetch, logging instead of raising on failure."""
+        # These trips already overran one refresh budget, so give them several
+        budget = min(self.refresh_budget * DEFERRED_TRIP_BUDGETS, TRIP_FETCH_INTERVAL)
+        try:
+            await self.async_refresh_scope(None, frozenset({STREAM_TRIPS}), budget)
+        except HomeAssistantError as err:
+            _LOGGER.warning("Deferred Geotab trip fetch failed: %s", err)
+
+    @callback
+    def async_start_live_feed(self) -> None:
+        """Poll the LogRecord feed in the background until the entry unloads."""
+        self.live_feed_stats = {"polls": 0, "fixes": 0, "updates": 0, "errors": 0}
+        self.config_entry.async_create_background_task(
+            self.hass, self._async_run_live_feed(), "geotab_live_feed"
+        )
+
+    async def _async_run_live_feed(self) -> None:
+        """Poll the feed forever, without waiting while pages come back full."""
+        while True:
+            try:
+                full = await self._async_poll_live_feed()
+            except (ApiError, InvalidAuth) as err:
+                self.live_feed_stats["errors"] += 1
+                _LOGGER.debug("Geotab live feed poll failed: %s", err)
+                await asyncio.sleep(FEED_ERROR_BACKOFF)
+                continue
+            if not full:
+                await asyncio.sleep(FEED_POLL_INTERVAL)
+
+    async def _async_poll_live_feed(self) -> bool:
+        """Poll one feed page and push its positions; return True if it was full."""
+        if self.data is None or self.circuit_open_since is not None:
+            return False
+        fixes, self._feed_version = await self.client.async_get_log_feed(self._feed_version)
+        self.live_feed_stats["polls"] += 1
+        self.live_feed_stats["fixes"] += len(fixes)
+        self._async_apply_positions(fixes)
+        return len(fixes) >= FEED_RESULTS_LIMIT
+
+    @callback
+    def _async_apply_positions(self, fixes: list[PositionRecord]) -> None:
+        """Fold the newest fix of each device into its snapshot and announce it."""
+        previous = self.data
+        if not fixes or previous is None:
+            return
+        updated: dict[str, DeviceSnapshot] = {}
+        for device_id, fix in latest_positions(fixes).items():
+            if (snapshot := previous.get(device_id)) is None:
+                continue
+            if (status := merge_position(snapshot.status, fix)) is not None:
+                updated[device_id] = snapshot.with_status(status)
+        if not updated:
+            return
+        self.live_feed_stats["updates"] += len(updated)
+        # Not async_set_updated_data: that would notify every entity of every
+        # device and push back the next scheduled refresh
+        self.data = {**previous, **updated}
+        async_dispatcher_send(
+            self.hass,
+            SIGNAL_LIVE_POSITIONS.format(self.config_entry.entry_id),
+            list(updated),
+            previous,
+        )
+
+    @callback
+    def async_start_profile(self, refreshes: int, top: int) -> None:
+        """Profile the next refreshes; profiling switches itself off afterwards."""
+        _LOGGER.info("Profiling the next %d Geotab refresh(es)", refreshes)
+        self.profiler = self.client.profiler = RefreshProfiler(refreshes, top)
+
+    @callback
+    def _async_finish_profile(self, profiler: RefreshProfiler) -> None:
+        """Store the summary of a finished profile and stop profiling."""
+        if self.profiler is profiler:
+            self.profiler = self.client.profiler = None
+        self.profile_summary = summary = profiler.summary()
+        _LOGGER.info(
+            "Geotab profile of %d refresh(es): peak snapshot memory %.1f KiB, "
+            "slowest functions: %s",
+            summary["refreshes"],
+            summary["peak_memory_kib"],
+            ", ".join(row["function"] for row in summary["functions"][:5]),
+        )
+
+    async def _async_fetch(self, timer: PollTimer) -> dict[str, DeviceSnapshot]:
+        """Fetch and assemble one refresh, guarded by the circuit breaker."""
+        # If the circuit is open, skip the update until the reset delay has elapsed
+        if self.circuit_open_since is not None:
+            elapsed = (dt_util.utcnow() - self.circuit_open_since).total_seconds()
+            if elapsed < CIRCUIT_BREAKER_RESET_DELAY:
+                remaining = int(CIRCUIT_BREAKER_RESET_DELAY - elapsed)
+                _LOGGER.warning(
+                    "Geotab circuit breaker open, skipping update. Retrying in %ds.",
+                    remaining,
+                )
+                raise UpdateFailed(f"Circuit breaker open, retrying in {remaining}s")
+            _LOGGER.info("Geotab circuit breaker: attempting reset.")
+            self.circuit_open_since = None
+            self.consecutive_failures = 0
+
+        deadline = RefreshDeadline(self.refresh_budget)
+        now = dt_util.utcnow().timestamp()
+        shard: tuple[int, int] | None = None
+        if self.poll_shards > 1 and self.data:
+            # The shard's trips come with its other details, so every device's
+            # trips are refreshed once per round of shards
+            shard = (self.next_shard, self.poll_shards)
+            include_trips = True
+        else:
+            # Determine if we should fetch trips this cycle. Trips that would not
+            # fit the deadline are fetched separately so live data lands on time.
+            include_trips = (now - self._last_trip_fetch) >= TRIP_FETCH_INTERVAL
+            if include_trips and not deadline.allows(self._trip_fetch_seconds):
+                include_trips = False
+                self._async_defer_trip_fetch()
+
+        try:
+            data = await self.client.async_get_full_device_data(
+                include_trips=include_trips,
+                timer=timer,
+                previous=self.data,
+                deadline=deadline,
+                shard=shard,
+            )
+            if shard is not None:
+                self.next_shard = (self.next_shard + 1) % self.poll_shards
+
+            with timer.phase(PHASE_TRIP_CACHE):
+                if include_trips:
+                    self.trip_cache_stats.miss()
+                    if shard is None:
+                        self._last_trip_fetch = now
+                        self._trip_fetch_seconds = (
+                            timer.phases.get(PHASE_MULTI_CALL, 0) / 1000
+                        )
+                    # Keep the fetched lists for cycles where trips are skipped
+                    self._cached_trip_history = {
+                        device_id: snapshot.trip_history
+                        for device_id, snapshot in data.items()
+                        if snapshot.trip_history
+                    }
+                else:
+                    self.trip_cache_stats.hit()
+                    # Share the cached lists with the new snapshots, no copying
+                    for device_id, trip_history in self._cached_trip_history.items():
+                        if (snapshot := data.get(device_id)) is not None:
+                            snapshot.attach_trip_history(trip_history)
+
+            if self.consecutive_failures:
+                _LOGGER.info(
+                    "Geotab API recovered after %d failure(s).", self.consecutive_failures
+                )
+            self.consecutive_failures = 0
+            await self._async_save_session()
+
+            _LOGGER.debug(
+                "Geotab update: %d device(s), trips=%s%s",
+                len(data),
+                "fetched" if include_trips else "cached",
+                f", shard {shard[0] + 1}/{shard[1]}" if shard is not None else "",
+            )
+            if stale := sum(1 for snapshot in data.values() if snapshot.stale):
+                _LOGGER.info(
+                    "Geotab update: kept earlier data for %d device(s) after partial failures",
+                    stale,
+                )
+
+            return data
+        except InvalidAuth as err:
+            # Auth errors won't fix themselves; notify HA to prompt re-auth
+            raise ConfigEntryAuthFailed(f"Invalid authentication: {err}") from err
+        except (ApiError, Exception) as err:
+            if isinstance(err, FetchTimeout) and include_trips and shard is None:
+                # The trips did not fit the deadline; the next refreshes fetch
+                # live data only and leave the trips to a background fetch
+                self._trip_fetch_seconds = self.refresh_budget
+            self.consecutive_failures += 1
+            if self.consecutive_failures >= CIRCUIT_BREAKER_MAX_FAILURES:
+                self.circuit_open_since = dt_util.utcnow()
+                _LOGGER.error(
+                    "Geotab circuit breaker opened after %d consecutive failures. "
+                    "Pausing updates for %ds.",
+                    self.consecutive_failures,
+                    CIRCUIT_BREAKER_RESET_DELAY,
+                )
+            raise UpdateFailed(f"Error communicating with API: {err}") from err
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Announce fleet changes before entities process the new data."""
+        timer, self._timer = self._timer, None
+        if timer is None:
+            self._async_process_fleet_changes()
+            super().async_update_listeners()
+            return
+        with timer.phase(PHASE_DISPATCH):
+            self._async_process_fleet_changes()
+            super().async_update_listeners()
+        timer.finish(success=True)
+        self._async_record_timer(timer)
+
+    @callback
+    def _async_record_timer(self, timer: PollTimer) -> None:
+        """Add a finished refresh to the history and notify performance sensors."""
+        self.performance.record(timer)
+        async_dispatcher_send(
+            self.hass, SIGNAL_PERFORMANCE_UPDATED.format(self.config_entry.entry_id)
+        )
+
+    @callback
+    def _async_process_fleet_changes(self) -> None:
+        """Diff the device set once per refresh and signal additions and removals."""
+        data = self.data
+        if data is None or data is self._fleet_source:
+            return
+        self._fleet_source = data
+
+        current = data.keys()
+        added = current - self.known_device_ids
+        self._registered_device_ids -= current
+        retired: list[str] = []
+        for device_id in (self.known_device_ids | self._registered_device_ids) - current:
+            missing = self._missing_refreshes.get(device_id, 0) + 1
+            if missing >= DEVICE_REMOVAL_GRACE_REFRESHES:
+                retired.append(device_id)
+            else:
+                self._missing_refreshes[device_id] = missing
+        for device_id in current & self._missing_refreshes.keys():
+            del self._missing_refreshes[device_id]
+
+        self._async_update_device_info(data)
+        if retired:
+            self._async_remove_devices(retired)
+        if added:
+            self.known_device_ids |= added
+            async_dispatcher_send(
+                self.hass, SIGNAL_DEVICES_ADDED.format(self.config_entry.entry_id), added
+            )
+
+    @callback
+    def _async_remove_devices(self, device_ids: list[str]) -> None:
+        """Remove retired vehicles, and with them their entities, from the registries."""
+        device_registry = dr.async_get(self.hass)
+        for device_id in device_ids:
+            self.known_device_ids.discard(device_id)
+            self._registered_device_ids.discard(device_id)
+            self._missing_refreshes.pop(device_id, None)
+            self._cached_trip_history.pop(device_id, None)
+            self._device_info.pop(device_id, None)
+            device = device_registry.async_get_device(identifiers={(DOMAIN, device_id)})
+            if device is not None:
+                _LOGGER.info("Removing Geotab device %s no longer in the fleet", device_id)
+                device_registry.async_update_device(
+                    device.id, remove_config_entry_id=self.config_entry.entry_id
+                )
+
+    @staticmethod
+    def _registry_device_ids(hass: HomeAssistant, entry: ConfigEntry) -> set[str]:
+        """Return the Geotab IDs of the vehicles registered for an entry."""
+        api_device_id = f"{entry.entry_id}_api"
+        return {
+            geotab_id
+            for device in dr.async_entries_for_config_entry(dr.async_get(hass), entry.entry_id)
+            for domain, geotab_id in device.identifiers
+            if domain == DOMAIN and geotab_id != api_device_id
+        }
+
+    def _build_device_info(self, device_id: str, device: Mapping[str, Any]) -> DeviceInfo:
+        """Build the DeviceInfo for a device from its metadata."""
+        return DeviceInfo(
+            identifiers={(DOMAIN, device_id)},
+            name=device.get("name"),
+            manufacturer="Geotab",
+            model=f"{device.get('deviceType')} ({self._database})",
+            hw_version=device.get("deviceType"),
+            sw_version=device.get("version"),
+            serial_number=device.get("serialNumber"),
+            configuration_url=self._configuration_url,
+        )
+
+    def device_info(self, device_id: str) -> DeviceInfo:
+        """Return the DeviceInfo shared by every entity of a device."""
+        if (cached := self._device_info.get(device_id)) is not None:
+            return cached[1]
+        snapshot = self.data.get(device_id) if self.data else None
+        device = snapshot.device if snapshot is not None else {}
+        info = self._build_device_info(device_id, device)
+        if snapshot is not None:
+            self._device_info[device_id] = (device, info)
+        return info
+
+    @callback
+    def _async_update_device_info(self, data: dict[str, DeviceSnapshot]) -> None:
+        """Rebuild DeviceInfo for changed metadata and push real changes to the registry."""
+        device_registry: dr.DeviceRegistry | None = None
+        for device_id, (device, info) in list(self._device_info.items()):
+            snapshot = data.get(device_id)
+            # Unchanged metadata is the very same dict as last poll
+            if snapshot is None or snapshot.device is device:
+                continue
+            new_device = snapshot.device
+            new_info = self._build_device_info(device_id, new_device)
+            self._device_info[device_id] = (new_device, new_info)
+            if all(device.get(key) == new_device.get(key) for key in _DEVICE_INFO_FIELDS):
+                continue
+            if device_registry is None:
+                device_registry = dr.async_get(self.hass)
+            if entry := device_registry.async_get_device(identifiers={(DOMAIN, device_id)}):
+                device_registry.async_update_device(
+                    entry.id,
+                    name=new_info["name"],
+                    model=new_info["model"],
+                    hw_version=new_info["hw_version"],
+                    sw_version=new_info["sw_version"],
+                )
@@ -0,0 +1,170 @@
+"""Schema-driven decoding of Geotab API results.
+
+Pure Python with no Home Assistant dependencies. Each decoder validates a raw
+JSON-RPC result once and returns typed records, so the rest of the pipeline
+can skip defensive type checks. Status, fault and trip records are decoded on
+every poll and are only read afterwards, so their payloads are the raw dicts
+rather than copies. Log records are projected to the fields that are read,
+because the feed merges them into live statuses.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from operator import itemgetter
+from typing import Any, NamedTuple
+
+# Fields kept from each log record; everything else is dropped at decode time
+LOG_RECORD_FIELDS = ("dateTime", "latitude", "longitude", "speed")
+
+
+class StatusRecord(NamedTuple):
+    """A decoded DeviceStatusInfo entry."""
+
+    device_id: str
+    payload: dict[str, Any]
+    diagnostics: dict[str, Any]
+
+
+class FaultRecord(NamedTuple):
+    """A decoded FaultData entry."""
+
+    device_id: str
+    diagnostic_id: str | None
+    payload: dict[str, Any]
+
+
+class PositionRecord(NamedTuple):
+    """A decoded LogRecord GPS fix."""
+
+    device_id: str
+    payload: dict[str, Any]
+
+
+def _reference_id(value: Any) -> str | None:
+    """Return the ID of an entity reference such as {"id": "b1"}."""
+    if isinstance(value, dict):
+        reference_id = value.get("id")
+        if isinstance(reference_id, str) and reference_id:
+            return reference_id
+    return None
+
+
+def _project(item: dict[str, Any], fields: tuple[str, ...]) -> dict[str, Any]:
+    """Return a new dict with only the known fields of item."""
+    return {key: item[key] for key in fields if key in item}
+
+
+def _sort_newest_first(items: list[dict[str, Any]], key: str) -> None:
+    """Sort records in place by a date field, newest first; missing dates last."""
+    try:
+        items.sort(key=itemgetter(key), reverse=True)
+    except (KeyError, TypeError):
+        items.sort(key=lambda item: item.get(key) or "", reverse=True)
+
+
+def decode_status_diagnostics(
+    status_data: Any, diagnostic_keys_by_id: Mapping[str, str]
+) -> dict[str, Any]:
+    """Decode the statusData embedded in DeviceStatusInfo into diagnostic values."""
+    diagnostics: dict[str, Any] = {}
+    if not isinstance(status_data, list):
+        return diagnostics
+    # Runs for every reading of every device on every poll, so malformed
+    # readings are skipped through the exception rather than checked up front
+    for item in status_data:
+        try:
+            diagnostic_key = diagnostic_keys_by_id.get(item["diagnostic"]["id"])
+            if diagnostic_key is None:
+                continue
+            value = item["data"]
+        except (KeyError, TypeError):
+            continue
+        if value is not None:
+            diagnostics[diagnostic_key] = value
+    return diagnostics
+
+
+def decode_statuses(
+    result: Any, diagnostic_keys_by_id: Mapping[str, str]
+) -> list[StatusRecord]:
+    """Decode a DeviceStatusInfo result list.
+
+    Each entry becomes its record's payload without a copy; its statusData is
+    decoded into the record's diagnostics and removed from the entry.
+    """
+    if not isinstance(result, list):
+        return []
+    records: list[StatusRecord] = []
+    for item in result:
+        if not isinstance(item, dict):
+            continue
+        device_id = _reference_id(item.get("device"))
+        if device_id is None:
+            continue
+        records.append(
+            StatusRecord(
+                device_id,
+                item,
+                decode_status_diagnostics(item.pop("statusData", None), diagnostic_keys_by_id),
+            )
+        )
+    return records
+
+
+def decode_faults(result: Any) -> list[FaultRecord]:
+    """Decode a FaultData result list, newest fault first."""
+    if not isinstance(result, list):
+        return []
+    faults = [item for item in result if isinstance(item, dict)]
+    _sort_newest_first(faults, "dateTime")
+    records: list[FaultRecord] = []
+    for item in faults:
+        device_id = _reference_id(item.get("device"))
+        if device_id is None:
+            continue
+        records.append(
+            FaultRecord(
+                device_id,
+                _reference_id(item.get("diagnostic")),
+                item,
+            )
+        )
+    return records
+
+
+def decode_trips(result: Any) -> list[dict[str, Any]]:
+    """Decode a Trip result list into real trips (distance > 0), newest first."""
+    if not isinstance(result, list):
+        return []
+    try:
+        # Well-formed pages, checked without a per-trip isinstance
+        trips = [item for item in result if item["distance"] > 0]
+    except (KeyError, TypeError):
+        trips = [
+            item
+            for item in result
+            if isinstance(item, dict) and isinstance(item.get("distance"), (int, float))
+            and item["distance"] > 0
+        ]
+    _sort_newest_first(trips, "start")
+    return trips
+
+
+def decode_log_records(result: Any) -> list[PositionRecord]:
+    """Decode a LogRecord feed page into GPS fixes, skipping fixes without a position."""
+    if not isinstance(result, list):
+        return []
+    records: list[PositionRecord] = []
+    for item in result:
+        if not isinstance(item, dict):
+            continue
+        device_id = _reference_id(item.get("device"))
+        if (
+            device_id is None
+            or not isinstance(item.get("latitude"), (int, float))
+            or not isinstance(item.get("longitude"), (int, float))
+        ):
+            continue
+        records.append(PositionRecord(device_id, _project(item, LOG_RECORD_FIELDS)))
+    return records
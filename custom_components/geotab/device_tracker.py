@@ -2,17 +2,19 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterable, Mapping
 from typing import Any
 
 from homeassistant.components.device_tracker import SourceType, TrackerEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
 )
 
-from .const import DOMAIN
+from .const import DOMAIN, SIGNAL_DEVICES_ADDED, SIGNAL_LIVE_POSITIONS
 from .entity import GeotabEntity
 
 
@@ -21,37 +23,67 @@ async def async_setup_entry(
 ) -> None:
     """Set up the Geotab device tracker."""
     coordinator: DataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
-    
-    # Track which devices we've already added entities for
-    known_devices = set()
+    # Trackers in Home Assistant by device; each tracker adds and removes itself
+    trackers: dict[str, GeotabDeviceTracker] = {}
 
     @callback
-    def async_add_new_entities():
-        """Add new entities when a new device is discovered."""
-        new_entities = []
-        for device_id in coordinator.data:
-            if device_id not in known_devices:
-                new_entities.append(GeotabDeviceTracker(coordinator, device_id))
-                known_devices.add(device_id)
-        
+    def async_add_devices(device_ids: Iterable[str]) -> None:
+        """Add entities for newly discovered devices."""
+        new_entities = [
+            GeotabDeviceTracker(coordinator, device_id, trackers) for device_id in device_ids
+        ]
         if new_entities:
             async_add_entities(new_entities)
 
+    @callback
+    def async_live_positions(device_ids: list[str], previous: Mapping[str, Any]) -> None:
+        """Write the trackers of devices whose position came in from the live feed."""
+        for device_id in device_ids:
+            if (tracker := trackers.get(device_id)) is not None:
+                tracker.async_write_ha_state()
+
     # Add initial entities
-    async_add_new_entities()
-    
-    # Listen for coordinator updates to add new devices dynamically
-    entry.async_on_unload(coordinator.async_add_listener(async_add_new_entities))
+    async_add_devices(coordinator.data)
+
+    # The coordinator signals only when the fleet actually gains vehicles
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_DEVICES_ADDED.format(entry.entry_id), async_add_devices
+        )
+    )
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_LIVE_POSITIONS.format(entry.entry_id), async_live_positions
+        )
+    )
 
 
 class GeotabDeviceTracker(GeotabEntity, TrackerEntity):
     """A Geotab device tracker."""
 
-    def __init__(self, coordinator: DataUpdateCoordinator, device_id: str) -> None:
+    def __init__(
+        self,
+        coordinator: DataUpdateCoordinator,
+        device_id: str,
+        trackers: dict[str, GeotabDeviceTracker] | None = None,
+    ) -> None:
         """Initialize the device tracker."""
         super().__init__(coordinator, device_id)
         self._attr_unique_id = f"{device_id}_tracker"
         self._attr_name = "Location"
+        self._trackers = trackers if trackers is not None else {}
+
+    async def async_added_to_hass(self) -> None:
+        """Receive live feed positions while in Home Assistant."""
+        await super().async_added_to_hass()
+        self._trackers[self._device_id] = self
+        self.async_on_remove(self._async_leave_trackers)
+
+    @callback
+    def _async_leave_trackers(self) -> None:
+        """Stop receiving live feed positions once removed."""
+        if self._trackers.get(self._device_id) is self:
+            del self._trackers[self._device_id]
 
     @property
     def latitude(self) -> float | None:
@@ -71,8 +103,17 @@ class GeotabDeviceTracker(GeotabEntity, TrackerEntity):
     @property
     def extra_state_attributes(self) -> dict[str, Any] | None:
         """Return extra state attributes."""
-        return {
+        attributes = {
             "speed": self.device_data.get("speed"),
             "is_driving": self.device_data.get("isDriving"),
             "last_updated": self.device_data.get("dateTime"),
         }
+        if stale := getattr(self.device_data, "stale", None):
+            # Streams kept from an earlier refresh after their fetch failed
+            attributes["stale_data"] = sorted(stale)
+        if self.coordinator.poll_shards > 1 and (
+            refreshed_at := getattr(self.device_data, "refreshed_at", None)
+        ):
+            # Sharded polling refreshes details less often than positions
+            attributes["details_refreshed"] = refreshed_at.isoformat()
+        return attributes
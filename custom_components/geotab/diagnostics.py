@@ -0,0 +1,112 @@
+"""Diagnostics support for Geotab."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .const import CIRCUIT_BREAKER_MAX_FAILURES, CIRCUIT_BREAKER_RESET_DELAY, DOMAIN
+from .coordinator import GeotabDataUpdateCoordinator
+
+TO_REDACT = {"username", "password", "database"}
+
+
+def _state_sizes(coordinator: GeotabDataUpdateCoordinator) -> dict[str, int]:
+    """Return counts describing the size of the coordinator data, not its contents."""
+    data = coordinator.data or {}
+    sizes = {
+        "devices": len(data),
+        "known_devices": len(coordinator.known_device_ids),
+        "diagnostic_values": 0,
+        "status_fields": 0,
+        "active_faults": 0,
+        "trips": 0,
+        "stale_devices": 0,
+    }
+    for snapshot in data.values():
+        sizes["stale_devices"] += bool(snapshot.stale)
+        sizes["diagnostic_values"] += len(snapshot.diagnostics)
+        sizes["status_fields"] += len(snapshot.status)
+        sizes["active_faults"] += len(snapshot.active_faults or ())
+        sizes["trips"] += len(snapshot.trip_history or ())
+    sizes["diagnostics_lookup_entries"] = coordinator.client.diagnostics_lookup_size
+    return sizes
+
+
+def _sharding(coordinator: GeotabDataUpdateCoordinator) -> dict[str, Any]:
+    """Return the sharded polling state and how old the oldest device details are."""
+    refreshed = [
+        snapshot.refreshed_at
+        for snapshot in (coordinator.data or {}).values()
+        if snapshot.refreshed_at is not None
+    ]
+    return {
+        "shards": coordinator.poll_shards,
+        "next_shard": coordinator.next_shard,
+        "oldest_details_age": (
+            round((dt_util.utcnow() - min(refreshed)).total_seconds(), 1)
+            if refreshed
+            else None
+        ),
+    }
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry from in-memory state only."""
+    coordinator: GeotabDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    client = coordinator.client
+    history = coordinator.performance
+
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "update_interval": (
+                coordinator.update_interval.total_seconds()
+                if coordinator.update_interval
+                else None
+            ),
+            "state_sizes": _state_sizes(coordinator),
+            "session_restored": coordinator.session_restored,
+        },
+        "deadline": {
+            "refresh_budget": coordinator.refresh_budget,
+            "deferred_trip_fetches": coordinator.deferred_trip_fetches,
+            "deferred_fault_lookups": client.deferred_fault_lookups,
+        },
+        "circuit_breaker": {
+            "consecutive_failures": coordinator.consecutive_failures,
+            "open_since": (
+                coordinator.circuit_open_since.isoformat()
+                if coordinator.circuit_open_since
+                else None
+            ),
+            "max_failures": CIRCUIT_BREAKER_MAX_FAILURES,
+            "reset_delay": CIRCUIT_BREAKER_RESET_DELAY,
+        },
+        "caches": {
+            "trips": coordinator.trip_cache_stats.as_dict(),
+            "diagnostics_lookup": client.diagnostics_lookup_stats.as_dict(),
+            "devices": client.device_cache_stats.as_dict(),
+        },
+        "api_calls": dict(client.call_counts),
+        "executor": client.executor.as_dict(),
+        "batching": client.batch_sizer.as_dict(),
+        "sharding": _sharding(coordinator),
+        "live_feed": coordinator.live_feed_stats,
+        "transport": client.transport_stats,
+        "performance": {
+            "average_refresh_ms": history.average_ms(),
+            "history": history.as_list(),
+        },
+        "profile": coordinator.profile_summary,
+    }
@@ -2,10 +2,96 @@
 
 from __future__ import annotations
 
-from homeassistant.helpers.entity import DeviceInfo
+from collections.abc import Mapping, Sequence
+from typing import Any, TypeVar
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import Platform
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+from homeassistant.helpers.device_registry import DeviceEntryType
+from homeassistant.helpers.entity import DeviceInfo, EntityDescription
 from homeassistant.helpers.update_coordinator import CoordinatorEntity, DataUpdateCoordinator
 
-from .const import DOMAIN
+from .const import (
+    CONF_ENTITY_GROUPS,
+    CONF_ENTITY_PROFILE,
+    DEFAULT_ENTITY_GROUPS,
+    DEFAULT_ENTITY_PROFILE,
+    DOMAIN,
+    GROUP_STATUS,
+    PROFILE_CUSTOM,
+    PROFILE_MINIMAL,
+    PROFILE_STANDARD,
+)
+
+_DescriptionT = TypeVar("_DescriptionT", bound=EntityDescription)
+
+
+def api_device_info(entry: ConfigEntry) -> DeviceInfo:
+    """Return the DeviceInfo of the per-entry "Geotab API" service device."""
+    return DeviceInfo(
+        identifiers={(DOMAIN, f"{entry.entry_id}_api")},
+        name="Geotab API",
+        manufacturer="Geotab",
+        entry_type=DeviceEntryType.SERVICE,
+    )
+
+
+@callback
+def async_remove_api_device(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the "Geotab API" device, and its entities, when no longer wanted."""
+    device_registry = dr.async_get(hass)
+    if device := device_registry.async_get_device(
+        identifiers={(DOMAIN, f"{entry.entry_id}_api")}
+    ):
+        device_registry.async_update_device(
+            device.id, remove_config_entry_id=entry.entry_id
+        )
+
+
+def _in_profile(description: EntityDescription, profile: str, groups: set[str]) -> bool:
+    """Return whether a description belongs to the selected entity profile."""
+    group = getattr(description, "group", GROUP_STATUS)
+    if profile == PROFILE_MINIMAL:
+        return group == GROUP_STATUS
+    if profile == PROFILE_STANDARD:
+        return description.entity_registry_enabled_default
+    if profile == PROFILE_CUSTOM:
+        return group in groups
+    return True
+
+
+@callback
+def async_profile_descriptions(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    platform: Platform,
+    descriptions: Sequence[_DescriptionT],
+) -> tuple[_DescriptionT, ...]:
+    """Return the descriptions to instantiate and drop registry rows of the rest."""
+    profile = entry.options.get(CONF_ENTITY_PROFILE, DEFAULT_ENTITY_PROFILE)
+    groups = set(entry.options.get(CONF_ENTITY_GROUPS, DEFAULT_ENTITY_GROUPS))
+    selected = tuple(
+        description
+        for description in descriptions
+        if _in_profile(description, profile, groups)
+    )
+    if len(selected) == len(descriptions):
+        return selected
+
+    # Unique IDs are "<device_id>_<key>" and Geotab device IDs have no underscore
+    excluded_keys = {description.key for description in descriptions} - {
+        description.key for description in selected
+    }
+    registry = er.async_get(hass)
+    for registry_entry in er.async_entries_for_config_entry(registry, entry.entry_id):
+        if (
+            registry_entry.domain == platform
+            and registry_entry.unique_id.partition("_")[2] in excluded_keys
+        ):
+            registry.async_remove(registry_entry.entity_id)
+    return selected
 
 
 class GeotabEntity(CoordinatorEntity):
@@ -28,26 +114,11 @@ class GeotabEntity(CoordinatorEntity):
         return super().available and self._device_id in self.coordinator.data
 
     @property
-    def device_data(self) -> dict:
-        """Return the device data for this entity."""
+    def device_data(self) -> Mapping[str, Any]:
+        """Return the device snapshot for this entity."""
         return self.coordinator.data.get(self._device_id, {})
 
     @property
     def device_info(self) -> DeviceInfo:
-        """Return the device info."""
-        database = self.coordinator.config_entry.data.get("database", "Unknown")
-        if "." in database:
-            config_url = f"https://{database}"
-        else:
-            config_url = f"https://my.geotab.com/{database}"
-
-        return DeviceInfo(
-            identifiers={(DOMAIN, self._device_id)},
-            name=self.device_data.get("name"),
-            manufacturer="Geotab",
-            model=f"{self.device_data.get('deviceType')} ({database})",
-            hw_version=self.device_data.get("deviceType"),
-            sw_version=self.device_data.get("version"),
-            serial_number=self.device_data.get("serialNumber"),
-            configuration_url=config_url,
-        )
+        """Return the device info shared by all of this device's entities."""
+        return self.coordinator.device_info(self._device_id)
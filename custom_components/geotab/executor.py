@@ -0,0 +1,114 @@
+"""Bounded executor for blocking Geotab API calls.
+
+Each API client gets its own small thread pool instead of Home Assistant's
+shared default executor. A call that outlives its asyncio timeout keeps its
+thread, so the pool also caps how many calls may be pending at once. Further
+work is rejected with ExecutorBusy, and work with the same key as a pending
+call shares that call's future. A hung Geotab server can therefore hold at
+most max_workers threads. Pure Python with no Home Assistant dependencies.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Hashable
+from concurrent.futures import Future, ThreadPoolExecutor
+import threading
+from typing import Any, TypeVar
+
+_T = TypeVar("_T")
+
+DEFAULT_MAX_WORKERS = 2
+DEFAULT_MAX_PENDING = 4
+
+
+class ExecutorBusy(Exception):
+    """Error to indicate the executor has too many calls pending."""
+
+
+class BoundedExecutor:
+    """Thread pool with a cap on pending calls and per-key coalescing."""
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        name: str = "geotab",
+    ) -> None:
+        """Initialize the executor."""
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._pool = ThreadPoolExecutor(max_workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self._pending: dict[Hashable, Future[Any]] = {}
+        self._anonymous = 0
+        self.running = 0
+        self.peak_pending = 0
+        self.submitted = 0
+        self.coalesced = 0
+        self.rejected = 0
+
+    @property
+    def pending(self) -> int:
+        """Return the number of submitted calls that have not finished."""
+        return len(self._pending)
+
+    @property
+    def queue_depth(self) -> int:
+        """Return the number of pending calls waiting for a thread."""
+        return max(self.pending - self.running, 0)
+
+    def _run(self, func: Callable[[], _T]) -> _T:
+        """Run a call on a pool thread, tracking how many are running."""
+        with self._lock:
+            self.running += 1
+        try:
+            return func()
+        finally:
+            with self._lock:
+                self.running -= 1
+
+    def _release(self, key: Hashable, future: Future[Any]) -> None:
+        """Forget a finished call."""
+        with self._lock:
+            if self._pending.get(key) is future:
+                del self._pending[key]
+
+    def submit(self, func: Callable[[], _T], key: Hashable | None = None) -> Future[_T]:
+        """Submit a call, sharing the pending future of a call with the same key."""
+        with self._lock:
+            if key is not None and (existing := self._pending.get(key)) is not None:
+                self.coalesced += 1
+                return existing
+            if len(self._pending) >= self.max_pending:
+                self.rejected += 1
+                raise ExecutorBusy(
+                    f"{len(self._pending)} Geotab API calls still pending, "
+                    "the server may be unresponsive"
+                )
+            if key is None:
+                self._anonymous += 1
+                key = ("anonymous", self._anonymous)
+            future = self._pool.submit(self._run, func)
+            self._pending[key] = future
+            self.submitted += 1
+            self.peak_pending = max(self.peak_pending, len(self._pending))
+        future.add_done_callback(lambda done: self._release(key, done))
+        return future
+
+    def as_dict(self) -> dict[str, int]:
+        """Return the executor metrics for diagnostics."""
+        return {
+            "max_workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "pending": self.pending,
+            "running": self.running,
+            "queue_depth": self.queue_depth,
+            "peak_pending": self.peak_pending,
+            "submitted": self.submitted,
+            "coalesced": self.coalesced,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self) -> None:
+        """Stop accepting work and cancel calls that have not started."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
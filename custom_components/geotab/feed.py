@@ -0,0 +1,81 @@
+"""Live positions from the Geotab LogRecord feed.
+
+The coordinator polls GetFeed for LogRecord with the version token of the
+previous page, so each poll only returns GPS fixes logged since then. The
+helpers here pick the newest fix per device and fold it into the device's
+live status. LogRecords carry no heading, so the bearing is derived from the
+previous position. Pure Python with no Home Assistant dependencies.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from datetime import datetime, timezone
+import math
+from typing import Any
+
+# Seconds between feed polls while the feed is caught up
+FEED_POLL_INTERVAL = 10
+# Fixes per GetFeed page; a full page means more are waiting
+FEED_RESULTS_LIMIT = 5000
+# Seconds to wait after a failed feed poll
+FEED_ERROR_BACKOFF = 60
+# Degrees of latitude or longitude below which a fix keeps the previous bearing
+_MIN_BEARING_MOVE = 1e-5
+
+
+def _as_datetime(value: Any) -> datetime | None:
+    """Return a timezone-aware datetime from an API date string or datetime."""
+    if isinstance(value, datetime):
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def bearing(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Return the initial compass bearing in degrees from one position to another."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    delta = math.radians(lon2 - lon1)
+    x = math.sin(delta) * math.cos(phi2)
+    y = math.cos(phi1) * math.sin(phi2) - math.sin(phi1) * math.cos(phi2) * math.cos(delta)
+    return round(math.degrees(math.atan2(x, y)) % 360, 1)
+
+
+def latest_positions(
+    fixes: Iterable[tuple[str, dict[str, Any]]],
+) -> dict[str, dict[str, Any]]:
+    """Return the newest fix of each device from (device ID, fix) pairs."""
+    latest: dict[str, tuple[datetime | None, dict[str, Any]]] = {}
+    for device_id, payload in fixes:
+        logged = _as_datetime(payload.get("dateTime"))
+        current = latest.get(device_id)
+        if current is None or (
+            logged is not None and (current[0] is None or logged >= current[0])
+        ):
+            latest[device_id] = (logged, payload)
+    return {device_id: payload for device_id, (_, payload) in latest.items()}
+
+
+def merge_position(
+    status: Mapping[str, Any], fix: Mapping[str, Any]
+) -> dict[str, Any] | None:
+    """Return status updated with a fix, or None if the fix is not newer."""
+    logged = _as_datetime(fix.get("dateTime"))
+    known = _as_datetime(status.get("dateTime"))
+    if logged is None or (known is not None and logged <= known):
+        return None
+    merged = {**status, **fix}
+    latitude, longitude = status.get("latitude"), status.get("longitude")
+    if (
+        isinstance(latitude, (int, float))
+        and isinstance(longitude, (int, float))
+        and max(abs(fix["latitude"] - latitude), abs(fix["longitude"] - longitude))
+        >= _MIN_BEARING_MOVE
+    ):
+        merged["bearing"] = bearing(latitude, longitude, fix["latitude"], fix["longitude"])
+    return merged
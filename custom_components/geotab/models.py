@@ -0,0 +1,148 @@
+"""Per-device data snapshots for the Geotab integration.
+
+Pure Python with no Home Assistant dependencies.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator, Mapping
+from datetime import datetime
+from types import MappingProxyType
+from typing import Any
+
+EMPTY_LAYER: Mapping[str, Any] = MappingProxyType({})
+
+# Keys served from dedicated slots rather than from one of the data layers,
+# mapped to the slot holding them ("last_trip" is derived from trip_history)
+_SLOT_KEYS: dict[str, str] = {
+    "active_faults": "active_faults",
+    "trip_history": "trip_history",
+    "last_trip": "trip_history",
+    "_diagnostics_lookup": "diagnostics_lookup",
+    "_diagnostics_lookup_version": "diagnostics_lookup_version",
+}
+_MISSING = object()
+
+
+class DeviceSnapshot(Mapping[str, Any]):
+    """Read-only, merged view of one device's data for a single poll.
+
+    The snapshot keeps references to its source objects instead of copying
+    them into one dict, so unchanged pieces (device metadata, trip history,
+    the fault-name lookup) are shared between polls. Lookups resolve through
+    the layers in the same precedence the old merged dict used: derived
+    values, then live status, then diagnostics, then device metadata.
+    """
+
+    __slots__ = (
+        "device",
+        "diagnostics",
+        "status",
+        "derived",
+        "active_faults",
+        "trip_history",
+        "diagnostics_lookup",
+        "diagnostics_lookup_version",
+        "stale",
+        "refreshed_at",
+    )
+
+    def __init__(
+        self,
+        device: Mapping[str, Any],
+        diagnostics: Mapping[str, Any] = EMPTY_LAYER,
+        status: Mapping[str, Any] = EMPTY_LAYER,
+        derived: Mapping[str, Any] = EMPTY_LAYER,
+        active_faults: list[dict[str, Any]] | None = None,
+        trip_history: list[dict[str, Any]] | None = None,
+        diagnostics_lookup: Mapping[str, str] | None = None,
+        diagnostics_lookup_version: int | None = None,
+        stale: frozenset[str] = frozenset(),
+        refreshed_at: datetime | None = None,
+    ) -> None:
+        """Initialize the snapshot.
+
+        stale names the data streams (status, faults, trips) carried over
+        from an earlier poll because fetching them failed. refreshed_at is
+        when the device's status and diagnostics were last fetched, which
+        sharded polling spreads over several refreshes.
+        """
+        self.device = device
+        self.diagnostics = diagnostics
+        self.status = status
+        self.derived = derived
+        self.active_faults = active_faults
+        self.trip_history = trip_history
+        self.diagnostics_lookup = diagnostics_lookup
+        self.diagnostics_lookup_version = diagnostics_lookup_version
+        self.stale = stale
+        self.refreshed_at = refreshed_at
+
+    def _slot_value(self, key: str) -> Any:
+        """Return the value of a slot-backed key, or _MISSING when unset."""
+        value = getattr(self, _SLOT_KEYS[key])
+        if value is None:
+            return _MISSING
+        if key == "last_trip":
+            return value[0] if value else _MISSING
+        return value
+
+    def attach_trip_history(self, trip_history: list[dict[str, Any]]) -> None:
+        """Share a previously fetched trip history with this snapshot."""
+        self.trip_history = trip_history
+
+    def with_status(self, status: Mapping[str, Any]) -> DeviceSnapshot:
+        """Return a copy with a new live status layer and everything else shared."""
+        return DeviceSnapshot(
+            self.device,
+            self.diagnostics,
+            status,
+            self.derived,
+            self.active_faults,
+            self.trip_history,
+            self.diagnostics_lookup,
+            self.diagnostics_lookup_version,
+            self.stale,
+            self.refreshed_at,
+        )
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the value for key, or default when missing."""
+        if key in _SLOT_KEYS:
+            value = self._slot_value(key)
+            return default if value is _MISSING else value
+        for layer in (self.derived, self.status, self.diagnostics, self.device):
+            if key in layer:
+                return layer[key]
+        return default
+
+    def __getitem__(self, key: str) -> Any:
+        """Return the value for key."""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        """Return True if key resolves to a value."""
+        return isinstance(key, str) and self.get(key, _MISSING) is not _MISSING
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over every resolvable key once."""
+        seen: set[str] = set()
+        for layer in (self.derived, self.status, self.diagnostics, self.device):
+            for key in layer:
+                if key not in seen and key not in _SLOT_KEYS:
+                    seen.add(key)
+                    yield key
+        for key in _SLOT_KEYS:
+            if self._slot_value(key) is not _MISSING:
+                yield key
+
+    def __len__(self) -> int:
+        """Return the number of resolvable keys."""
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        """Return a compact representation."""
+        return f"DeviceSnapshot(id={self.device.get('id')!r})"
@@ -0,0 +1,186 @@
+"""Refresh performance instrumentation for the Geotab integration.
+
+Pure Python with no Home Assistant dependencies.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+import json
+import time
+from typing import Any
+
+# Refresh phases in pipeline order
+PHASE_DEVICE_FETCH = "device_fetch"
+PHASE_MULTI_CALL = "multi_call"
+PHASE_PARSE = "parse"
+PHASE_FAULT_LOOKUP = "fault_lookup"
+PHASE_MERGE = "merge"
+PHASE_TRIP_CACHE = "trip_cache"
+PHASE_DISPATCH = "entity_dispatch"
+
+PERFORMANCE_HISTORY_SIZE = 100
+
+
+def payload_size(payload: Any) -> int:
+    """Return the size in bytes of a decoded payload re-encoded as JSON."""
+    return len(json.dumps(payload, default=str, separators=(",", ":")).encode())
+
+
+class CacheStats:
+    """Hit and miss counters for one cache."""
+
+    __slots__ = ("hits", "misses")
+
+    def __init__(self) -> None:
+        """Initialize the counters."""
+        self.hits = 0
+        self.misses = 0
+
+    def hit(self, count: int = 1) -> None:
+        """Count cache hits."""
+        self.hits += count
+
+    def miss(self, count: int = 1) -> None:
+        """Count cache misses."""
+        self.misses += count
+
+    @property
+    def hit_rate(self) -> float | None:
+        """Return the fraction of lookups served from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON-serialisable summary."""
+        hit_rate = self.hit_rate
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(hit_rate, 4) if hit_rate is not None else None,
+        }
+
+
+class PollTimer:
+    """Phase timings and per-call-type counters for a single refresh."""
+
+    __slots__ = (
+        "started_at",
+        "phases",
+        "records",
+        "payload_bytes",
+        "measure_bytes",
+        "success",
+        "_start",
+    )
+
+    def __init__(self, measure_bytes: bool = False) -> None:
+        """Initialize the timer."""
+        self.started_at = time.time()
+        # Milliseconds per phase
+        self.phases: dict[str, float] = {}
+        self.records: dict[str, int] = {}
+        self.payload_bytes: dict[str, int] = {}
+        self.measure_bytes = measure_bytes
+        self.success: bool | None = None
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time a block of work under a phase name."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            self.phases[name] = self.phases.get(name, 0.0) + elapsed
+
+    def count(self, call_type: str, payload: Any) -> None:
+        """Count the records, and optionally bytes, returned for a call type."""
+        records = (
+            len(payload) if isinstance(payload, (list, dict)) else int(payload is not None)
+        )
+        self.records[call_type] = self.records.get(call_type, 0) + records
+        if self.measure_bytes and payload is not None:
+            self.payload_bytes[call_type] = (
+                self.payload_bytes.get(call_type, 0) + payload_size(payload)
+            )
+
+    def finish(self, success: bool) -> None:
+        """Mark the refresh as finished."""
+        self.success = success
+        self.phases["total"] = (time.perf_counter() - self._start) * 1000
+
+    @property
+    def total_ms(self) -> float | None:
+        """Return the total refresh duration in milliseconds once finished."""
+        return self.phases.get("total")
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON-serialisable summary."""
+        return {
+            "started_at": self.started_at,
+            "success": self.success,
+            "phases_ms": {name: round(value, 2) for name, value in self.phases.items()},
+            "records": dict(self.records),
+            "payload_bytes": dict(self.payload_bytes) if self.measure_bytes else None,
+        }
+
+
+class RefreshDeadline:
+    """Time budget of one refresh, shared by every API call it makes."""
+
+    __slots__ = ("budget", "expires")
+
+    def __init__(self, budget: float) -> None:
+        """Start the budget of budget seconds now."""
+        self.budget = budget
+        self.expires = time.monotonic() + budget
+
+    def remaining(self) -> float:
+        """Return the seconds left, never negative."""
+        return max(self.expires - time.monotonic(), 0.0)
+
+    def allows(self, seconds: float) -> bool:
+        """Return True if work expected to take seconds still fits."""
+        return self.remaining() >= seconds
+
+    def timeout(self, cap: float) -> float:
+        """Return a timeout for one call: what is left, at most cap."""
+        return min(self.remaining(), cap)
+
+
+class PerformanceHistory:
+    """Rolling in-memory history of finished refreshes."""
+
+    def __init__(self, maxlen: int = PERFORMANCE_HISTORY_SIZE) -> None:
+        """Initialize the history."""
+        self._timers: deque[PollTimer] = deque(maxlen=maxlen)
+
+    def __len__(self) -> int:
+        """Return the number of recorded refreshes."""
+        return len(self._timers)
+
+    def record(self, timer: PollTimer) -> None:
+        """Add a finished refresh."""
+        self._timers.append(timer)
+
+    @property
+    def latest(self) -> PollTimer | None:
+        """Return the most recent refresh."""
+        return self._timers[-1] if self._timers else None
+
+    def average_ms(self, phase: str = "total") -> float | None:
+        """Return the mean duration of a phase across successful refreshes."""
+        values = [
+            timer.phases[phase]
+            for timer in self._timers
+            if timer.success and phase in timer.phases
+        ]
+        return sum(values) / len(values) if values else None
+
+    def as_list(self) -> list[dict[str, Any]]:
+        """Return the history, oldest first, as JSON-serialisable dicts."""
+        return [timer.as_dict() for timer in self._timers]
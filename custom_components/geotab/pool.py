@@ -0,0 +1,126 @@
+"""Domain-wide registry of Geotab API clients and per-server state.
+
+Config entries on the same Geotab server share the server's fault diagnostic
+name lookup, so GoFault names loaded for one entry serve all of them. An
+entry's server is only known once its session is resolved (restored from
+storage or authenticated, after federation sends it to e.g.
+my123.geotab.com), so entries are grouped through resolve(); until then an
+entry keeps a lookup of its own. Each server hands out stagger slots so its
+entries do not poll in the same instant. All clients share one keep-alive
+HTTP session, which pools connections per host.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from .api import DiagnosticsLookup, GeotabApiClient
+
+if TYPE_CHECKING:
+    import aiohttp
+    import requests
+
+# Seconds between the polls of consecutive entries on one server
+POLL_STAGGER_SECONDS = 7
+
+
+@dataclass
+class _Server:
+    """State shared by the entries of one server."""
+
+    diagnostics_lookup: DiagnosticsLookup = field(default_factory=DiagnosticsLookup)
+    entry_ids: list[str] = field(default_factory=list)
+
+
+class GeotabClientPool:
+    """Create API clients and share per-server state between them."""
+
+    def __init__(self) -> None:
+        """Initialize an empty pool."""
+        self._servers: dict[str, _Server] = {}
+        self._clients: dict[str, GeotabApiClient] = {}
+        # Server each resolved entry is grouped under
+        self._entry_servers: dict[str, str] = {}
+        self._http_session: requests.Session | None = None
+
+    def acquire(
+        self,
+        entry_id: str,
+        username: str,
+        password: str,
+        database: str | None,
+        session: aiohttp.ClientSession,
+        endpoint: str | None = None,
+        capture_path: str | None = None,
+        device_groups: list[str] | None = None,
+        active_only: bool = False,
+    ) -> GeotabApiClient:
+        """Create the client of an entry, replacing any it had before."""
+        self.release(entry_id)
+        if self._http_session is None:
+            import requests
+
+            self._http_session = requests.Session()
+        client = self._clients[entry_id] = GeotabApiClient(
+            username=username,
+            password=password,
+            database=database,
+            session=session,
+            endpoint=endpoint,
+            capture_path=capture_path,
+            http_session=self._http_session,
+            device_groups=device_groups,
+            active_only=active_only,
+        )
+        return client
+
+    def resolve(self, entry_id: str) -> None:
+        """Group an entry with the others on its client's resolved server.
+
+        Safe to call again; an entry that federation moved to another server
+        changes groups.
+        """
+        if (client := self._clients.get(entry_id)) is None or not (
+            server_key := client.server
+        ):
+            return
+        if self._entry_servers.get(entry_id) == server_key:
+            return
+        self._leave(entry_id)
+        server = self._servers.setdefault(server_key, _Server())
+        server.entry_ids.append(entry_id)
+        self._entry_servers[entry_id] = server_key
+        # Keep the names this client already loaded
+        server.diagnostics_lookup.merge(client.diagnostics_lookup.names)
+        client.diagnostics_lookup = server.diagnostics_lookup
+
+    def _leave(self, entry_id: str) -> None:
+        """Remove an entry from its server group, dropping groups left empty."""
+        if (server_key := self._entry_servers.pop(entry_id, None)) is None:
+            return
+        server = self._servers[server_key]
+        server.entry_ids.remove(entry_id)
+        if not server.entry_ids:
+            del self._servers[server_key]
+
+    def release(self, entry_id: str) -> None:
+        """Drop an entry and close its client."""
+        self._leave(entry_id)
+        if (client := self._clients.pop(entry_id, None)) is None:
+            return
+        client.close()
+        if not self._clients and self._http_session is not None:
+            self._http_session.close()
+            self._http_session = None
+
+    def stagger_seconds(self, entry_id: str, interval: float) -> float:
+        """Return how long an entry's first scheduled poll should be delayed."""
+        if (server_key := self._entry_servers.get(entry_id)) is None:
+            return 0
+        slot = self._servers[server_key].entry_ids.index(entry_id)
+        return (slot * POLL_STAGGER_SECONDS) % interval
+
+    def __len__(self) -> int:
+        """Return the number of clients in use."""
+        return len(self._clients)
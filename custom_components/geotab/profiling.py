@@ -0,0 +1,148 @@
+"""On-demand profiling of coordinator refreshes.
+
+RefreshProfiler runs cProfile around the data pipeline and tracemalloc around
+snapshot building for a fixed number of refreshes, then condenses the result
+into a JSON-friendly summary: the top functions by cumulative time, the top
+allocation sites of the heaviest refresh and the peak memory allocated while
+building snapshots. cProfile only sees the thread it is enabled in, so
+executor jobs are profiled separately through call() and merged. Profiling
+on the event loop also picks up other tasks that run while a refresh awaits
+I/O. Pure Python with no Home Assistant dependencies.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator
+import contextlib
+import cProfile
+import pstats
+import threading
+import time
+import tracemalloc
+from typing import Any, TypeVar
+
+_T = TypeVar("_T")
+
+DEFAULT_PROFILE_REFRESHES = 3
+DEFAULT_PROFILE_TOP = 20
+# Frames kept per allocation traceback; 1 groups allocations by line
+_TRACEMALLOC_FRAMES = 1
+
+
+def _function_label(func: tuple[str, int, str]) -> str:
+    """Format a pstats function key as file:line(name)."""
+    filename, line, name = func
+    if filename == "~":
+        return name
+    return f"{filename}:{line}({name})"
+
+
+class RefreshProfiler:
+    """Profile the next refreshes of one coordinator."""
+
+    def __init__(
+        self, refreshes: int = DEFAULT_PROFILE_REFRESHES, top: int = DEFAULT_PROFILE_TOP
+    ) -> None:
+        """Initialize the profiler."""
+        self.refreshes = refreshes
+        self.remaining = refreshes
+        self.top = top
+        self._profiles: list[cProfile.Profile] = []
+        self._lock = threading.Lock()
+        self._peak_bytes = 0
+        self._retained_bytes = 0
+        self._allocations: list[tracemalloc.Statistic] = []
+        self._started = time.monotonic()
+
+    @property
+    def done(self) -> bool:
+        """Return True once every requested refresh has been profiled."""
+        return self.remaining <= 0
+
+    def _add(self, profile: cProfile.Profile) -> None:
+        """Keep a finished profile for the summary."""
+        with self._lock:
+            self._profiles.append(profile)
+
+    @contextlib.contextmanager
+    def _cprofile(self) -> Iterator[None]:
+        """Run cProfile in the current thread, unless another profiler is active."""
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiler already owns this thread
+            yield
+            return
+        try:
+            yield
+        finally:
+            profile.disable()
+            self._add(profile)
+
+    def call(self, func: Callable[[], _T]) -> _T:
+        """Run a blocking job under its own profile, for executor threads."""
+        with self._cprofile():
+            return func()
+
+    @contextlib.contextmanager
+    def refresh(self) -> Iterator[None]:
+        """Profile one refresh in the calling thread and count it."""
+        owns_tracing = not tracemalloc.is_tracing()
+        if owns_tracing:
+            tracemalloc.start(_TRACEMALLOC_FRAMES)
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        try:
+            with self._cprofile():
+                yield
+        finally:
+            current, peak = tracemalloc.get_traced_memory()
+            if peak - baseline >= self._peak_bytes:
+                self._peak_bytes = peak - baseline
+                self._retained_bytes = current - baseline
+                self._allocations = tracemalloc.take_snapshot().statistics("lineno")[
+                    : self.top
+                ]
+            if owns_tracing:
+                tracemalloc.stop()
+            self.remaining -= 1
+
+    def summary(self) -> dict[str, Any]:
+        """Return the condensed result of the profiled refreshes."""
+        functions: list[dict[str, Any]] = []
+        with self._lock:
+            profiles = list(self._profiles)
+        if profiles:
+            stats = pstats.Stats(profiles[0])
+            for profile in profiles[1:]:
+                stats.add(profile)
+            rows = sorted(
+                stats.stats.items(),  # type: ignore[attr-defined]
+                key=lambda item: item[1][3],
+                reverse=True,
+            )
+            functions = [
+                {
+                    "function": _function_label(func),
+                    "calls": calls,
+                    "cumulative_ms": round(cumulative * 1000, 3),
+                    "own_ms": round(own * 1000, 3),
+                }
+                for func, (_, calls, own, cumulative, _) in rows[: self.top]
+            ]
+        return {
+            "refreshes": self.refreshes - max(self.remaining, 0),
+            "duration_s": round(time.monotonic() - self._started, 1),
+            "peak_memory_kib": round(self._peak_bytes / 1024, 1),
+            "retained_memory_kib": round(self._retained_bytes / 1024, 1),
+            "functions": functions,
+            "allocations": [
+                {
+                    "site": str(stat.traceback[0]) if stat.traceback else "?",
+                    "size_kib": round(stat.size / 1024, 1),
+                    "count": stat.count,
+                }
+                for stat in self._allocations
+            ],
+        }
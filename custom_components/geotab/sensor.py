@@ -2,8 +2,11 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable
+from collections import defaultdict
+from collections.abc import Callable, Iterable, Mapping
 from dataclasses import dataclass
+from functools import partial
+import time
 from typing import Any
 
 from homeassistant.components.sensor import (
@@ -16,8 +19,10 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
     DEGREE,
     PERCENTAGE,
+    Platform,
     REVOLUTIONS_PER_MINUTE,
     UnitOfElectricPotential,
+    UnitOfInformation,
     UnitOfLength,
     UnitOfPressure,
     UnitOfSpeed,
@@ -26,6 +31,8 @@ from homeassistant.const import (
     UnitOfVolume,
 )
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import StateType
@@ -35,8 +42,31 @@ from homeassistant.helpers.update_coordinator import (
 
 from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN, PA_TO_PSI
-from .entity import GeotabEntity
+from .const import (
+    CONF_MIN_WRITE_INTERVAL,
+    CONF_PERFORMANCE_SENSORS,
+    CONF_STATE_DEADBANDS,
+    DEFAULT_MIN_WRITE_INTERVAL,
+    DEFAULT_PERFORMANCE_SENSORS,
+    DEFAULT_STATE_DEADBANDS,
+    DOMAIN,
+    GROUP_CHASSIS,
+    GROUP_ENGINE,
+    GROUP_STATUS,
+    GROUP_TRIPS,
+    GROUP_VEHICLE,
+    PA_TO_PSI,
+    SIGNAL_DEVICES_ADDED,
+    SIGNAL_LIVE_POSITIONS,
+    SIGNAL_PERFORMANCE_UPDATED,
+)
+from .entity import (
+    GeotabEntity,
+    api_device_info,
+    async_profile_descriptions,
+    async_remove_api_device,
+)
+from .performance import PHASE_MULTI_CALL, PerformanceHistory
 from . import trip_stats
 
 
@@ -72,13 +102,21 @@ def _pressure_pa_to_psi(data: dict, key: str) -> StateType:
 class GeotabSensorEntityDescription(SensorEntityDescription):
     """Describes a Geotab sensor entity."""
 
+    group: str = GROUP_STATUS
     value_fn: Callable[[dict], StateType] = lambda _: None
+    # Numeric changes smaller than this are not written to the state machine
+    deadband: float | None = None
+    # Minimum seconds between state writes (0 = no limit)
+    min_interval: float = 0
+    # Also updated between refreshes from the live position feed
+    live: bool = False
 
 
 SENSORS: tuple[GeotabSensorEntityDescription, ...] = (
     # ── Primary Status ──────────────────────────────────────────────────
     GeotabSensorEntityDescription(
         key="odometer",
+        group=GROUP_STATUS,
         translation_key="odometer",
         icon="mdi:counter",
         native_unit_of_measurement=UnitOfLength.KILOMETERS,
@@ -88,6 +126,7 @@ SENSORS: tuple[GeotabSensorEntityDescription, ...] = (
     ),
     GeotabSensorEntityDescription(
         key="odometer_adjustment",
+        group=GROUP_VEHICLE,
         translation_key="odometer_adjustment",
         icon="mdi:counter",
         native_unit_of_measurement=UnitOfLength.KILOMETERS,
@@ -101,6 +140,7 @@ SENSORS: tuple[GeotabSensorEntityDescription, ...] = (
 
     GeotabSensorEntityDescription(
         key="total_distance",
+        group=GROUP_VEHICLE,
         translation_key="total_distance",
         icon="mdi:counter",
         native_unit_of_measurement=UnitOfLength.KILOMETERS,
@@ -113,14 +153,17 @@ SENSORS: tuple[GeotabSensorEntityDescription, ...] = (
 
     GeotabSensorEntityDescription(
         key="fuel_level",
+        group=GROUP_STATUS,
         translation_key="fuel_level",
         icon="mdi:gas-station",
         native_unit_of_measurement=PERCENTAGE,
         state_class=SensorStateClass.MEASUREMENT,
+        deadband=1.0,
         value_fn=lambda data: data.get("fuel_level"),
     ),
     GeotabSensorEntityDescription(
         key="fuel_level_raw",
+        group=GROUP_VEHICLE,
         translation_key="fuel_level_raw",
         icon="mdi:gas-station-outline",
         state_class=SensorStateClass.MEASUREMENT,
@@ -130,6 +173,7 @@ SENSORS: tuple[GeotabSensorEntityDescription, ...] = (
     ),
     GeotabSensorEntityDescription(
         key="fuel_tank_capacity",
+        group=GROUP_VEHICLE,
         translation_key="fuel_tank_capacity",
         icon="mdi:gas-cylinder",
         native_unit_of_measurement=UnitOfVolume.LITERS,
@@ -140,6 +184,7 @@ SENSORS: tuple[GeotabSensorEntityDescription, ...] = (
     ),
     GeotabSensorEntityDescription(
         key="vehicle_vin",
+        group=GROUP_VEHICLE,
         translation_key="vehicle_vin",
         icon="mdi:card-text-outline",
         entity_category=EntityCategory.DIAGNOSTIC,
@@ -149,6 +194,7 @@ SENSORS: tuple[GeotabSensorEntityDescription, ...] = (
     ),
     GeotabSensorEntityDescription(
         key="device_time_zone",
+        group=GROUP_VEHICLE,
         translation_key="device_time_zone",
         icon="mdi:clock-outline",
         entity_category=EntityCategory.DIAGNOSTIC,
@@ -158,24 +204,31 @@ SENSORS: tuple[GeotabSensorEntityDescription, ...] = (
     # ── Performance & Driving ───────────────────────────────────────────
     GeotabSensorEntityDescription(
         key="speed",
+        group=GROUP_STATUS,
         translation_key="speed",
         icon="mdi:speedometer",
         native_unit_of_measurement=UnitOfSpeed.KILOMETERS_PER_HOUR,
         device_class=SensorDeviceClass.SPEED,
         state_class=SensorStateClass.MEASUREMENT,
+        deadband=1.0,
         value_fn=lambda data: data.get("speed"),
+        live=True,
     ),
     GeotabSensorEntityDescription(
         key="bearing",
+        group=GROUP_STATUS,
         translation_key="bearing",
         icon="mdi:compass-outline",
         native_unit_of_measurement=DEGREE,
         state_class=SensorStateClass.MEASUREMENT,
+        deadband=5.0,
         value_fn=lambda data: data.get("bearing"),
+        live=True,
         entity_registry_enabled_default=False,
     ),
     GeotabSensorEntityDescription(
         key="fuel_rate",
+        group=GROUP_ENGINE,
         translation_key="fuel_rate",
         icon="mdi:fuel",
         native_unit_of_measurement="L/h",
@@ -186,16 +239,19 @@ SENSORS: tuple[GeotabSensorEntityDescription, ...] = (
     # ── Engine & Health (Diagnostics) ──────────────────────────────────
     GeotabSensorEntityDescription(
         key="voltage",
+        group=GROUP_ENGINE,
         translation_key="voltage",
         icon="mdi:car-battery",
         native_unit_of_measurement=UnitOfElectricPotential.VOLT,
         device_class=SensorDeviceClass.VOLTAGE,
         state_class=SensorStateClass.MEASUREMENT,
         entity_category=EntityCategory.DIAGNOSTIC,
+        deadband=0.1,
         value_fn=lambda data: data.get("voltage"),
     ),
     GeotabSensorEntityDescription(
         key="rpm",
+        group=GROUP_ENGINE,
         translation_key="rpm",
         icon="mdi:engine-outline",
         native_unit_of_measurement=REVOLUTIONS_PER_MINUTE,
@@ -206,6 +262,7 @@ SENSORS: tuple[GeotabSensorEntityDescription, ...] = (
     ),
     GeotabSensorEntityDescription(
         key="engine_hours",
+        group=GROUP_ENGINE,
         translation_key="engine_hours",
         icon="mdi:timer-outline",
         native_unit_of_measurement=UnitOfTime.HOURS,
@@ -215,6 +272,7 @@ SENSORS: tuple[GeotabSensorEntityDescription, ...] = (
     ),
     GeotabSensorEntityDescription(
         key="engine_load",
+        group=GROUP_ENGINE,
         translation_key="engine_load",
         icon="mdi:engine",
         native_unit_of_measurement=PERCENTAGE,
@@ -225,28 +283,33 @@ SENSORS: tuple[GeotabSensorEntityDescription, ...] = (
     ),
     GeotabSensorEntityDescription(
         key="coolant_temp",
+        group=GROUP_ENGINE,
         translation_key="coolant_temp",
         icon="mdi:thermometer",
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         device_class=SensorDeviceClass.TEMPERATURE,
         state_class=SensorStateClass.MEASUREMENT,
         entity_category=EntityCategory.DIAGNOSTIC,
+        deadband=1.0,
         value_fn=lambda data: data.get("coolant_temp"),
         entity_registry_enabled_default=False,
     ),
     GeotabSensorEntityDescription(
         key="oil_temp",
+        group=GROUP_ENGINE,
         translation_key="oil_temp",
         icon="mdi:oil-temperature",
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         device_class=SensorDeviceClass.TEMPERATURE,
         state_class=SensorStateClass.MEASUREMENT,
         entity_category=EntityCategory.DIAGNOSTIC,
+        deadband=1.0,
         value_fn=lambda data: data.get("oil_temp"),
         entity_registry_enabled_default=False,
     ),
     GeotabSensorEntityDescription(
         key="oil_pressure",
+        group=GROUP_ENGINE,
         translation_key="oil_pressure",
         icon="mdi:gauge",
         native_unit_of_measurement=UnitOfPressure.KPA,
@@ -263,67 +326,80 @@ SENSORS: tuple[GeotabSensorEntityDescription, ...] = (
     # ── Environmental & Chassis (Diagnostics) ───────────────────────────
     GeotabSensorEntityDescription(
         key="ambient_temp",
+        group=GROUP_CHASSIS,
         translation_key="ambient_temp",
         icon="mdi:thermometer",
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         device_class=SensorDeviceClass.TEMPERATURE,
         state_class=SensorStateClass.MEASUREMENT,
+        deadband=0.5,
         value_fn=lambda data: data.get("ambient_temp"),
         entity_registry_enabled_default=False,
     ),
     GeotabSensorEntityDescription(
         key="transmission_temp",
+        group=GROUP_ENGINE,
         translation_key="transmission_temp",
         icon="mdi:car-cog",
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         device_class=SensorDeviceClass.TEMPERATURE,
         state_class=SensorStateClass.MEASUREMENT,
         entity_category=EntityCategory.DIAGNOSTIC,
+        deadband=1.0,
         value_fn=lambda data: data.get("transmission_temp"),
         entity_registry_enabled_default=False,
     ),
     GeotabSensorEntityDescription(
         key="tire_pressure_front_left",
+        group=GROUP_CHASSIS,
         translation_key="tire_pressure_front_left",
         icon="mdi:tire",
         native_unit_of_measurement=UnitOfPressure.PSI,
         device_class=SensorDeviceClass.PRESSURE,
         state_class=SensorStateClass.MEASUREMENT,
         entity_category=EntityCategory.DIAGNOSTIC,
+        deadband=0.5,
         value_fn=lambda data: _pressure_pa_to_psi(data, "tire_pressure_front_left"),
     ),
     GeotabSensorEntityDescription(
         key="tire_pressure_front_right",
+        group=GROUP_CHASSIS,
         translation_key="tire_pressure_front_right",
         icon="mdi:tire",
         native_unit_of_measurement=UnitOfPressure.PSI,
         device_class=SensorDeviceClass.PRESSURE,
         state_class=SensorStateClass.MEASUREMENT,
         entity_category=EntityCategory.DIAGNOSTIC,
+        deadband=0.5,
         value_fn=lambda data: _pressure_pa_to_psi(data, "tire_pressure_front_right"),
     ),
     GeotabSensorEntityDescription(
         key="tire_pressure_rear_left",
+        group=GROUP_CHASSIS,
         translation_key="tire_pressure_rear_left",
         icon="mdi:tire",
         native_unit_of_measurement=UnitOfPressure.PSI,
         device_class=SensorDeviceClass.PRESSURE,
         state_class=SensorStateClass.MEASUREMENT,
         entity_category=EntityCategory.DIAGNOSTIC,
+        deadband=0.5,
         value_fn=lambda data: _pressure_pa_to_psi(data, "tire_pressure_rear_left"),
     ),
     GeotabSensorEntityDescription(
         key="tire_pressure_rear_right",
+        group=GROUP_CHASSIS,
         translation_key="tire_pressure_rear_right",
         icon="mdi:tire",
         native_unit_of_measurement=UnitOfPressure.PSI,
         device_class=SensorDeviceClass.PRESSURE,
         state_class=SensorStateClass.MEASUREMENT,
         entity_category=EntityCategory.DIAGNOSTIC,
+        deadband=0.5,
         value_fn=lambda data: _pressure_pa_to_psi(data, "tire_pressure_rear_right"),
     ),
     GeotabSensorEntityDescription(
         key="accelerator_pos",
+        group=GROUP_ENGINE,
         translation_key="accelerator_pos",
         icon="mdi:car-speed-limiter",
         native_unit_of_measurement=PERCENTAGE,
@@ -334,6 +410,7 @@ SENSORS: tuple[GeotabSensorEntityDescription, ...] = (
     ),
     GeotabSensorEntityDescription(
         key="throttle_pos",
+        group=GROUP_ENGINE,
         translation_key="throttle_pos",
         icon="mdi:circle-slice-8",
         native_unit_of_measurement=PERCENTAGE,
@@ -345,6 +422,7 @@ SENSORS: tuple[GeotabSensorEntityDescription, ...] = (
     # ── Trip Statistics ─────────────────────────────────────────────────
     GeotabSensorEntityDescription(
         key="last_trip_distance",
+        group=GROUP_TRIPS,
         translation_key="last_trip_distance",
         icon="mdi:map-marker-distance",
         native_unit_of_measurement=UnitOfLength.KILOMETERS,
@@ -358,6 +436,7 @@ SENSORS: tuple[GeotabSensorEntityDescription, ...] = (
     ),
     GeotabSensorEntityDescription(
         key="last_trip_average_speed",
+        group=GROUP_TRIPS,
         translation_key="last_trip_average_speed",
         icon="mdi:speedometer-medium",
         native_unit_of_measurement=UnitOfSpeed.KILOMETERS_PER_HOUR,
@@ -370,6 +449,7 @@ SENSORS: tuple[GeotabSensorEntityDescription, ...] = (
     ),
     GeotabSensorEntityDescription(
         key="last_trip_duration",
+        group=GROUP_TRIPS,
         translation_key="last_trip_duration",
         icon="mdi:timer-outline",
         native_unit_of_measurement=UnitOfTime.HOURS,
@@ -381,6 +461,7 @@ SENSORS: tuple[GeotabSensorEntityDescription, ...] = (
     ),
     GeotabSensorEntityDescription(
         key="daily_distance",
+        group=GROUP_TRIPS,
         translation_key="daily_distance",
         icon="mdi:map-marker-path",
         native_unit_of_measurement=UnitOfLength.KILOMETERS,
@@ -393,6 +474,7 @@ SENSORS: tuple[GeotabSensorEntityDescription, ...] = (
     ),
     GeotabSensorEntityDescription(
         key="weekly_distance",
+        group=GROUP_TRIPS,
         translation_key="weekly_distance",
         icon="mdi:map-marker-path",
         native_unit_of_measurement=UnitOfLength.KILOMETERS,
@@ -405,6 +487,7 @@ SENSORS: tuple[GeotabSensorEntityDescription, ...] = (
     ),
     GeotabSensorEntityDescription(
         key="monthly_distance",
+        group=GROUP_TRIPS,
         translation_key="monthly_distance",
         icon="mdi:map-marker-path",
         native_unit_of_measurement=UnitOfLength.KILOMETERS,
@@ -417,6 +500,7 @@ SENSORS: tuple[GeotabSensorEntityDescription, ...] = (
     ),
     GeotabSensorEntityDescription(
         key="daily_trip_count",
+        group=GROUP_TRIPS,
         translation_key="daily_trip_count",
         icon="mdi:counter",
         native_unit_of_measurement="trips",
@@ -428,6 +512,7 @@ SENSORS: tuple[GeotabSensorEntityDescription, ...] = (
     ),
     GeotabSensorEntityDescription(
         key="weekly_trip_count",
+        group=GROUP_TRIPS,
         translation_key="weekly_trip_count",
         icon="mdi:counter",
         native_unit_of_measurement="trips",
@@ -439,6 +524,7 @@ SENSORS: tuple[GeotabSensorEntityDescription, ...] = (
     ),
     GeotabSensorEntityDescription(
         key="average_trip_speed",
+        group=GROUP_TRIPS,
         translation_key="average_trip_speed",
         icon="mdi:speedometer",
         native_unit_of_measurement=UnitOfSpeed.KILOMETERS_PER_HOUR,
@@ -451,6 +537,7 @@ SENSORS: tuple[GeotabSensorEntityDescription, ...] = (
     ),
     GeotabSensorEntityDescription(
         key="weekly_idle_time",
+        group=GROUP_TRIPS,
         translation_key="weekly_idle_time",
         icon="mdi:timer-sand",
         native_unit_of_measurement=UnitOfTime.HOURS,
@@ -463,6 +550,7 @@ SENSORS: tuple[GeotabSensorEntityDescription, ...] = (
     # ── System (Diagnostics) ────────────────────────────────────────────
     GeotabSensorEntityDescription(
         key="last_update",
+        group=GROUP_STATUS,
         translation_key="last_update",
         icon="mdi:clock-check",
         device_class=SensorDeviceClass.TIMESTAMP,
@@ -476,34 +564,235 @@ SENSORS: tuple[GeotabSensorEntityDescription, ...] = (
 )
 
 
+def _latest_phase(history: PerformanceHistory, phase: str) -> StateType:
+    """Return a phase duration of the latest refresh, rounded to the millisecond."""
+    if (timer := history.latest) is None or phase not in timer.phases:
+        return None
+    return round(timer.phases[phase])
+
+
+@dataclass
+class GeotabPerformanceSensorEntityDescription(SensorEntityDescription):
+    """Describes a Geotab refresh performance sensor."""
+
+    value_fn: Callable[[PerformanceHistory], StateType] = lambda _: None
+    attr_fn: Callable[[PerformanceHistory], dict[str, Any] | None] = lambda _: None
+
+
+PERFORMANCE_SENSORS: tuple[GeotabPerformanceSensorEntityDescription, ...] = (
+    GeotabPerformanceSensorEntityDescription(
+        key="poll_duration",
+        translation_key="poll_duration",
+        icon="mdi:timer-cog-outline",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda history: _latest_phase(history, "total"),
+        attr_fn=lambda history: (
+            {
+                "success": history.latest.success,
+                **{
+                    f"{phase}_ms": round(value, 1)
+                    for phase, value in history.latest.phases.items()
+                },
+            }
+            if history.latest
+            else None
+        ),
+    ),
+    GeotabPerformanceSensorEntityDescription(
+        key="average_poll_duration",
+        translation_key="average_poll_duration",
+        icon="mdi:timer-sand",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda history: (
+            round(average) if (average := history.average_ms()) is not None else None
+        ),
+        attr_fn=lambda history: {"samples": len(history)},
+    ),
+    GeotabPerformanceSensorEntityDescription(
+        key="multi_call_duration",
+        translation_key="multi_call_duration",
+        icon="mdi:cloud-download-outline",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda history: _latest_phase(history, PHASE_MULTI_CALL),
+    ),
+    GeotabPerformanceSensorEntityDescription(
+        key="records_fetched",
+        translation_key="records_fetched",
+        icon="mdi:database-arrow-down-outline",
+        native_unit_of_measurement="records",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda history: (
+            sum(history.latest.records.values()) if history.latest else None
+        ),
+        attr_fn=lambda history: dict(history.latest.records) if history.latest else None,
+    ),
+    GeotabPerformanceSensorEntityDescription(
+        key="payload_size",
+        translation_key="payload_size",
+        icon="mdi:file-download-outline",
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        device_class=SensorDeviceClass.DATA_SIZE,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda history: (
+            sum(history.latest.payload_bytes.values())
+            if history.latest and history.latest.measure_bytes
+            else None
+        ),
+        attr_fn=lambda history: (
+            dict(history.latest.payload_bytes) if history.latest else None
+        ),
+    ),
+)
+
+
+class SensorValueTable:
+    """Sensor values for every device, computed once per coordinator refresh.
+
+    Entities register their description once added to Home Assistant, so
+    disabled entities cost nothing. The first read after a refresh rebuilds
+    the whole table; every other read is a dict lookup.
+    """
+
+    def __init__(self, coordinator: DataUpdateCoordinator) -> None:
+        """Initialize the table."""
+        self._coordinator = coordinator
+        self._descriptions: defaultdict[
+            str, dict[str, GeotabSensorEntityDescription]
+        ] = defaultdict(dict)
+        self._values: dict[tuple[str, str], StateType] = {}
+        self._source: Any = None
+        self.generation = 0
+
+    def register(self, device_id: str, description: GeotabSensorEntityDescription) -> None:
+        """Start computing a description's value for a device."""
+        self._descriptions[device_id][description.key] = description
+        if self._source is not None and (device_data := self._source.get(device_id)) is not None:
+            self._values[(device_id, description.key)] = description.value_fn(device_data)
+
+    def unregister(self, device_id: str, key: str) -> None:
+        """Stop computing a description's value for a device."""
+        descriptions = self._descriptions.get(device_id)
+        if descriptions is not None:
+            descriptions.pop(key, None)
+            if not descriptions:
+                del self._descriptions[device_id]
+        self._values.pop((device_id, key), None)
+
+    def _rebuild(self, data: dict[str, Any] | None) -> None:
+        """Compute every registered value from fresh coordinator data."""
+        values: dict[tuple[str, str], StateType] = {}
+        for device_id, descriptions in self._descriptions.items():
+            device_data = data.get(device_id) if data else None
+            if device_data is None:
+                continue
+            for key, description in descriptions.items():
+                values[(device_id, key)] = description.value_fn(device_data)
+        self._values = values
+        self._source = data
+        self.generation += 1
+
+    def update_devices(self, device_ids: Iterable[str], previous: Any) -> None:
+        """Recompute the values of devices after a live feed update.
+
+        Only when the table was built from the data the update replaced;
+        otherwise the next read rebuilds the whole table anyway.
+        """
+        data = self._coordinator.data
+        if previous is None or self._source is not previous or data is None:
+            return
+        for device_id in device_ids:
+            if (device_data := data.get(device_id)) is None:
+                continue
+            for key, description in self._descriptions.get(device_id, {}).items():
+                self._values[(device_id, key)] = description.value_fn(device_data)
+        self._source = data
+
+    def get(self, device_id: str, key: str) -> StateType:
+        """Return the current value for a device's sensor."""
+        data = self._coordinator.data
+        if data is not self._source:
+            self._rebuild(data)
+        return self._values.get((device_id, key))
+
 
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
 ) -> None:
     """Set up the Geotab sensor platform."""
     coordinator: DataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
-
-    # Track which devices we've already added entities for
-    known_devices = set()
+    value_table = SensorValueTable(coordinator)
+    use_deadbands = entry.options.get(CONF_STATE_DEADBANDS, DEFAULT_STATE_DEADBANDS)
+    min_write_interval = entry.options.get(
+        CONF_MIN_WRITE_INTERVAL, DEFAULT_MIN_WRITE_INTERVAL
+    )
+    descriptions = async_profile_descriptions(hass, entry, Platform.SENSOR, SENSORS)
+    # Live sensors in Home Assistant by device; each sensor adds and removes itself
+    live_sensors: defaultdict[str, list[GeotabSensor]] = defaultdict(list)
 
     @callback
-    def async_add_new_entities():
-        """Add new entities when a new device is discovered."""
-        new_entities = []
-        for device_id in coordinator.data:
-            if device_id not in known_devices:
-                for description in SENSORS:
-                    new_entities.append(GeotabSensor(coordinator, device_id, description))
-                known_devices.add(device_id)
-
+    def async_add_devices(device_ids: Iterable[str]) -> None:
+        """Add entities for newly discovered devices."""
+        new_entities: list[GeotabSensor] = []
+        for device_id in device_ids:
+            for description in descriptions:
+                sensor = GeotabSensor(
+                    coordinator,
+                    device_id,
+                    description,
+                    value_table,
+                    deadband=description.deadband if use_deadbands else None,
+                    min_interval=(
+                        max(description.min_interval, min_write_interval)
+                        if description.state_class == SensorStateClass.MEASUREMENT
+                        else description.min_interval
+                    ),
+                    live_sensors=live_sensors if description.live else None,
+                )
+                new_entities.append(sensor)
         if new_entities:
             async_add_entities(new_entities)
 
-    # Add initial entities
-    async_add_new_entities()
+    @callback
+    def async_live_positions(device_ids: list[str], previous: Mapping[str, Any]) -> None:
+        """Update the live sensors of devices whose position came from the feed."""
+        value_table.update_devices(device_ids, previous)
+        for device_id in device_ids:
+            for sensor in live_sensors.get(device_id, ()):
+                sensor.async_handle_live_update()
 
-    # Listen for coordinator updates to add new devices dynamically
-    entry.async_on_unload(coordinator.async_add_listener(async_add_new_entities))
+    # Add initial entities
+    async_add_devices(coordinator.data)
+
+    # The coordinator signals only when the fleet actually gains vehicles
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_DEVICES_ADDED.format(entry.entry_id), async_add_devices
+        )
+    )
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_LIVE_POSITIONS.format(entry.entry_id), async_live_positions
+        )
+    )
+
+    if entry.options.get(CONF_PERFORMANCE_SENSORS, DEFAULT_PERFORMANCE_SENSORS):
+        async_add_entities(
+            GeotabPerformanceSensor(coordinator, entry, description)
+            for description in PERFORMANCE_SENSORS
+        )
+    else:
+        async_remove_api_device(hass, entry)
 
 
 class GeotabSensor(GeotabEntity, SensorEntity):
@@ -516,16 +805,96 @@ class GeotabSensor(GeotabEntity, SensorEntity):
         coordinator: DataUpdateCoordinator,
         device_id: str,
         description: GeotabSensorEntityDescription,
+        value_table: SensorValueTable,
+        deadband: float | None = None,
+        min_interval: float = 0,
+        live_sensors: defaultdict[str, list[GeotabSensor]] | None = None,
     ) -> None:
         """Initialize the sensor."""
         super().__init__(coordinator, device_id)
         self.entity_description = description
+        self._live_sensors = live_sensors
         self._attr_unique_id = f"{device_id}_{description.key}"
+        self._value_table = value_table
+        self._deadband = deadband
+        self._min_interval = min_interval
+        self._gated = bool(deadband) or min_interval > 0
+        # Last value and availability actually written, and when (monotonic)
+        self._written_value: StateType = None
+        self._written_available: bool | None = None
+        self._written_at = 0.0
+
+    async def async_added_to_hass(self) -> None:
+        """Register with the value table when added to Home Assistant."""
+        await super().async_added_to_hass()
+        self._value_table.register(self._device_id, self.entity_description)
+        self.async_on_remove(
+            partial(
+                self._value_table.unregister,
+                self._device_id,
+                self.entity_description.key,
+            )
+        )
+        if self._live_sensors is not None:
+            self._live_sensors[self._device_id].append(self)
+            self.async_on_remove(self._async_leave_live_sensors)
+
+    @callback
+    def _async_leave_live_sensors(self) -> None:
+        """Stop receiving live feed updates once removed."""
+        sensors = self._live_sensors[self._device_id]
+        sensors.remove(self)
+        if not sensors:
+            del self._live_sensors[self._device_id]
 
     @property
     def native_value(self) -> StateType:
         """Return the state of the sensor."""
-        return self.entity_description.value_fn(self.device_data)
+        if self._gated:
+            return self._written_value
+        return self._value_table.get(self._device_id, self.entity_description.key)
+
+    def _should_write(self, value: StateType, available: bool) -> bool:
+        """Return whether a new value is significant enough to write."""
+        if self._written_available is None or available != self._written_available:
+            return True
+        previous = self._written_value
+        if not isinstance(value, (int, float)) or not isinstance(previous, (int, float)):
+            return True
+        # Stopping and starting always matter, however small the step
+        if value == 0 or previous == 0:
+            return True
+        if self._deadband and abs(value - previous) < self._deadband:
+            return False
+        if self._min_interval and time.monotonic() - self._written_at < self._min_interval:
+            return False
+        return True
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write the state, recording what was written for deadband checks."""
+        if self._gated:
+            self._written_value = self._value_table.get(
+                self._device_id, self.entity_description.key
+            )
+            self._written_available = self.available
+            self._written_at = time.monotonic()
+        super().async_write_ha_state()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Skip the state write when the change is below the sensor's thresholds."""
+        if self._gated and not self._should_write(
+            self._value_table.get(self._device_id, self.entity_description.key),
+            self.available,
+        ):
+            return
+        super()._handle_coordinator_update()
+
+    @callback
+    def async_handle_live_update(self) -> None:
+        """Handle a live feed update, subject to the same write thresholds."""
+        self._handle_coordinator_update()
 
     @property
     def extra_state_attributes(self) -> dict[str, Any] | None:
@@ -541,3 +910,49 @@ class GeotabSensor(GeotabEntity, SensorEntity):
                     "idling_duration": trip.get("idlingDuration"),
                 }
         return None
+
+
+class GeotabPerformanceSensor(SensorEntity):
+    """A refresh performance sensor on the per-entry "Geotab API" device."""
+
+    entity_description: GeotabPerformanceSensorEntityDescription
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+
+    def __init__(
+        self,
+        coordinator: DataUpdateCoordinator,
+        entry: ConfigEntry,
+        description: GeotabPerformanceSensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        self.entity_description = description
+        self._history: PerformanceHistory = coordinator.performance
+        self._entry_id = entry.entry_id
+        self._attr_unique_id = f"{entry.entry_id}_{description.key}"
+        self._attr_device_info: DeviceInfo = api_device_info(entry)
+
+    async def async_added_to_hass(self) -> None:
+        """Write a new state after every timed refresh, successful or not."""
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_PERFORMANCE_UPDATED.format(self._entry_id),
+                self.async_write_ha_state,
+            )
+        )
+
+    @property
+    def available(self) -> bool:
+        """Return True once at least one refresh has been timed."""
+        return self._history.latest is not None
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the state of the sensor."""
+        return self.entity_description.value_fn(self._history)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return extra state attributes."""
+        return self.entity_description.attr_fn(self._history)
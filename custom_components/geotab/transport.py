@@ -0,0 +1,250 @@
+"""JSON-RPC transport for the Geotab API.
+
+A stand-in for the parts of mygeotab.API the client uses (authenticate, call,
+get and multi_call), over a keep-alive session that may be shared. By default
+it follows federation like mygeotab: it authenticates against my.geotab.com
+and then talks to https://<server>/apiv1 of the server the database lives on.
+It can also be pointed at an explicit endpoint URL, including plain http ones
+such as a local emulator. mygeotab opens a new session per request. Errors are
+raised as mygeotab exceptions so callers handle both the same way.
+
+Bodies go through a pluggable JSON codec, orjson when it is installed (Home
+Assistant ships it). Unlike mygeotab's decoder, neither codec turns date
+strings into datetime objects, which is where most of its decode time goes.
+Responses are requested gzip or deflate compressed, and large request bodies
+are sent gzip compressed unless the server answers 415 Unsupported Media Type.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+import gzip
+import json
+from typing import Any
+
+from mygeotab.api import Credentials, process_parameters
+from mygeotab.exceptions import (
+    AuthenticationException,
+    MyGeotabException,
+    TimeoutException,
+)
+from mygeotab.serializers import object_serializer
+import requests
+
+DEFAULT_SERVER = "my.geotab.com"
+DEFAULT_TIMEOUT = 300
+_HEADERS = {
+    "Content-Type": "application/json; charset=UTF-8",
+    "Accept-Encoding": "gzip, deflate",
+}
+# Request bodies smaller than this are not worth compressing
+COMPRESS_MIN_BYTES = 1024
+
+# Server errors after which a fresh session may succeed
+_REAUTHENTICATE_ERRORS = ("InvalidUserException",)
+# DbUnavailableException messages that mean the database does not exist (yet)
+_UNKNOWN_DATABASE_MESSAGES = ("Initializing", "UnknownDatabase")
+
+
+
+@dataclass(frozen=True)
+class JsonCodec:
+    """Encoder and decoder for JSON-RPC bodies."""
+
+    name: str
+    dumps: Callable[[Any], bytes]
+    loads: Callable[[bytes], Any]
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """Encode with the standard library, formatting datetimes like mygeotab."""
+    return json.dumps(obj, default=object_serializer, separators=(",", ":")).encode()
+
+
+JSON_CODEC = JsonCodec("json", _json_dumps, json.loads)
+
+
+def _orjson_codec() -> JsonCodec | None:
+    """Return the orjson codec, or None if orjson is not installed."""
+    try:
+        import orjson
+    except ImportError:
+        return None
+
+    def dumps(obj: Any) -> bytes:
+        return orjson.dumps(
+            obj, default=object_serializer, option=orjson.OPT_PASSTHROUGH_DATETIME
+        )
+
+    return JsonCodec("orjson", dumps, orjson.loads)
+
+
+ORJSON_CODEC = _orjson_codec()
+DEFAULT_CODEC = ORJSON_CODEC or JSON_CODEC
+
+
+class GeotabJsonRpc:
+    """Synchronous Geotab JSON-RPC client."""
+
+    def __init__(
+        self,
+        username: str,
+        password: str | None,
+        database: str | None,
+        endpoint: str | None = None,
+        session_id: str | None = None,
+        timeout: float = DEFAULT_TIMEOUT,
+        http_session: requests.Session | None = None,
+        codec: JsonCodec = DEFAULT_CODEC,
+        compress_requests: bool = True,
+        server: str = DEFAULT_SERVER,
+    ) -> None:
+        """Initialize the client; http_session may be shared between clients.
+
+        Without an endpoint, requests go to the credentials' server, which
+        authentication moves to the one federation resolves.
+        """
+        self._endpoint: str | None = None
+        if endpoint is not None:
+            self._endpoint = endpoint.rstrip("/")
+            if not self._endpoint.endswith("/apiv1"):
+                self._endpoint += "/apiv1"
+            server = endpoint
+        self.credentials = Credentials(username, session_id, database, server, password)
+        self.timeout = timeout
+        self.codec = codec
+        self.compress_requests = compress_requests
+        self._http = http_session or requests.Session()
+        self._owns_http = http_session is None
+        # Body bytes sent and received on the wire, and after decompression
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.bytes_decoded = 0
+
+    @property
+    def endpoint(self) -> str:
+        """Return the URL requests are sent to."""
+        if self._endpoint is not None:
+            return self._endpoint
+        return f"https://{self.credentials.server}/apiv1"
+
+    def _send(self, body: bytes) -> requests.Response:
+        """POST a request body, gzip compressed when large enough and accepted."""
+        headers = _HEADERS
+        data = body
+        endpoint = self.endpoint
+        if self.compress_requests and len(body) >= COMPRESS_MIN_BYTES:
+            headers = {**_HEADERS, "Content-Encoding": "gzip"}
+            data = gzip.compress(body, compresslevel=5)
+        try:
+            response = self._http.post(
+                endpoint, data=data, headers=headers, timeout=self.timeout
+            )
+            if response.status_code == 415 and data is not body:
+                # The server does not take compressed requests; stop trying
+                self.compress_requests = False
+                data = body
+                response = self._http.post(
+                    endpoint, data=data, headers=_HEADERS, timeout=self.timeout
+                )
+        except requests.Timeout as err:
+            raise TimeoutException(endpoint) from err
+        self.bytes_sent += len(data)
+        return response
+
+    def _post(self, method: str, params: dict[str, Any]) -> Any:
+        """Send one JSON-RPC request and return its result."""
+        response = self._send(self.codec.dumps({"id": -1, "method": method, "params": params}))
+        response.raise_for_status()
+        content = response.content
+        self.bytes_decoded += len(content)
+        self.bytes_received += int(response.headers.get("Content-Length", len(content)))
+        data = self.codec.loads(content)
+        if isinstance(data, dict):
+            if "error" in data:
+                raise MyGeotabException(data["error"])
+            if "result" in data:
+                return data["result"]
+        return data
+
+    def authenticate(self) -> Credentials:
+        """Authenticate and store the session credentials and resolved server."""
+        credentials = self.credentials
+        try:
+            result = self._post(
+                "Authenticate",
+                {
+                    "database": credentials.database,
+                    "userName": credentials.username,
+                    "password": credentials.password,
+                },
+            )
+        except MyGeotabException as err:
+            if err.name in _REAUTHENTICATE_ERRORS or (
+                err.name == "DbUnavailableException"
+                and any(text in err.message for text in _UNKNOWN_DATABASE_MESSAGES)
+            ):
+                raise AuthenticationException(
+                    credentials.username, credentials.database, self.endpoint
+                ) from err
+            raise
+        session = result["credentials"]
+        server = credentials.server
+        if self._endpoint is None and result.get("path") not in (None, "ThisServer"):
+            # Federation: the database lives on another server
+            server = result["path"]
+        self.credentials = Credentials(
+            session["userName"],
+            session["sessionId"],
+            session["database"],
+            server,
+            credentials.password,
+        )
+        return self.credentials
+
+    def call(self, method: str, **parameters: Any) -> Any:
+        """Call an API method, re-authenticating once if the session expired."""
+        params = process_parameters(parameters)
+        if not self.credentials.session_id:
+            self.authenticate()
+        try:
+            return self._post(method, {**params, "credentials": self.credentials.get_param()})
+        except MyGeotabException as err:
+            if err.name not in _REAUTHENTICATE_ERRORS or not self.credentials.password:
+                raise
+        self.authenticate()
+        return self._post(method, {**params, "credentials": self.credentials.get_param()})
+
+    def get(self, type_name: str, **parameters: Any) -> Any:
+        """Get entities of a type."""
+        results_limit = parameters.pop("resultsLimit", None)
+        search = parameters.pop("search", None) or parameters
+        params: dict[str, Any] = {"typeName": type_name}
+        if search:
+            params["search"] = search
+        if results_limit is not None:
+            params["resultsLimit"] = results_limit
+        return self.call("Get", **params)
+
+    def multi_call(self, calls: list[tuple[str, dict[str, Any]]]) -> list[Any]:
+        """Execute several calls in one request."""
+        return self.call(
+            "ExecuteMultiCall",
+            calls=[{"method": method, "params": params} for method, params in calls],
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the codec and traffic counters for diagnostics."""
+        return {
+            "codec": self.codec.name,
+            "compress_requests": self.compress_requests,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "bytes_decoded": self.bytes_decoded,
+        }
+
+    def close(self) -> None:
+        """Close the underlying HTTP session unless it is shared."""
+        if self._owns_http:
+            self._http.close()
@@ -1,4 +1,5 @@
 """Global fixtures for Geotab integration tests."""
+import copy
 from unittest.mock import patch
 import pytest
 
@@ -10,12 +11,37 @@ def auto_enable_custom_integrations(request):
         hass.data.pop("custom_components", None)
     yield
 
+@pytest.fixture(autouse=True)
+def join_geotab_executors():
+    """Join API client thread pools after each test so no threads linger."""
+    try:
+        from custom_components.geotab import executor
+    except ImportError:
+        # Pure module tests run without Home Assistant
+        yield
+        return
+    pools = []
+    thread_pool = executor.ThreadPoolExecutor
+
+    def _track(*args, **kwargs):
+        pool = thread_pool(*args, **kwargs)
+        pools.append(pool)
+        return pool
+
+    with patch.object(executor, "ThreadPoolExecutor", _track):
+        yield
+    for pool in pools:
+        pool.shutdown(wait=True)
+
 @pytest.fixture
 def mock_geotab_api():
-    """Mock the underlying mygeotab API library."""
-    with patch("mygeotab.API") as mock:
+    """Mock the JSON-RPC transport the API client talks through."""
+    from mygeotab.api import Credentials
+
+    with patch("custom_components.geotab.transport.GeotabJsonRpc") as mock:
         instance = mock.return_value
         instance.authenticate.return_value = True
+        instance.credentials = Credentials("user", None, "db", "my.geotab.com", "pass")
 
         def _mock_get(type_name, *args, **kwargs):
             if type_name == "Device":
@@ -79,4 +105,9 @@ def mock_geotab_api():
                 {"id": "trip2", "distance": 22.5, "start": "2026-03-07T08:00:00Z", "stop": "2026-03-07T08:45:00Z", "maximumSpeed": 100, "averageSpeed": 70, "drivingDuration": "PT40M", "idlingDuration": "PT3M"},
             ],
         ]
+        # Like the real API, every call returns new objects; decoding consumes
+        # the statusData of each status
+        instance.multi_call.side_effect = lambda *args, **kwargs: copy.deepcopy(
+            instance.multi_call.return_value
+        )
         yield instance
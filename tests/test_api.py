@@ -1,15 +1,21 @@
 """Tests for Geotab API client."""
 import asyncio
 import socket
+import threading
 import pytest
 from unittest.mock import MagicMock, patch
-from mygeotab.exceptions import AuthenticationException
+from mygeotab.exceptions import AuthenticationException, MyGeotabException
 
 from custom_components.geotab.api import (
+    device_shard,
+    FAULT_LOOKUP_RESERVE,
+    FetchTimeout,
     GeotabApiClient,
     InvalidAuth,
     ApiError,
 )
+from custom_components.geotab.models import DeviceSnapshot
+from custom_components.geotab.performance import RefreshDeadline
 
 
 @pytest.mark.asyncio
@@ -82,3 +88,410 @@ async def test_api_get_data_api_error(mock_geotab_api):
     client = GeotabApiClient("user", "pass", "db", session)
     with pytest.raises(ApiError):
         await client.async_get_full_device_data()
+
+
+@pytest.mark.asyncio
+async def test_api_get_data_builds_snapshot(mock_geotab_api):
+    """Test that device data is returned as a layered snapshot."""
+    session = MagicMock()
+    client = GeotabApiClient("user", "pass", "db", session)
+    data = await client.async_get_full_device_data()
+
+    snapshot = data["device1"]
+    assert isinstance(snapshot, DeviceSnapshot)
+    assert snapshot["ignition"] == 1
+    assert snapshot["last_trip"]["id"] == "trip1"
+    assert snapshot["active_faults"][0]["id"] == "fault1"
+    assert snapshot["_diagnostics_lookup"] == {"diag1": "Test Diagnostic"}
+    assert "statusData" not in snapshot
+
+
+@pytest.mark.asyncio
+async def test_api_get_data_shares_unchanged_objects(mock_geotab_api):
+    """Test that unchanged device metadata and lookups are shared between polls."""
+    session = MagicMock()
+    client = GeotabApiClient("user", "pass", "db", session)
+    first = (await client.async_get_full_device_data())["device1"]
+    second = (await client.async_get_full_device_data(include_trips=False))["device1"]
+
+    assert second.device is first.device
+    assert second.diagnostics_lookup is first.diagnostics_lookup
+    assert "trip_history" not in second
+
+
+@pytest.mark.asyncio
+async def test_api_counts_calls_and_cache_hits(mock_geotab_api):
+    """Test that API calls and device cache reuse are counted for diagnostics."""
+    client = GeotabApiClient("user", "pass", "db", MagicMock())
+
+    await client.async_get_full_device_data()
+    await client.async_get_full_device_data()
+
+    assert client.call_counts["Get(Device)"] == 2
+    assert client.call_counts["ExecuteMultiCall"] == 2
+    assert client.call_counts["Get(DeviceStatusInfo)"] == 2
+    assert client.call_counts["Get(Diagnostic)"] == 1
+    assert client.device_cache_stats.as_dict() == {"hits": 1, "misses": 1, "hit_rate": 0.5}
+    assert client.diagnostics_lookup_stats.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_api_coalesces_concurrent_fetches(mock_geotab_api):
+    """Test that a fetch issued while an identical one is pending shares its call."""
+    release = threading.Event()
+    results = mock_geotab_api.multi_call.return_value
+
+    def _slow_multi_call(calls):
+        release.wait(5)
+        return results
+
+    mock_geotab_api.multi_call.side_effect = _slow_multi_call
+    client = GeotabApiClient("user", "pass", "db", MagicMock())
+
+    first = asyncio.create_task(client.async_get_full_device_data())
+    second = asyncio.create_task(client.async_get_full_device_data())
+    await asyncio.sleep(0.05)
+    release.set()
+
+    assert (await first).keys() == (await second).keys() == {"device1"}
+    assert mock_geotab_api.multi_call.call_count == 1
+    assert client.executor.coalesced == 1
+
+
+@pytest.mark.asyncio
+async def test_api_scoped_fetch_for_one_device(mock_geotab_api):
+    """Test that a scoped refresh makes one multi_call for the requested streams only."""
+    client = GeotabApiClient("user", "pass", "db", MagicMock())
+    previous = await client.async_get_full_device_data()
+    mock_geotab_api.get.reset_mock()
+    mock_geotab_api.multi_call.reset_mock()
+
+    scoped = await client.async_get_scoped_data(previous, ["device1"], frozenset({"status"}))
+
+    (calls,), _ = mock_geotab_api.multi_call.call_args
+    assert [params["typeName"] for _, params in calls] == ["DeviceStatusInfo"]
+    assert calls[0][1]["search"]["deviceSearch"] == {"id": "device1"}
+    assert mock_geotab_api.get.call_count == 0
+    assert scoped["device1"].device is previous["device1"].device
+    assert scoped["device1"].active_faults is previous["device1"].active_faults
+    assert scoped["device1"].trip_history is previous["device1"].trip_history
+    assert scoped["device1"]["odometer"] == 52015700
+
+
+@pytest.mark.asyncio
+async def test_api_scoped_fetch_skips_unknown_devices(mock_geotab_api):
+    """Test that a scope with only unknown devices makes no call."""
+    client = GeotabApiClient("user", "pass", "db", MagicMock())
+
+    assert await client.async_get_scoped_data({}, ["nope"]) == {}
+    assert mock_geotab_api.multi_call.call_count == 0
+
+
+@pytest.mark.asyncio
+async def test_rejected_session_authenticates_again(mock_geotab_api):
+    """Test that a rejected session is replaced by one password authentication."""
+    client = GeotabApiClient("user", "pass", "db", MagicMock())
+    mock_geotab_api.credentials.password = None
+    mock_geotab_api.credentials.session_id = "expired"
+    mock_geotab_api.get.side_effect = [
+        AuthenticationException("user", "db", "server"),
+        [{"id": "device1", "name": "Test Vehicle", "deviceType": "GO9"}],
+        [{"id": "diag1", "name": "Test Diagnostic"}],
+    ]
+
+    data = await client.async_get_full_device_data()
+
+    assert "device1" in data
+    assert client.call_counts["Authenticate"] == 1
+    assert mock_geotab_api.credentials.session_id is None
+    assert mock_geotab_api.credentials.password == "pass"
+
+
+@pytest.mark.asyncio
+async def test_rejected_password_raises_invalid_auth(mock_geotab_api):
+    """Test that a failed fresh authentication is reported as invalid credentials."""
+    client = GeotabApiClient("user", "pass", "db", MagicMock())
+    mock_geotab_api.get.side_effect = AuthenticationException("user", "db", "server")
+
+    with pytest.raises(InvalidAuth):
+        await client.async_get_full_device_data()
+
+
+@pytest.mark.asyncio
+async def test_scoped_fetch_rejected_password_raises_invalid_auth(mock_geotab_api):
+    """Test that a scoped fetch reports rejected credentials, not a generic error."""
+    client = GeotabApiClient("user", "pass", "db", MagicMock())
+    previous = await client.async_get_full_device_data()
+    mock_geotab_api.multi_call.side_effect = AuthenticationException("user", "db", "server")
+
+    with pytest.raises(InvalidAuth):
+        await client.async_get_scoped_data(previous, ["device1"], frozenset({"status"}))
+
+
+@pytest.mark.asyncio
+async def test_scoped_fetch_follows_its_deadline(mock_geotab_api):
+    """Test that a scoped fetch running past its deadline raises FetchTimeout."""
+    client = GeotabApiClient("user", "pass", "db", MagicMock())
+    previous = await client.async_get_full_device_data()
+    release = threading.Event()
+    mock_geotab_api.multi_call.side_effect = lambda calls: release.wait(5)
+
+    try:
+        with pytest.raises(FetchTimeout, match="after 0 seconds"):
+            await client.async_get_scoped_data(
+                previous, None, frozenset({"trips"}), deadline=RefreshDeadline(0.05)
+            )
+    finally:
+        release.set()
+
+
+def _two_device_api(mock_geotab_api, bad_device=None, error="ArgumentException"):
+    """Serve two devices; multi_calls holding a Trip call for bad_device fail."""
+    devices = [{"id": "device1", "name": "One"}, {"id": "device2", "name": "Two"}]
+    mock_geotab_api.get.side_effect = lambda type_name, **kwargs: (
+        devices if type_name == "Device" else []
+    )
+
+    def _multi_call(calls):
+        results = []
+        for _, params in calls:
+            if params["typeName"] == "DeviceStatusInfo":
+                results.append([{"device": {"id": "device1"}, "speed": 10.0},
+                                {"device": {"id": "device2"}, "speed": 20.0}])
+            elif params["typeName"] == "Trip":
+                if params["search"]["deviceSearch"]["id"] == bad_device:
+                    raise MyGeotabException({"errors": [{"name": error, "message": "bad"}]})
+                results.append([{"id": "new", "distance": 5, "start": "2026-03-08T10:00:00Z"}])
+            else:
+                results.append([])
+        return results
+
+    mock_geotab_api.multi_call.side_effect = _multi_call
+
+
+@pytest.mark.asyncio
+async def test_failed_sub_call_keeps_the_rest(mock_geotab_api):
+    """Test that one failing Trip sub-call only costs that device's trips."""
+    _two_device_api(mock_geotab_api, bad_device="device2")
+    client = GeotabApiClient("user", "pass", "db", MagicMock())
+    old_trips = [{"id": "old", "distance": 3, "start": "2026-03-07T10:00:00Z"}]
+    previous = {"device2": DeviceSnapshot({"id": "device2"}, trip_history=old_trips)}
+
+    data = await client.async_get_full_device_data(previous=previous)
+
+    assert data["device1"]["speed"] == 10.0
+    assert data["device1"]["last_trip"]["id"] == "new"
+    assert data["device1"].stale == frozenset()
+    assert data["device2"]["speed"] == 20.0
+    assert data["device2"].trip_history is old_trips
+    assert data["device2"].stale == {"trips"}
+    assert client.call_counts["failed_sub_calls"] == 1
+    assert client.call_counts["ExecuteMultiCall(retry)"] <= 6
+
+    # A later refresh without trips keeps the marker until trips are fetched again
+    _two_device_api(mock_geotab_api)
+    data = await client.async_get_full_device_data(include_trips=False, previous=data)
+    assert data["device2"].stale == {"trips"}
+    data = await client.async_get_full_device_data(previous=data)
+    assert data["device2"].stale == frozenset()
+
+
+@pytest.mark.asyncio
+async def test_undecodable_result_falls_back(mock_geotab_api):
+    """Test that a result the decoder rejects is replaced by the previous data."""
+    _two_device_api(mock_geotab_api)
+    results = mock_geotab_api.multi_call.side_effect
+    mock_geotab_api.multi_call.side_effect = lambda calls: [
+        result if index != 1 else [{"device": {"id": "device1"}, "dateTime": 1},
+                                   {"device": {"id": "device1"}, "dateTime": "x"}]
+        for index, result in enumerate(results(calls))
+    ]
+    client = GeotabApiClient("user", "pass", "db", MagicMock())
+    faults = [{"id": "fault1"}]
+    previous = {"device1": DeviceSnapshot({"id": "device1"}, active_faults=faults)}
+
+    data = await client.async_get_full_device_data(previous=previous)
+
+    assert data["device1"]["active_faults"] is faults
+    assert data["device1"].stale == {"faults"}
+    assert data["device2"].stale == {"faults"}
+    assert data["device2"]["speed"] == 20.0
+
+
+@pytest.mark.asyncio
+async def test_batch_errors_are_not_retried(mock_geotab_api):
+    """Test that errors failing any multi_call raise without isolation retries."""
+    _two_device_api(mock_geotab_api, bad_device="device2", error="OverLimitException")
+    client = GeotabApiClient("user", "pass", "db", MagicMock())
+
+    with pytest.raises(ApiError, match="OverLimitException"):
+        await client.async_get_full_device_data()
+    assert mock_geotab_api.multi_call.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_fault_lookup_deferred_near_the_deadline(mock_geotab_api):
+    """Test that fault names are left for a later refresh when time is short."""
+    client = GeotabApiClient("user", "pass", "db", MagicMock())
+
+    data = await client.async_get_full_device_data(
+        deadline=RefreshDeadline(FAULT_LOOKUP_RESERVE - 1)
+    )
+
+    assert data["device1"]["active_faults"][0]["id"] == "fault1"
+    assert client.call_counts["Get(Diagnostic)"] == 0
+    assert client.deferred_fault_lookups == 1
+
+
+@pytest.mark.asyncio
+async def test_sub_calls_follow_the_batch_size(mock_geotab_api):
+    """Test that sub-calls are split into batches of the controller's size."""
+    _two_device_api(mock_geotab_api)
+    client = GeotabApiClient("user", "pass", "db", MagicMock())
+    client.batch_sizer.size = 3
+
+    data = await client.async_get_full_device_data()
+
+    batches = [len(call.args[0]) for call in mock_geotab_api.multi_call.call_args_list]
+    assert batches == [3, 1]
+    assert data["device2"]["speed"] == 20.0
+    assert data["device2"]["last_trip"]["id"] == "new"
+    assert client.batch_sizer.batches == 2
+    # The full batch was fast, so the next refresh may use a bigger one
+    assert client.batch_sizer.size == 13
+
+
+@pytest.mark.asyncio
+async def test_device_filter_is_applied_in_the_search(mock_geotab_api):
+    """Test that group and active-only filters reach the Device and status searches."""
+    _two_device_api(mock_geotab_api)
+    client = GeotabApiClient(
+        "user", "pass", "db", MagicMock(), device_groups=["b1", "b2"], active_only=True
+    )
+
+    await client.async_get_full_device_data(include_trips=False)
+
+    device_search = mock_geotab_api.get.call_args_list[0].kwargs["search"]
+    assert device_search["groups"] == [{"id": "b1"}, {"id": "b2"}]
+    assert "fromDate" in device_search
+    status_search = mock_geotab_api.multi_call.call_args.args[0][0][1]["search"]
+    assert status_search["deviceSearch"]["groups"] == device_search["groups"]
+
+    # Without filters every device is fetched, as before
+    unfiltered = GeotabApiClient("user", "pass", "db", MagicMock())
+    mock_geotab_api.get.reset_mock()
+    await unfiltered.async_get_full_device_data(include_trips=False)
+    assert mock_geotab_api.get.call_args_list[0].kwargs == {}
+
+
+@pytest.mark.asyncio
+async def test_get_groups(mock_geotab_api):
+    """Test that groups are returned by ID, falling back to the ID as name."""
+    mock_geotab_api.get.side_effect = lambda type_name, **kwargs: [
+        {"id": "GroupCompanyId"},
+        {"id": "b1", "name": "Vans"},
+    ]
+    client = GeotabApiClient("user", "pass", "db", MagicMock())
+
+    assert await client.async_get_groups() == {
+        "GroupCompanyId": "GroupCompanyId",
+        "b1": "Vans",
+    }
+
+
+@pytest.mark.asyncio
+async def test_sharded_fetch_polls_one_shard_in_full(mock_geotab_api):
+    """Test that a sharded refresh fetches one shard's details and everyone's position."""
+    devices = [{"id": f"b{index}", "name": f"Vehicle {index}"} for index in range(6)]
+    mock_geotab_api.get.side_effect = lambda type_name, **kwargs: (
+        devices if type_name == "Device" else []
+    )
+
+    def _multi_call(calls):
+        results = []
+        for _, params in calls:
+            search = params["search"]
+            if params["typeName"] != "DeviceStatusInfo":
+                results.append([])
+            elif "diagnostics" not in search:
+                results.append(
+                    [{"device": {"id": device["id"]}, "speed": 30.0} for device in devices]
+                )
+            else:
+                device_id = search["deviceSearch"]["id"]
+                results.append([{
+                    "device": {"id": device_id},
+                    "speed": 30.0,
+                    "statusData": [{
+                        "diagnostic": {"id": "DiagnosticGoDeviceVoltageId"},
+                        "data": 14.0,
+                        "dateTime": "2026-03-08T10:00:00Z",
+                    }],
+                }])
+        return results
+
+    mock_geotab_api.multi_call.side_effect = _multi_call
+    client = GeotabApiClient("user", "pass", "db", MagicMock())
+    previous = {
+        device["id"]: DeviceSnapshot(
+            device, diagnostics={"voltage": 12.0}, status={"speed": 0.0}
+        )
+        for device in devices[:5]
+    }
+
+    data = await client.async_get_full_device_data(previous=previous, shard=(2, 3))
+
+    in_shard = {device_id for device_id in previous if device_shard(device_id, 3) == 2}
+    assert in_shard == {"b3"}
+    # The shard's devices and the new device are fetched in full
+    fetched = {
+        params["search"]["deviceSearch"]["id"]
+        for _, params in mock_geotab_api.multi_call.call_args.args[0]
+        if params["typeName"] == "Trip"
+    }
+    assert fetched == in_shard | {"b5"}
+    for device_id, snapshot in data.items():
+        assert snapshot["speed"] == 30.0
+        if device_id in fetched:
+            assert snapshot["voltage"] == 14.0
+            assert snapshot.refreshed_at is not None
+        else:
+            # Details are kept from the previous refresh
+            assert snapshot["voltage"] == 12.0
+            assert snapshot.refreshed_at is None
+
+
+@pytest.mark.asyncio
+async def test_log_feed_continues_from_the_last_version(mock_geotab_api):
+    """Test that the feed starts from now and then polls from the returned version."""
+    mock_geotab_api.call.return_value = {
+        "data": [{"device": {"id": "b1"}, "dateTime": "2026-03-08T10:00:00Z",
+                  "latitude": 45.0, "longitude": 9.0, "speed": 12}],
+        "toVersion": "000000000000000a",
+    }
+    client = GeotabApiClient("user", "pass", "db", MagicMock())
+
+    fixes, version = await client.async_get_log_feed()
+
+    assert version == "000000000000000a"
+    assert fixes[0].device_id == "b1"
+    assert fixes[0].payload["speed"] == 12
+    first = mock_geotab_api.call.call_args
+    assert first.args == ("GetFeed",)
+    assert "fromDate" in first.kwargs["search"]
+    assert "fromVersion" not in first.kwargs
+
+    mock_geotab_api.call.return_value = {"data": []}
+    fixes, version = await client.async_get_log_feed(version)
+    assert fixes == []
+    # A page without a version keeps the one we had
+    assert version == "000000000000000a"
+    assert mock_geotab_api.call.call_args.kwargs["fromVersion"] == "000000000000000a"
+    assert client.call_counts["GetFeed(LogRecord)"] == 2
+
+    mock_geotab_api.call.side_effect = MyGeotabException(
+        {"errors": [{"name": "OverLimitException", "message": "Quota exceeded"}]}
+    )
+    with pytest.raises(ApiError):
+        await client.async_get_log_feed(version)
+
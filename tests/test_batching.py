@@ -0,0 +1,62 @@
+"""Tests for adaptive multi_call batch sizing."""
+
+import importlib.util
+import os
+
+# Import batching directly from file to avoid loading __init__.py (which needs homeassistant)
+_BATCHING_PATH = os.path.join(
+    os.path.dirname(__file__),
+    "..",
+    "custom_components",
+    "geotab",
+    "batching.py",
+)
+_spec = importlib.util.spec_from_file_location("batching", _BATCHING_PATH)
+batching = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(batching)
+
+
+class TestBatchSizeController:
+    """Tests for BatchSizeController."""
+
+    def test_split_covers_every_sub_call(self):
+        controller = batching.BatchSizeController(size=4)
+        assert [list(batch) for batch in controller.split(10)] == [
+            [0, 1, 2, 3],
+            [4, 5, 6, 7],
+            [8, 9],
+        ]
+        assert controller.split(0) == []
+
+    def test_full_fast_batches_grow_additively(self):
+        controller = batching.BatchSizeController(size=20, step=10, max_size=35)
+        controller.record(20, 1.0, success=True)
+        assert controller.size == 30
+        # A batch smaller than the size says nothing about a bigger one
+        controller.record(12, 1.0, success=True)
+        assert controller.size == 30
+        controller.record(30, 1.0, success=True)
+        assert controller.size == 35
+        assert controller.increases == 2
+
+    def test_slow_or_failed_batches_halve_down_to_the_minimum(self):
+        controller = batching.BatchSizeController(size=40, min_size=15, target_latency=5)
+        controller.record(40, 6.0, success=True)
+        assert controller.size == 20
+        controller.record(20, 1.0, success=False)
+        assert controller.size == 15
+        controller.record(15, 1.0, success=False)
+        assert controller.size == 15
+        assert controller.decreases == 2
+        assert controller.errors == 2
+
+    def test_as_dict_reports_latency(self):
+        controller = batching.BatchSizeController()
+        assert controller.as_dict()["average_latency"] is None
+        controller.record(10, 2.0, success=True)
+        controller.record(10, 4.0, success=True)
+        state = controller.as_dict()
+        assert state["last_latency"] == 4.0
+        assert state["average_latency"] == 2.4
+        assert state["batches"] == 2
+        assert state["batch_size"] == batching.MAX_BATCH_SIZE
@@ -0,0 +1,78 @@
+"""Tests for Geotab binary sensors."""
+import dataclasses
+from unittest.mock import MagicMock
+
+from custom_components.geotab.binary_sensor import (
+    BINARY_SENSORS,
+    GeotabBinarySensor,
+    _format_fault_attributes,
+)
+
+
+def _make_fault(fault_id: str, diagnostic_id: str) -> dict:
+    """Create a FaultData-shaped dict."""
+    return {
+        "id": fault_id,
+        "device": {"id": "device1"},
+        "diagnostic": {"id": diagnostic_id},
+        "dateTime": "2026-02-13T12:00:00Z",
+        "faultState": "Active",
+    }
+
+
+def _make_fault_sensor(data: dict) -> GeotabBinarySensor:
+    """Create an active_faults sensor bound to a mock coordinator."""
+    coordinator = MagicMock()
+    coordinator.data = {"device1": data}
+    description = next(d for d in BINARY_SENSORS if d.key == "active_faults")
+    return GeotabBinarySensor(coordinator, "device1", description)
+
+
+def test_format_fault_attributes_known_fault():
+    """Test that known diagnostic fragments map to their name and code."""
+    attrs = _format_fault_attributes(
+        [_make_fault("f1", "DiagnosticDeviceHasBeenUnpluggedId")]
+    )
+    assert attrs["fault_count"] == 1
+    assert attrs["faults_list"] == ["[136] Device Unplugged"]
+
+
+def test_format_fault_attributes_prefers_lookup():
+    """Test that API-resolved names win over the built-in mapping."""
+    attrs = _format_fault_attributes(
+        [_make_fault("f1", "DiagnosticLowVoltageId")],
+        {"DiagnosticLowVoltageId": "Resolved Name"},
+    )
+    assert attrs["faults_details"][0]["name"] == "Resolved Name"
+    assert attrs["faults_details"][0]["code"] == "N/A"
+
+
+def test_fault_attributes_cached_until_faults_change():
+    """Test that fault attributes are only rendered when the fault set changes."""
+    data = {
+        "active_faults": [_make_fault("f1", "diag1")],
+        "_diagnostics_lookup": {},
+        "_diagnostics_lookup_version": 0,
+    }
+    sensor = _make_fault_sensor(data)
+    render = MagicMock(side_effect=sensor.entity_description.attr_fn)
+    sensor.entity_description = dataclasses.replace(
+        sensor.entity_description, attr_fn=render
+    )
+
+    first = sensor.extra_state_attributes
+    assert sensor.extra_state_attributes is first
+    assert render.call_count == 1
+
+    data["_diagnostics_lookup_version"] = 1
+    assert sensor.extra_state_attributes is not first
+    assert render.call_count == 2
+
+    data["active_faults"] = [_make_fault("f2", "diag1")]
+    second = sensor.extra_state_attributes
+    assert render.call_count == 3
+
+    data["active_faults"][0]["faultState"] = "Inactive"
+    assert sensor.extra_state_attributes is not second
+    assert render.call_count == 4
+    assert sensor.extra_state_attributes["faults_details"][0]["state"] == "Inactive"
@@ -0,0 +1,112 @@
+"""Tests for Geotab API capture and replay."""
+import gzip
+
+import pytest
+from unittest.mock import MagicMock
+from mygeotab.exceptions import AuthenticationException, MyGeotabException
+
+from custom_components.geotab.api import ApiError, GeotabApiClient, InvalidAuth
+from custom_components.geotab.capture import REDACTED, load_capture, redact
+
+
+async def test_capture_replays_the_same_snapshot(mock_geotab_api, tmp_path):
+    """Test that a captured refresh replays to the same device data."""
+    path = str(tmp_path / "capture.jsonl.gz")
+    live = GeotabApiClient("user", "pass", "db", MagicMock(), capture_path=path)
+    await live.async_authenticate()
+    original = await live.async_get_full_device_data()
+
+    assert [record["call"] for record in load_capture(path)] == [
+        "authenticate",
+        "get",
+        "multi_call",
+        "get",
+    ]
+
+    replays = []
+    # Recorded authentication is skipped when the replay does not ask for it
+    for authenticate in (True, False):
+        client = GeotabApiClient("user", "pass", "db", MagicMock(), replay_path=path)
+        if authenticate:
+            await client.async_authenticate()
+        replays.append(await client.async_get_full_device_data())
+
+    assert dict(replays[0]["device1"]) == dict(replays[1]["device1"])
+    assert replays[0]["device1"]["name"] == original["device1"]["name"]
+    assert replays[0]["device1"]["odometer"] == original["device1"]["odometer"]
+    assert replays[0]["device1"]["active_faults"][0]["id"] == "fault1"
+
+
+async def test_capture_replays_the_live_feed(mock_geotab_api, tmp_path):
+    """Test that GetFeed calls are recorded and answered on replay."""
+    mock_geotab_api.call.return_value = {
+        "data": [{
+            "device": {"id": "device1"},
+            "dateTime": "2026-03-08T10:00:10Z",
+            "latitude": 45.1,
+            "longitude": 9.1,
+            "speed": 40,
+        }],
+        "toVersion": "v2",
+    }
+    path = str(tmp_path / "capture.jsonl.gz")
+    live = GeotabApiClient("user", "pass", "db", MagicMock(), capture_path=path)
+    original, version = await live.async_get_log_feed("v1")
+
+    record = load_capture(path)[-1]
+    assert record["call"] == "call"
+    assert record["args"]["method"] == "GetFeed"
+    assert record["args"]["fromVersion"] == "v1"
+
+    client = GeotabApiClient("user", "pass", "db", MagicMock(), replay_path=path)
+    replayed, replayed_version = await client.async_get_log_feed("v1")
+    assert replayed_version == version == "v2"
+    assert replayed[0].device_id == original[0].device_id == "device1"
+    assert replayed[0].payload["latitude"] == original[0].payload["latitude"]
+
+
+async def test_replay_past_the_capture_raises(mock_geotab_api, tmp_path):
+    """Test that calls beyond the recorded traffic fail instead of inventing data."""
+    path = str(tmp_path / "capture.jsonl.gz")
+    live = GeotabApiClient("user", "pass", "db", MagicMock(), capture_path=path)
+    await live.async_get_full_device_data()
+
+    client = GeotabApiClient("user", "pass", "db", MagicMock(), replay_path=path)
+    await client.async_get_full_device_data()
+    with pytest.raises(ApiError, match="Capture exhausted"):
+        await client.async_get_full_device_data()
+
+
+async def test_capture_replays_errors(mock_geotab_api, tmp_path):
+    """Test that recorded API errors are raised again on replay."""
+    mock_geotab_api.multi_call.side_effect = MyGeotabException(
+        {"errors": [{"name": "OverLimitException", "message": "Quota exceeded"}]}
+    )
+    path = str(tmp_path / "capture.jsonl.gz")
+    live = GeotabApiClient("user", "pass", "db", MagicMock(), capture_path=path)
+    with pytest.raises(ApiError):
+        await live.async_get_full_device_data()
+
+    client = GeotabApiClient("user", "pass", "db", MagicMock(), replay_path=path)
+    with pytest.raises(ApiError, match="OverLimitException"):
+        await client.async_get_full_device_data()
+
+
+async def test_capture_redacts_credentials(mock_geotab_api, tmp_path):
+    """Test that user names and databases never reach the capture file."""
+    mock_geotab_api.authenticate.side_effect = AuthenticationException(
+        "someone@example.com", "secret_db", "my.geotab.com"
+    )
+    path = str(tmp_path / "capture.jsonl.gz")
+    client = GeotabApiClient("user", "pass", "db", MagicMock(), capture_path=path)
+    with pytest.raises(InvalidAuth):
+        await client.async_authenticate()
+
+    with gzip.open(path, "rt") as capture:
+        text = capture.read()
+    assert "someone@example.com" not in text
+    assert "secret_db" not in text
+    assert redact({"credentials": {"userName": "u", "sessionId": "s"}, "ids": [1]}) == {
+        "credentials": {"userName": REDACTED, "sessionId": REDACTED},
+        "ids": [1],
+    }
@@ -1,9 +1,15 @@
 """Tests for Geotab config flow."""
-from unittest.mock import patch, AsyncMock
+from unittest.mock import MagicMock, patch, AsyncMock
 import pytest
 from homeassistant import config_entries, data_entry_flow
 from homeassistant.const import CONF_SCAN_INTERVAL
-from custom_components.geotab.const import DOMAIN
+from custom_components.geotab.const import (
+    CONF_ENTITY_GROUPS,
+    CONF_ENTITY_PROFILE,
+    CONF_MIN_WRITE_INTERVAL,
+    CONF_STATE_DEADBANDS,
+    DOMAIN,
+)
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 
@@ -168,4 +174,52 @@ async def test_options_flow(hass):
     )
 
     assert result["type"] == data_entry_flow.FlowResultType.CREATE_ENTRY
-    assert entry.options == {CONF_SCAN_INTERVAL: 45}
+    assert entry.options == {
+        CONF_SCAN_INTERVAL: 45,
+        CONF_STATE_DEADBANDS: True,
+        CONF_MIN_WRITE_INTERVAL: 0,
+        CONF_ENTITY_PROFILE: "full",
+        CONF_ENTITY_GROUPS: ["status", "vehicle", "engine", "chassis", "trips"],
+        "device_groups": [],
+        "active_devices_only": False,
+        "poll_shards": 1,
+        "live_feed": False,
+        "performance_sensors": False,
+        "capture_api_traffic": False,
+    }
+
+
+@pytest.mark.asyncio
+async def test_options_flow_offers_the_database_groups(hass):
+    """Test that the running client's groups can be picked as a device filter."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={"username": "user", "password": "pass", "database": "db"},
+        options={"device_groups": ["b2"]},
+        entry_id="test_id",
+    )
+    entry.add_to_hass(hass)
+    coordinator = MagicMock()
+    coordinator.client.async_get_groups = AsyncMock(
+        return_value={"GroupCompanyId": "Company", "b1": "Alpha"}
+    )
+    hass.data[DOMAIN] = {entry.entry_id: coordinator}
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+
+    schema = result["data_schema"].schema
+    groups = next(value for key, value in schema.items() if key == "device_groups")
+    # Sorted by name; a selected group that no longer loads stays selectable
+    assert list(groups.options.items()) == [
+        ("b1", "Alpha"),
+        ("GroupCompanyId", "Company"),
+        ("b2", "b2"),
+    ]
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={"device_groups": ["b1"], "active_devices_only": True},
+    )
+
+    assert entry.options["device_groups"] == ["b1"]
+    assert entry.options["active_devices_only"] is True
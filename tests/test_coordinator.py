@@ -0,0 +1,428 @@
+"""Tests for the Geotab data update coordinator."""
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.geotab.api import ApiError, FetchTimeout, InvalidAuth
+from custom_components.geotab.const import (
+    DEVICE_REMOVAL_GRACE_REFRESHES,
+    DOMAIN,
+    SIGNAL_DEVICES_ADDED,
+    SIGNAL_LIVE_POSITIONS,
+)
+from custom_components.geotab.decoder import PositionRecord
+from custom_components.geotab.coordinator import GeotabDataUpdateCoordinator
+from custom_components.geotab.models import DeviceSnapshot
+
+
+def _snapshot(device_id, trip_history=None):
+    """Create a minimal device snapshot."""
+    return DeviceSnapshot({"id": device_id}, trip_history=trip_history)
+
+
+def _make_coordinator(hass, options=None):
+    """Create a coordinator backed by a mock client."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={"username": "user", "password": "pass", "database": "db"},
+        options=options or {},
+    )
+    entry.add_to_hass(hass)
+    client = MagicMock()
+    client.async_get_full_device_data = AsyncMock()
+    client.session = None
+    return GeotabDataUpdateCoordinator(hass, entry, client), entry
+
+
+@pytest.mark.asyncio
+async def test_signals_only_new_devices(hass):
+    """Test that the added signal fires once per newly seen device."""
+    coordinator, entry = _make_coordinator(hass)
+    added = []
+    async_dispatcher_connect(
+        hass, SIGNAL_DEVICES_ADDED.format(entry.entry_id), lambda ids: added.append(set(ids))
+    )
+
+    coordinator.async_set_updated_data({"b1": _snapshot("b1")})
+    coordinator.async_set_updated_data({"b1": _snapshot("b1")})
+    coordinator.async_set_updated_data({"b1": _snapshot("b1"), "b2": _snapshot("b2")})
+    await hass.async_block_till_done()
+
+    assert added == [{"b1"}, {"b2"}]
+
+
+@pytest.mark.asyncio
+async def test_removes_device_after_grace_refreshes(hass):
+    """Test that a vehicle missing from several refreshes is removed."""
+    coordinator, entry = _make_coordinator(hass)
+    device_registry = dr.async_get(hass)
+    device = device_registry.async_get_or_create(
+        config_entry_id=entry.entry_id, identifiers={(DOMAIN, "b2")}
+    )
+    coordinator.async_set_updated_data({"b1": _snapshot("b1"), "b2": _snapshot("b2")})
+
+    for _ in range(DEVICE_REMOVAL_GRACE_REFRESHES - 1):
+        coordinator.async_set_updated_data({"b1": _snapshot("b1")})
+    assert device_registry.async_get(device.id) is not None
+    assert "b2" in coordinator.known_device_ids
+
+    coordinator.async_set_updated_data({"b1": _snapshot("b1")})
+    assert device_registry.async_get(device.id) is None
+    assert coordinator.known_device_ids == {"b1"}
+
+
+@pytest.mark.asyncio
+async def test_device_back_within_grace_is_kept(hass):
+    """Test that a device reappearing before the grace period ends is kept."""
+    coordinator, _ = _make_coordinator(hass)
+    coordinator.async_set_updated_data({"b1": _snapshot("b1")})
+    for _ in range(DEVICE_REMOVAL_GRACE_REFRESHES - 1):
+        coordinator.async_set_updated_data({})
+    coordinator.async_set_updated_data({"b1": _snapshot("b1")})
+    for _ in range(DEVICE_REMOVAL_GRACE_REFRESHES - 1):
+        coordinator.async_set_updated_data({})
+    assert coordinator.known_device_ids == {"b1"}
+
+
+@pytest.mark.asyncio
+async def test_registered_devices_missing_after_setup_are_removed(hass):
+    """Test that vehicles registered by an earlier run follow the grace period."""
+    entry = MockConfigEntry(domain=DOMAIN, data={"database": "db"})
+    entry.add_to_hass(hass)
+    device_registry = dr.async_get(hass)
+    for device_id in ("b1", "b2", "b3", f"{entry.entry_id}_api"):
+        device_registry.async_get_or_create(
+            config_entry_id=entry.entry_id, identifiers={(DOMAIN, device_id)}
+        )
+    coordinator = GeotabDataUpdateCoordinator(hass, entry, MagicMock())
+    added = []
+    async_dispatcher_connect(
+        hass, SIGNAL_DEVICES_ADDED.format(entry.entry_id), lambda ids: added.append(set(ids))
+    )
+
+    coordinator.async_set_updated_data({"b1": _snapshot("b1")})
+    # A registered vehicle that comes back late is announced like a new one
+    coordinator.async_set_updated_data({"b1": _snapshot("b1"), "b3": _snapshot("b3")})
+    coordinator.async_set_updated_data({"b1": _snapshot("b1"), "b3": _snapshot("b3")})
+    await hass.async_block_till_done()
+
+    assert added == [{"b1"}, {"b3"}]
+    assert device_registry.async_get_device(identifiers={(DOMAIN, "b2")}) is None
+    assert device_registry.async_get_device(identifiers={(DOMAIN, "b3")}) is not None
+    assert device_registry.async_get_device(
+        identifiers={(DOMAIN, f"{entry.entry_id}_api")}
+    ) is not None
+
+
+@pytest.mark.asyncio
+async def test_vehicles_left_out_by_a_new_filter_are_removed(hass, mock_geotab_api):
+    """Test that a group filter set in the options removes the excluded vehicles."""
+    fleet = [{"id": "device1", "name": "One"}, {"id": "device2", "name": "Two"}]
+    mock_geotab_api.get.side_effect = lambda type_name, search=None, **kwargs: (
+        (fleet[:1] if search and "groups" in search else fleet)
+        if type_name == "Device"
+        else []
+    )
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={"username": "user", "password": "pass", "database": "db"},
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    device_registry = dr.async_get(hass)
+    entity_registry = er.async_get(hass)
+    device = device_registry.async_get_device(identifiers={(DOMAIN, "device2")})
+    assert er.async_entries_for_device(entity_registry, device.id)
+
+    # Changing the options reloads the entry with a new coordinator
+    hass.config_entries.async_update_entry(entry, options={"device_groups": ["g1"]})
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    for _ in range(DEVICE_REMOVAL_GRACE_REFRESHES - 1):
+        await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert device_registry.async_get(device.id) is None
+    assert not er.async_entries_for_device(entity_registry, device.id)
+    assert device_registry.async_get_device(identifiers={(DOMAIN, "device1")}) is not None
+
+
+@pytest.mark.asyncio
+async def test_cached_trips_are_shared_between_refreshes(hass):
+    """Test that trip history from a trip cycle is attached on later cycles."""
+    coordinator, _ = _make_coordinator(hass)
+    trips = [{"id": "t1", "distance": 5}]
+    coordinator.client.async_get_full_device_data.side_effect = [
+        {"b1": _snapshot("b1", trip_history=trips)},
+        {"b1": _snapshot("b1")},
+    ]
+
+    await coordinator.async_refresh()
+    await coordinator.async_refresh()
+
+    assert coordinator.data["b1"]["trip_history"] is trips
+    calls = coordinator.client.async_get_full_device_data.call_args_list
+    assert [call.kwargs["include_trips"] for call in calls] == [True, False]
+
+
+@pytest.mark.asyncio
+async def test_device_info_is_shared(hass):
+    """Test that every entity of a device gets the same DeviceInfo object."""
+    coordinator, _ = _make_coordinator(hass)
+    device = {"id": "b1", "name": "Truck", "deviceType": "GO9", "version": "1"}
+    coordinator.async_set_updated_data({"b1": DeviceSnapshot(device)})
+
+    info = coordinator.device_info("b1")
+    assert coordinator.device_info("b1") is info
+    assert info["name"] == "Truck"
+    assert info["configuration_url"] == "https://my.geotab.com/db"
+
+
+@pytest.mark.asyncio
+async def test_device_registry_updated_only_on_change(hass):
+    """Test that registry updates are pushed only for changed metadata."""
+    coordinator, entry = _make_coordinator(hass)
+    device = {"id": "b1", "name": "Truck", "deviceType": "GO9", "version": "1"}
+    coordinator.async_set_updated_data({"b1": DeviceSnapshot(device)})
+    device_registry = dr.async_get(hass)
+    registry_device = device_registry.async_get_or_create(
+        config_entry_id=entry.entry_id, **coordinator.device_info("b1")
+    )
+    info = coordinator.device_info("b1")
+
+    # Equal metadata in a new dict: nothing to push, same shared DeviceInfo contents
+    coordinator.async_set_updated_data({"b1": DeviceSnapshot(dict(device))})
+    assert device_registry.async_get(registry_device.id).sw_version == "1"
+    assert coordinator.device_info("b1") == info
+
+    coordinator.async_set_updated_data(
+        {"b1": DeviceSnapshot({**device, "name": "Van", "version": "2"})}
+    )
+    updated = device_registry.async_get(registry_device.id)
+    assert updated.name == "Van"
+    assert updated.sw_version == "2"
+
+
+@pytest.mark.asyncio
+async def test_refreshes_are_timed(hass):
+    """Test that successful and failed refreshes land in the performance history."""
+    coordinator, _ = _make_coordinator(hass)
+    coordinator.client.async_get_full_device_data.side_effect = [
+        {"b1": _snapshot("b1")},
+        ApiError("boom"),
+    ]
+
+    await coordinator.async_refresh()
+    await coordinator.async_refresh()
+
+    first, second = coordinator.performance.as_list()
+    assert first["success"] is True
+    assert {"trip_cache", "entity_dispatch", "total"} <= first["phases_ms"].keys()
+    assert second["success"] is False
+
+
+@pytest.mark.asyncio
+async def test_profile_switches_itself_off(hass):
+    """Test that profiling covers the requested refreshes and then stops."""
+    coordinator, _ = _make_coordinator(hass)
+    coordinator.client.async_get_full_device_data.return_value = {"b1": _snapshot("b1")}
+
+    coordinator.async_start_profile(2, 5)
+    assert coordinator.client.profiler is coordinator.profiler
+    await coordinator.async_refresh()
+    assert coordinator.profile_summary is None
+    await coordinator.async_refresh()
+
+    summary = coordinator.profile_summary
+    assert coordinator.profiler is None
+    assert coordinator.client.profiler is None
+    assert summary["refreshes"] == 2
+    assert 0 < len(summary["functions"]) <= 5
+    assert summary["peak_memory_kib"] >= 0
+
+    await coordinator.async_refresh()
+    assert coordinator.profile_summary is summary
+
+
+@pytest.mark.asyncio
+async def test_concurrent_manual_refreshes_join(hass):
+    """Test that identical manual refreshes share one fetch."""
+    coordinator, _ = _make_coordinator(hass)
+    release = asyncio.Event()
+
+    async def _slow_fetch(**kwargs):
+        await release.wait()
+        return {"b1": _snapshot("b1")}
+
+    coordinator.client.async_get_full_device_data.side_effect = _slow_fetch
+    first = hass.async_create_task(coordinator.async_refresh_scope())
+    second = hass.async_create_task(coordinator.async_refresh_scope())
+    await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(first, second)
+
+    assert coordinator.client.async_get_full_device_data.call_count == 1
+    assert coordinator.data.keys() == {"b1"}
+
+
+@pytest.mark.asyncio
+async def test_scoped_refresh_merges_into_current_data(hass):
+    """Test that a vehicle-scoped refresh replaces only that vehicle's snapshot."""
+    coordinator, _ = _make_coordinator(hass)
+    coordinator.client.async_get_full_device_data.return_value = {
+        "b1": _snapshot("b1"),
+        "b2": _snapshot("b2"),
+    }
+    await coordinator.async_refresh()
+    untouched = coordinator.data["b2"]
+    refreshed = _snapshot("b1", trip_history=[{"id": "t1"}])
+    coordinator.client.async_get_scoped_data = AsyncMock(return_value={"b1": refreshed})
+
+    await coordinator.async_refresh_scope(["b1"], frozenset({"trips"}))
+
+    coordinator.client.async_get_scoped_data.assert_awaited_once()
+    assert coordinator.client.async_get_full_device_data.call_count == 1
+    assert coordinator.data["b1"] is refreshed
+    assert coordinator.data["b2"] is untouched
+    assert coordinator._cached_trip_history["b1"] == [{"id": "t1"}]
+
+
+@pytest.mark.asyncio
+async def test_scoped_refresh_rejected_password_starts_reauth(hass):
+    """Test that a scoped refresh with rejected credentials asks for new ones."""
+    coordinator, entry = _make_coordinator(hass)
+    coordinator.client.async_get_full_device_data.return_value = {"b1": _snapshot("b1")}
+    await coordinator.async_refresh()
+    coordinator.client.async_get_scoped_data = AsyncMock(side_effect=InvalidAuth("rejected"))
+
+    with patch.object(entry, "async_start_reauth") as start_reauth, pytest.raises(
+        ConfigEntryAuthFailed
+    ):
+        await coordinator.async_refresh_scope(["b1"], frozenset({"status"}))
+
+    start_reauth.assert_called_once_with(hass)
+
+
+@pytest.mark.asyncio
+async def test_first_scheduled_poll_is_staggered(hass):
+    """Test that the stagger only delays the first scheduled poll."""
+    coordinator, _ = _make_coordinator(hass)
+    coordinator.client.async_get_full_device_data.return_value = {"b1": _snapshot("b1")}
+
+    coordinator.stagger_first_poll(7)
+    assert coordinator.update_interval.total_seconds() == 67
+    await coordinator.async_refresh()
+    assert coordinator.update_interval.total_seconds() == 67
+    await coordinator.async_refresh()
+    assert coordinator.update_interval.total_seconds() == 60
+
+
+@pytest.mark.asyncio
+async def test_slow_trips_move_out_of_the_refresh(hass):
+    """Test that trips that would miss the deadline are fetched in the background."""
+    coordinator, _ = _make_coordinator(hass)
+    client = coordinator.client
+    client.async_get_full_device_data.return_value = {"b1": _snapshot("b1")}
+    client.async_get_scoped_data = AsyncMock(
+        return_value={"b1": _snapshot("b1", trip_history=[{"id": "t1"}])}
+    )
+    assert coordinator.refresh_budget == 48
+    await coordinator.async_refresh()
+    assert client.async_get_full_device_data.call_args.kwargs["include_trips"]
+
+    # Trips are due again and the fetch carrying them runs out of time
+    coordinator._last_trip_fetch = 0
+    client.async_get_full_device_data.side_effect = FetchTimeout("timed out")
+    await coordinator.async_refresh()
+    assert not coordinator.last_update_success
+    assert client.async_get_full_device_data.call_args.kwargs["include_trips"]
+
+    client.async_get_full_device_data.side_effect = None
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert coordinator.last_update_success
+    assert not client.async_get_full_device_data.call_args.kwargs["include_trips"]
+    assert client.async_get_scoped_data.call_args.args[2] == frozenset({"trips"})
+    # The background fetch gets several refresh budgets instead of FETCH_TIMEOUT
+    assert client.async_get_scoped_data.call_args.kwargs["deadline"].budget == 144
+    assert coordinator.deferred_trip_fetches == 1
+    assert coordinator._last_trip_fetch > 0
+    assert coordinator._cached_trip_history["b1"] == [{"id": "t1"}]
+
+
+@pytest.mark.asyncio
+async def test_sharded_polling_takes_the_shards_in_turn(hass):
+    """Test that refreshes after the first one fetch one shard each, round robin."""
+    coordinator, _ = _make_coordinator(hass, {"poll_shards": 3})
+    client = coordinator.client
+    client.async_get_full_device_data.return_value = {"b1": _snapshot("b1")}
+
+    shards = []
+    for _ in range(5):
+        await coordinator.async_refresh()
+        shards.append(client.async_get_full_device_data.call_args.kwargs["shard"])
+
+    # The first refresh has nothing to keep, so it fetches the whole fleet
+    assert shards == [None, (0, 3), (1, 3), (2, 3), (0, 3)]
+    assert client.async_get_full_device_data.call_args.kwargs["include_trips"]
+    assert coordinator.next_shard == 1
+
+
+@pytest.mark.asyncio
+async def test_live_feed_pushes_newer_positions(hass):
+    """Test that feed fixes update positions without a coordinator refresh."""
+    coordinator, entry = _make_coordinator(hass)
+    client = coordinator.client
+    client.async_get_full_device_data.return_value = {
+        device_id: DeviceSnapshot(
+            {"id": device_id},
+            status={"dateTime": "2026-03-08T10:00:00Z", "latitude": 45.0,
+                    "longitude": 9.0, "speed": 0},
+        )
+        for device_id in ("b1", "b2")
+    }
+    await coordinator.async_refresh()
+    refreshes = client.async_get_full_device_data.call_count
+    pushed = []
+    async_dispatcher_connect(
+        hass,
+        SIGNAL_LIVE_POSITIONS.format(entry.entry_id),
+        lambda device_ids, previous: pushed.append((device_ids, previous)),
+    )
+    client.async_get_log_feed = AsyncMock(return_value=([
+        PositionRecord("b1", {"dateTime": "2026-03-08T10:00:20Z", "latitude": 45.001,
+                              "longitude": 9.0, "speed": 40}),
+        # Older than what the last refresh returned
+        PositionRecord("b2", {"dateTime": "2026-03-08T09:59:00Z", "latitude": 44.0,
+                              "longitude": 9.0, "speed": 50}),
+        # Not part of this entry's fleet
+        PositionRecord("b9", {"dateTime": "2026-03-08T10:00:20Z", "latitude": 1.0,
+                              "longitude": 1.0, "speed": 5}),
+    ], "0002"))
+    coordinator.live_feed_stats = {"polls": 0, "fixes": 0, "updates": 0, "errors": 0}
+    previous = coordinator.data
+
+    with patch.object(coordinator, "async_update_listeners") as update_listeners:
+        assert await coordinator._async_poll_live_feed() is False
+        await hass.async_block_till_done()
+
+    assert coordinator.data["b1"]["speed"] == 40
+    assert coordinator.data["b1"]["bearing"] == 0.0
+    assert coordinator.data["b2"] is previous["b2"]
+    assert "b9" not in coordinator.data
+    assert pushed == [(["b1"], previous)]
+    assert coordinator._feed_version == "0002"
+    assert coordinator.live_feed_stats == {"polls": 1, "fixes": 3, "updates": 1, "errors": 0}
+    # Entities of other devices are not notified and no refresh ran
+    update_listeners.assert_not_called()
+    assert client.async_get_full_device_data.call_count == refreshes
+    client.async_get_log_feed.assert_called_with(None)
+
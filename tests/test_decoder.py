@@ -0,0 +1,110 @@
+"""Tests for Geotab result decoding."""
+
+import importlib.util
+import os
+
+# Import decoder directly from file to avoid loading __init__.py (which needs homeassistant)
+_DECODER_PATH = os.path.join(
+    os.path.dirname(__file__),
+    "..",
+    "custom_components",
+    "geotab",
+    "decoder.py",
+)
+_spec = importlib.util.spec_from_file_location("decoder", _DECODER_PATH)
+decoder = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(decoder)
+
+KEYS_BY_ID = {"DiagnosticGoDeviceVoltageId": "voltage"}
+
+
+class TestDecodeStatuses:
+    """Tests for decode_statuses."""
+
+    def test_decodes_known_fields_and_diagnostics(self):
+        result = [
+            {
+                "device": {"id": "b1"},
+                "latitude": 45.0,
+                "speed": 50,
+                "groups": [{"id": "GroupCompanyId"}],
+                "statusData": [
+                    {"diagnostic": {"id": "DiagnosticGoDeviceVoltageId"}, "data": 13.5},
+                    {"diagnostic": {"id": "DiagnosticUnknownId"}, "data": 1},
+                    {"diagnostic": "DiagnosticGoDeviceVoltageId", "data": 2},
+                    "junk",
+                ],
+            }
+        ]
+        [record] = decoder.decode_statuses(result, KEYS_BY_ID)
+        assert record.device_id == "b1"
+        assert record.payload is result[0]
+        assert record.diagnostics == {"voltage": 13.5}
+
+    def test_skips_malformed_entries(self):
+        result = [None, {"device": "b1"}, {"device": {}}, {"device": {"id": "b2"}}]
+        records = decoder.decode_statuses(result, KEYS_BY_ID)
+        assert [record.device_id for record in records] == ["b2"]
+
+    def test_non_list_result(self):
+        assert decoder.decode_statuses(None, KEYS_BY_ID) == []
+
+
+class TestDecodeFaults:
+    """Tests for decode_faults."""
+
+    def test_sorted_newest_first(self):
+        result = [
+            {"id": "f1", "device": {"id": "b1"}, "dateTime": "2026-01-01T00:00:00Z"},
+            {"id": "f2", "device": {"id": "b1"}, "dateTime": "2026-02-01T00:00:00Z",
+             "diagnostic": {"id": "d1"}, "count": 4},
+        ]
+        records = decoder.decode_faults(result)
+        assert [record.payload["id"] for record in records] == ["f2", "f1"]
+        assert records[0].diagnostic_id == "d1"
+        assert records[1].diagnostic_id is None
+
+
+class TestDecodeTrips:
+    """Tests for decode_trips."""
+
+    def test_filters_zero_distance_and_sorts(self):
+        result = [
+            {"id": "t1", "distance": 5, "start": "2026-01-01T00:00:00Z", "driver": {}},
+            {"id": "t0", "distance": 0, "start": "2026-01-03T00:00:00Z"},
+            {"id": "t2", "distance": 7, "start": "2026-01-02T00:00:00Z"},
+        ]
+        trips = decoder.decode_trips(result)
+        assert [trip["id"] for trip in trips] == ["t2", "t1"]
+        assert trips[1] is result[0]
+
+    def test_skips_malformed_trips(self):
+        result = [
+            {"id": "t1", "distance": 5},
+            {"id": "t2", "distance": 7, "start": "2026-01-02T00:00:00Z"},
+            {"id": "t3", "distance": None},
+            {"id": "t4"},
+            "junk",
+        ]
+        trips = decoder.decode_trips(result)
+        assert [trip["id"] for trip in trips] == ["t2", "t1"]
+
+
+class TestDecodeLogRecords:
+    """Tests for decode_log_records."""
+
+    def test_keeps_fixes_with_a_position(self):
+        result = [
+            {"id": "l1", "device": {"id": "b1"}, "dateTime": "2026-03-08T10:00:00Z",
+             "latitude": 45.0, "longitude": 9.0, "speed": 30, "version": "0001"},
+            {"device": {"id": "b2"}, "latitude": None, "longitude": 9.0},
+            {"device": {}, "latitude": 45.0, "longitude": 9.0},
+            "junk",
+        ]
+        records = decoder.decode_log_records(result)
+        assert records == [
+            ("b1", {"dateTime": "2026-03-08T10:00:00Z", "latitude": 45.0,
+                    "longitude": 9.0, "speed": 30}),
+        ]
+        assert decoder.decode_log_records(None) == []
+
@@ -0,0 +1,85 @@
+"""Tests for the Geotab diagnostics download."""
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.geotab.const import DOMAIN
+from custom_components.geotab.coordinator import GeotabDataUpdateCoordinator
+from custom_components.geotab.diagnostics import async_get_config_entry_diagnostics
+from custom_components.geotab.models import DeviceSnapshot
+from custom_components.geotab.performance import CacheStats
+
+
+def _make_coordinator(hass, options=None):
+    """Create a registered coordinator backed by a mock client."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={"username": "user", "password": "pass", "database": "db"},
+        options=options or {},
+    )
+    entry.add_to_hass(hass)
+    client = MagicMock()
+    client.async_get_full_device_data = AsyncMock()
+    client.session = None
+    coordinator = GeotabDataUpdateCoordinator(hass, entry, client)
+    hass.data[DOMAIN] = {entry.entry_id: coordinator}
+    return coordinator, entry
+
+
+@pytest.mark.asyncio
+async def test_config_entry_diagnostics(hass):
+    """Test the diagnostics export redacts credentials and reports sizes."""
+    coordinator, entry = _make_coordinator(hass)
+    coordinator.client.async_get_full_device_data.return_value = {
+        "b1": DeviceSnapshot(
+            {"id": "b1"},
+            diagnostics={"voltage": 13.5},
+            active_faults=[{"id": "f1"}],
+            trip_history=[{"id": "t1"}, {"id": "t2"}],
+        )
+    }
+    coordinator.client.diagnostics_lookup_size = 3
+    coordinator.client.call_counts = {"ExecuteMultiCall": 1}
+    coordinator.client.device_cache_stats = CacheStats()
+    coordinator.client.diagnostics_lookup_stats = CacheStats()
+    await coordinator.async_refresh()
+
+    result = await async_get_config_entry_diagnostics(hass, entry)
+
+    assert result["entry"]["data"]["password"] == "**REDACTED**"
+    assert result["entry"]["data"]["username"] == "**REDACTED**"
+    assert result["coordinator"]["state_sizes"] == {
+        "devices": 1,
+        "known_devices": 1,
+        "diagnostic_values": 1,
+        "status_fields": 0,
+        "active_faults": 1,
+        "trips": 2,
+        "stale_devices": 0,
+        "diagnostics_lookup_entries": 3,
+    }
+    assert result["caches"]["trips"] == {"hits": 0, "misses": 1, "hit_rate": 0.0}
+    assert result["api_calls"] == {"ExecuteMultiCall": 1}
+    assert len(result["performance"]["history"]) == 1
+    assert result["live_feed"] == coordinator.live_feed_stats
+    assert coordinator.client.async_get_full_device_data.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_diagnostics_report_sharding(hass):
+    """Test that the sharding section reports the next shard and the oldest details."""
+    coordinator, entry = _make_coordinator(hass, {"poll_shards": 3})
+    coordinator.client.async_get_full_device_data.return_value = {
+        "b1": DeviceSnapshot({"id": "b1"})
+    }
+    await coordinator.async_refresh()
+    await coordinator.async_refresh()
+
+    result = await async_get_config_entry_diagnostics(hass, entry)
+
+    assert result["sharding"] == {
+        "shards": 3,
+        "next_shard": 1,
+        "oldest_details_age": None,
+    }
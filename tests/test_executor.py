@@ -0,0 +1,80 @@
+"""Tests for the bounded Geotab executor."""
+
+import importlib.util
+import os
+import threading
+
+import pytest
+
+# Import executor directly from file to avoid loading __init__.py (which needs homeassistant)
+_EXECUTOR_PATH = os.path.join(
+    os.path.dirname(__file__),
+    "..",
+    "custom_components",
+    "geotab",
+    "executor.py",
+)
+_spec = importlib.util.spec_from_file_location("executor", _EXECUTOR_PATH)
+executor = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(executor)
+
+
+@pytest.fixture
+def pool():
+    """Return a small bounded executor and shut it down afterwards."""
+    bounded = executor.BoundedExecutor(max_workers=1, max_pending=2)
+    yield bounded
+    bounded.shutdown()
+
+
+class TestBoundedExecutor:
+    """Tests for BoundedExecutor."""
+
+    def test_runs_calls(self, pool):
+        assert pool.submit(lambda: 42).result(timeout=5) == 42
+        assert pool.as_dict()["submitted"] == 1
+
+    def test_coalesces_pending_calls_with_the_same_key(self, pool):
+        release = threading.Event()
+        calls = []
+
+        def slow():
+            calls.append(1)
+            release.wait(5)
+            return "done"
+
+        first = pool.submit(slow, "fetch")
+        second = pool.submit(slow, "fetch")
+        release.set()
+
+        assert second is first
+        assert first.result(timeout=5) == "done"
+        assert len(calls) == 1
+        assert pool.coalesced == 1
+
+    def test_rejects_work_beyond_the_pending_cap(self, pool):
+        release = threading.Event()
+        started = threading.Event()
+
+        def blocked():
+            started.set()
+            release.wait(5)
+
+        futures = [pool.submit(blocked) for _ in range(2)]
+        started.wait(5)
+
+        with pytest.raises(executor.ExecutorBusy):
+            pool.submit(lambda: None)
+        assert pool.rejected == 1
+        assert pool.queue_depth == 1
+
+        release.set()
+        for future in futures:
+            future.result(timeout=5)
+        assert pool.submit(lambda: "free again").result(timeout=5) == "free again"
+        assert pool.as_dict()["peak_pending"] == 2
+
+    def test_finished_calls_release_their_key(self, pool):
+        pool.submit(lambda: 1, "fetch").result(timeout=5)
+        assert pool.submit(lambda: 2, "fetch").result(timeout=5) == 2
+        assert pool.coalesced == 0
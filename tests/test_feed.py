@@ -0,0 +1,77 @@
+"""Tests for live feed position merging."""
+
+from datetime import datetime, timezone
+import importlib.util
+import os
+
+# Import feed directly from file to avoid loading __init__.py (which needs homeassistant)
+_FEED_PATH = os.path.join(
+    os.path.dirname(__file__),
+    "..",
+    "custom_components",
+    "geotab",
+    "feed.py",
+)
+_spec = importlib.util.spec_from_file_location("feed", _FEED_PATH)
+feed = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(feed)
+
+
+def _fix(date_time, latitude=45.0, longitude=9.0, speed=30):
+    """Return a decoded LogRecord payload."""
+    return {"dateTime": date_time, "latitude": latitude, "longitude": longitude, "speed": speed}
+
+
+class TestBearing:
+    """Tests for bearing."""
+
+    def test_cardinal_directions(self):
+        assert feed.bearing(45.0, 9.0, 45.1, 9.0) == 0.0
+        assert feed.bearing(0.0, 9.0, 0.0, 9.1) == 90.0
+        assert feed.bearing(45.1, 9.0, 45.0, 9.0) == 180.0
+        assert feed.bearing(0.0, 9.1, 0.0, 9.0) == 270.0
+
+
+class TestLatestPositions:
+    """Tests for latest_positions."""
+
+    def test_keeps_the_newest_fix_per_device(self):
+        fixes = [
+            ("b1", _fix("2026-03-08T10:00:05Z", speed=10)),
+            ("b2", _fix("2026-03-08T10:00:01Z")),
+            ("b1", _fix("2026-03-08T10:00:09.000Z", speed=20)),
+            ("b1", _fix("2026-03-08T10:00:07Z", speed=15)),
+        ]
+        latest = feed.latest_positions(fixes)
+        assert latest["b1"]["speed"] == 20
+        assert set(latest) == {"b1", "b2"}
+
+
+class TestMergePosition:
+    """Tests for merge_position."""
+
+    def test_newer_fix_updates_position_and_bearing(self):
+        status = {"dateTime": "2026-03-08T10:00:00Z", "latitude": 45.0, "longitude": 9.0,
+                  "bearing": 90, "isDriving": True}
+        merged = feed.merge_position(status, _fix("2026-03-08T10:00:10Z", latitude=45.01))
+        assert merged["latitude"] == 45.01
+        assert merged["speed"] == 30
+        assert merged["bearing"] == 0.0
+        assert merged["isDriving"] is True
+
+    def test_standing_still_keeps_the_bearing(self):
+        status = {"dateTime": "2026-03-08T10:00:00Z", "latitude": 45.0, "longitude": 9.0,
+                  "bearing": 90}
+        merged = feed.merge_position(status, _fix("2026-03-08T10:00:10Z", speed=0))
+        assert merged["bearing"] == 90
+
+    def test_older_fix_is_ignored(self):
+        # Status times may already be datetimes, fix times strings
+        status = {"dateTime": datetime(2026, 3, 8, 10, 0, 30, tzinfo=timezone.utc)}
+        assert feed.merge_position(status, _fix("2026-03-08T10:00:10Z")) is None
+        assert feed.merge_position(status, _fix(None)) is None
+
+    def test_status_without_time_takes_any_fix(self):
+        merged = feed.merge_position({}, _fix("2026-03-08T10:00:10Z"))
+        assert merged["latitude"] == 45.0
+        assert "bearing" not in merged
@@ -0,0 +1,133 @@
+"""Tests for the DeviceSnapshot model."""
+
+import importlib.util
+import os
+
+import pytest
+
+# Import models directly from file to avoid loading __init__.py (which needs homeassistant)
+_MODELS_PATH = os.path.join(
+    os.path.dirname(__file__),
+    "..",
+    "custom_components",
+    "geotab",
+    "models.py",
+)
+_spec = importlib.util.spec_from_file_location("models", _MODELS_PATH)
+models = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(models)
+
+DeviceSnapshot = models.DeviceSnapshot
+
+
+def _make_snapshot(**kwargs) -> DeviceSnapshot:
+    """Create a snapshot with one value per layer plus a shared key."""
+    defaults = {
+        "device": {"id": "b1", "name": "Truck", "speed": "device"},
+        "diagnostics": {"voltage": 13.5, "speed": "diagnostics"},
+        "status": {"latitude": 45.0, "speed": "status"},
+        "derived": {"ignition": 1},
+    }
+    defaults.update(kwargs)
+    return DeviceSnapshot(**defaults)
+
+
+class TestLookupPrecedence:
+    """Tests for layered key resolution."""
+
+    def test_status_beats_diagnostics_and_device(self):
+        assert _make_snapshot()["speed"] == "status"
+
+    def test_diagnostics_beat_device(self):
+        snapshot = _make_snapshot(status={})
+        assert snapshot["speed"] == "diagnostics"
+
+    def test_derived_beats_status(self):
+        snapshot = _make_snapshot(status={"ignition": 0}, derived={"ignition": 1})
+        assert snapshot["ignition"] == 1
+
+    def test_missing_key(self):
+        snapshot = _make_snapshot()
+        assert snapshot.get("rpm") is None
+        assert snapshot.get("rpm", 0) == 0
+        assert "rpm" not in snapshot
+        with pytest.raises(KeyError):
+            snapshot["rpm"]
+
+
+class TestSlotKeys:
+    """Tests for keys backed by dedicated slots."""
+
+    def test_unset_slots_are_missing(self):
+        snapshot = _make_snapshot()
+        for key in ("active_faults", "trip_history", "last_trip", "_diagnostics_lookup"):
+            assert key not in snapshot
+        assert snapshot.get("_diagnostics_lookup_version") is None
+
+    def test_empty_lists_are_present(self):
+        snapshot = _make_snapshot(active_faults=[], trip_history=[])
+        assert snapshot["active_faults"] == []
+        assert snapshot["trip_history"] == []
+        assert "last_trip" not in snapshot
+
+    def test_last_trip_is_newest_trip(self):
+        trips = [{"id": "t2"}, {"id": "t1"}]
+        snapshot = _make_snapshot(trip_history=trips)
+        assert snapshot["last_trip"] == {"id": "t2"}
+        assert snapshot["trip_history"] is trips
+
+    def test_lookup_version_zero_is_present(self):
+        snapshot = _make_snapshot(diagnostics_lookup={}, diagnostics_lookup_version=0)
+        assert snapshot["_diagnostics_lookup_version"] == 0
+        assert snapshot["_diagnostics_lookup"] == {}
+
+    def test_attach_trip_history_shares_list(self):
+        trips = [{"id": "t1"}]
+        snapshot = _make_snapshot()
+        snapshot.attach_trip_history(trips)
+        assert snapshot["trip_history"] is trips
+
+
+class TestWithStatus:
+    """Tests for with_status."""
+
+    def test_replaces_only_the_status(self):
+        trips = [{"id": "t1"}]
+        snapshot = _make_snapshot(trip_history=trips, stale=frozenset({"faults"}))
+        moved = snapshot.with_status({"latitude": 46.0})
+        assert moved["latitude"] == 46.0
+        assert moved["voltage"] == 13.5
+        assert moved.trip_history is trips
+        assert moved.stale == frozenset({"faults"})
+        assert snapshot["latitude"] == 45.0
+
+
+class TestMappingProtocol:
+    """Tests for iteration and length."""
+
+    def test_iteration_yields_each_key_once(self):
+        snapshot = _make_snapshot(active_faults=[{"id": "f1"}], trip_history=[{"id": "t1"}])
+        keys = list(snapshot)
+        assert len(keys) == len(set(keys))
+        assert set(keys) == {
+            "id",
+            "name",
+            "speed",
+            "voltage",
+            "latitude",
+            "ignition",
+            "active_faults",
+            "trip_history",
+            "last_trip",
+        }
+
+    def test_len_matches_iteration(self):
+        snapshot = _make_snapshot(diagnostics_lookup={"d": "Name"})
+        assert len(snapshot) == len(list(snapshot)) == 7
+
+    def test_dict_conversion(self):
+        assert dict(_make_snapshot())["speed"] == "status"
+
+    def test_no_instance_dict(self):
+        with pytest.raises(AttributeError):
+            _make_snapshot().extra = 1
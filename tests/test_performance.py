@@ -0,0 +1,85 @@
+"""Tests for refresh performance instrumentation."""
+
+import importlib.util
+import os
+
+# Import performance directly from file to avoid loading __init__.py (which needs homeassistant)
+_PERFORMANCE_PATH = os.path.join(
+    os.path.dirname(__file__),
+    "..",
+    "custom_components",
+    "geotab",
+    "performance.py",
+)
+_spec = importlib.util.spec_from_file_location("performance", _PERFORMANCE_PATH)
+performance = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(performance)
+
+
+class TestPollTimer:
+    """Tests for PollTimer."""
+
+    def test_phases_accumulate(self):
+        timer = performance.PollTimer()
+        with timer.phase("parse"):
+            pass
+        with timer.phase("parse"):
+            pass
+        timer.finish(success=True)
+        assert set(timer.phases) == {"parse", "total"}
+        assert timer.total_ms >= timer.phases["parse"] >= 0
+
+    def test_counts_records_without_bytes_by_default(self):
+        timer = performance.PollTimer()
+        timer.count("trips", [{"id": "t1"}, {"id": "t2"}])
+        timer.count("trips", [{"id": "t3"}])
+        timer.count("faults", None)
+        assert timer.records == {"trips": 3, "faults": 0}
+        assert timer.payload_bytes == {}
+        assert timer.as_dict()["payload_bytes"] is None
+
+    def test_measures_bytes_when_enabled(self):
+        timer = performance.PollTimer(measure_bytes=True)
+        timer.count("status", [{"id": "b1"}])
+        assert timer.payload_bytes == {"status": len('[{"id":"b1"}]')}
+
+
+class TestPerformanceHistory:
+    """Tests for PerformanceHistory."""
+
+    def test_rolling_window(self):
+        history = performance.PerformanceHistory(maxlen=2)
+        timers = [performance.PollTimer() for _ in range(3)]
+        for timer in timers:
+            timer.finish(success=True)
+            history.record(timer)
+        assert len(history) == 2
+        assert history.latest is timers[-1]
+
+    def test_average_skips_failures(self):
+        history = performance.PerformanceHistory()
+        ok, failed = performance.PollTimer(), performance.PollTimer()
+        ok.finish(success=True)
+        failed.finish(success=False)
+        ok.phases["total"], failed.phases["total"] = 100.0, 5000.0
+        history.record(ok)
+        history.record(failed)
+        assert history.average_ms() == 100.0
+        assert [entry["success"] for entry in history.as_list()] == [True, False]
+
+
+class TestRefreshDeadline:
+    """Tests for RefreshDeadline."""
+
+    def test_budget_shrinks_and_caps_timeouts(self):
+        deadline = performance.RefreshDeadline(30)
+        assert 29 < deadline.remaining() <= 30
+        assert deadline.allows(20)
+        assert not deadline.allows(31)
+        assert deadline.timeout(10) == 10
+        assert 29 < deadline.timeout(60) <= 30
+
+    def test_expired_deadline_has_nothing_left(self):
+        deadline = performance.RefreshDeadline(-1)
+        assert deadline.remaining() == 0.0
+        assert not deadline.allows(0.1)
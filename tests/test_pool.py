@@ -0,0 +1,103 @@
+"""Tests for the Geotab API client pool."""
+from unittest.mock import MagicMock
+
+import pytest
+from mygeotab.api import Credentials
+
+from custom_components.geotab.pool import POLL_STAGGER_SECONDS, GeotabClientPool
+
+
+def _acquire(pool, entry_id, database, **kwargs):
+    """Acquire a client with default credentials."""
+    return pool.acquire(entry_id, "user", "pass", database, MagicMock(), **kwargs)
+
+
+def _resolve(pool, client, entry_id, server):
+    """Give a client a session on a server and group its entry."""
+    client.client.credentials = Credentials("user", f"session_{entry_id}", "db", server)
+    pool.resolve(entry_id)
+
+
+@pytest.mark.asyncio
+async def test_entries_on_one_server_share_the_fault_lookup(mock_geotab_api):
+    """Test that fault names loaded for one entry are not fetched again by another."""
+    pool = GeotabClientPool()
+    first = _acquire(pool, "a", "db_one")
+    second = _acquire(pool, "b", "db_two")
+    # Unresolved entries keep their own lookup
+    assert first.diagnostics_lookup is not second.diagnostics_lookup
+
+    await first.async_get_full_device_data()
+    # Both clients wrap the same mocked API, authenticated on one server
+    mock_geotab_api.credentials = Credentials("user", "session", "db", "my123.geotab.com")
+    pool.resolve("a")
+    pool.resolve("b")
+    await second.async_get_full_device_data()
+
+    assert first is not second
+    assert first.diagnostics_lookup is second.diagnostics_lookup
+    assert first.call_counts["Get(Diagnostic)"] == 1
+    assert second.call_counts["Get(Diagnostic)"] == 0
+    assert second.diagnostics_lookup_stats.hits == 1
+
+
+def test_entries_are_grouped_by_resolved_server(mock_geotab_api):
+    """Test that entries federated to different servers share nothing."""
+    pool = GeotabClientPool()
+    first = _acquire(pool, "a", "db_one")
+    second = _acquire(pool, "b", "db_two")
+    assert pool.stagger_seconds("a", 60) == 0
+
+    _resolve(pool, first, "a", "my123.geotab.com")
+    _resolve(pool, second, "b", "my456.geotab.com")
+    assert first.diagnostics_lookup is not second.diagnostics_lookup
+    assert pool.stagger_seconds("b", 60) == 0
+
+    # Re-authentication moved the second entry to the first one's server
+    _resolve(pool, second, "b", "my123.geotab.com")
+    assert first.diagnostics_lookup is second.diagnostics_lookup
+    assert pool.stagger_seconds("b", 60) == POLL_STAGGER_SECONDS
+
+
+def test_release_closes_the_client(mock_geotab_api):
+    """Test that every entry gets its own client, closed when the entry leaves."""
+    pool = GeotabClientPool()
+    first = _acquire(pool, "a", "db")
+    second = _acquire(pool, "b", "db")
+    first.close = MagicMock()
+
+    assert first is not second
+    pool.release("a")
+    first.close.assert_called_once()
+    assert len(pool) == 1
+    pool.release("b")
+    assert len(pool) == 0
+
+
+def test_polls_are_staggered_per_server(mock_geotab_api):
+    """Test that entries on one server get consecutive stagger slots."""
+    pool = GeotabClientPool()
+    clients = {
+        entry_id: _acquire(pool, entry_id, f"db_{entry_id}") for entry_id in "abc"
+    }
+    _resolve(pool, clients["a"], "a", "my123.geotab.com")
+    _resolve(pool, clients["b"], "b", "my123.geotab.com")
+    _resolve(pool, clients["c"], "c", "my456.geotab.com")
+
+    assert pool.stagger_seconds("a", 60) == 0
+    assert pool.stagger_seconds("b", 60) == POLL_STAGGER_SECONDS
+    assert pool.stagger_seconds("c", 60) == 0
+    assert pool.stagger_seconds("unknown", 60) == 0
+
+
+def test_endpoint_clients_share_one_http_session():
+    """Test that clients for one endpoint reuse a keep-alive session."""
+    pool = GeotabClientPool()
+    first = _acquire(pool, "a", "db_one", endpoint="http://127.0.0.1:8765")
+    second = _acquire(pool, "b", "db_two", endpoint="http://127.0.0.1:8765")
+
+    assert first.client._http is second.client._http
+    pool.release("a")
+    pool.release("b")
+    assert len(pool) == 0
+    assert pool._http_session is None
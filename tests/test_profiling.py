@@ -0,0 +1,74 @@
+"""Tests for on-demand refresh profiling."""
+
+import importlib.util
+import os
+import threading
+
+# Import profiling directly from file to avoid loading __init__.py (which needs homeassistant)
+_PROFILING_PATH = os.path.join(
+    os.path.dirname(__file__),
+    "..",
+    "custom_components",
+    "geotab",
+    "profiling.py",
+)
+_spec = importlib.util.spec_from_file_location("profiling", _PROFILING_PATH)
+profiling = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(profiling)
+
+
+def _build_snapshot():
+    """Allocate something measurable."""
+    return [{"id": str(n), "value": n} for n in range(20000)]
+
+
+class TestRefreshProfiler:
+    """Tests for RefreshProfiler."""
+
+    def test_counts_refreshes(self):
+        profiler = profiling.RefreshProfiler(refreshes=2, top=5)
+        with profiler.refresh():
+            _build_snapshot()
+        assert not profiler.done
+        with profiler.refresh():
+            _build_snapshot()
+        assert profiler.done
+        assert profiler.summary()["refreshes"] == 2
+
+    def test_reports_functions_and_allocations(self):
+        profiler = profiling.RefreshProfiler(refreshes=1, top=5)
+        with profiler.refresh():
+            kept = _build_snapshot()
+        summary = profiler.summary()
+
+        assert any("_build_snapshot" in row["function"] for row in summary["functions"])
+        assert len(summary["functions"]) <= 5
+        assert summary["peak_memory_kib"] >= summary["retained_memory_kib"] > 1000
+        assert summary["allocations"][0]["size_kib"] > 0
+        assert kept
+
+    def test_profiles_executor_threads(self):
+        profiler = profiling.RefreshProfiler(refreshes=1, top=50)
+        result = []
+        worker = threading.Thread(
+            target=lambda: result.append(profiler.call(_build_snapshot))
+        )
+        with profiler.refresh():
+            worker.start()
+            worker.join()
+
+        functions = [row["function"] for row in profiler.summary()["functions"]]
+        assert any("_build_snapshot" in name for name in functions)
+        assert len(result[0]) == 20000
+
+    def test_leaves_foreign_tracing_running(self):
+        import tracemalloc
+
+        tracemalloc.start()
+        try:
+            profiler = profiling.RefreshProfiler(refreshes=1)
+            with profiler.refresh():
+                _build_snapshot()
+            assert tracemalloc.is_tracing()
+        finally:
+            tracemalloc.stop()
@@ -0,0 +1,133 @@
+"""Tests for Geotab sensors."""
+from unittest.mock import MagicMock, patch
+
+from homeassistant.components.sensor import SensorEntity
+
+from custom_components.geotab.sensor import SENSORS, GeotabSensor, SensorValueTable
+
+
+def _description(key: str):
+    """Return the sensor description for a key."""
+    return next(d for d in SENSORS if d.key == key)
+
+
+def _make_table(data: dict) -> tuple[MagicMock, SensorValueTable]:
+    """Create a value table over a mock coordinator."""
+    coordinator = MagicMock()
+    coordinator.data = data
+    return coordinator, SensorValueTable(coordinator)
+
+
+def test_value_table_computes_once_per_refresh():
+    """Test that values are computed once per coordinator data object."""
+    coordinator, table = _make_table({"device1": {"odometer": 123000, "speed": 50}})
+    odometer = _description("odometer")
+    table.register("device1", odometer)
+    table.register("device1", _description("speed"))
+
+    assert table.get("device1", "odometer") == 123
+    assert table.get("device1", "speed") == 50
+    assert table.generation == 1
+
+    coordinator.data = {"device1": {"odometer": 124000, "speed": 0}}
+    assert table.get("device1", "odometer") == 124
+    assert table.get("device1", "speed") == 0
+    assert table.generation == 2
+
+
+def test_value_table_skips_unregistered_descriptions():
+    """Test that only registered descriptions are computed."""
+    _, table = _make_table({"device1": {"odometer": 1000, "speed": 50}})
+    table.register("device1", _description("odometer"))
+
+    assert table.get("device1", "speed") is None
+
+    table.unregister("device1", "odometer")
+    assert table.get("device1", "odometer") is None
+
+
+def test_value_table_missing_device():
+    """Test that a device missing from coordinator data has no values."""
+    _, table = _make_table({})
+    table.register("device1", _description("speed"))
+    assert table.get("device1", "speed") is None
+
+
+def test_value_table_live_update_recomputes_only_the_pushed_devices():
+    """Test that a live feed update patches the table instead of rebuilding it."""
+    coordinator, table = _make_table({"device1": {"speed": 0}, "device2": {"speed": 0}})
+    speed = _description("speed")
+    table.register("device1", speed)
+    table.register("device2", speed)
+    assert table.get("device1", "speed") == 0
+    previous = coordinator.data
+
+    coordinator.data = {**previous, "device1": {"speed": 40}}
+    table.update_devices(["device1"], previous)
+    assert table.get("device1", "speed") == 40
+    assert table.generation == 1
+
+    # A table built from other data is left to rebuild on the next read
+    coordinator.data = {"device1": {"speed": 50}, "device2": {"speed": 5}}
+    table.update_devices(["device1"], previous)
+    assert table.get("device2", "speed") == 5
+    assert table.generation == 2
+
+
+def _make_gated_sensor(data: dict, key: str = "voltage", **kwargs) -> GeotabSensor:
+    """Create a sensor with a deadband, bypassing Home Assistant state writes."""
+    coordinator, table = _make_table(data)
+    description = _description(key)
+    table.register("device1", description)
+    sensor = GeotabSensor(
+        coordinator,
+        "device1",
+        description,
+        table,
+        deadband=kwargs.get("deadband", description.deadband),
+        min_interval=kwargs.get("min_interval", 0),
+    )
+    sensor.hass = MagicMock()
+    return sensor
+
+
+def test_deadband_suppresses_small_changes():
+    """Test that changes below the deadband are not written."""
+    sensor = _make_gated_sensor({"device1": {"voltage": 13.50}})
+    with patch.object(SensorEntity, "async_write_ha_state") as write:
+        sensor.async_write_ha_state()
+        assert sensor.native_value == 13.50
+
+        sensor.coordinator.data = {"device1": {"voltage": 13.55}}
+        sensor._handle_coordinator_update()
+        assert write.call_count == 1
+        assert sensor.native_value == 13.50
+
+        sensor.coordinator.data = {"device1": {"voltage": 13.70}}
+        sensor._handle_coordinator_update()
+        assert write.call_count == 2
+        assert sensor.native_value == 13.70
+
+
+def test_deadband_always_writes_zero_crossing():
+    """Test that a change to zero is written even if inside the deadband."""
+    sensor = _make_gated_sensor({"device1": {"speed": 0.5}}, key="speed")
+    with patch.object(SensorEntity, "async_write_ha_state") as write:
+        sensor.async_write_ha_state()
+        sensor.coordinator.data = {"device1": {"speed": 0}}
+        sensor._handle_coordinator_update()
+        assert write.call_count == 2
+        assert sensor.native_value == 0
+
+
+def test_min_interval_limits_writes():
+    """Test that writes are rate-limited when a minimum interval is set."""
+    sensor = _make_gated_sensor(
+        {"device1": {"voltage": 12.0}}, deadband=None, min_interval=300
+    )
+    with patch.object(SensorEntity, "async_write_ha_state") as write:
+        sensor.async_write_ha_state()
+        sensor.coordinator.data = {"device1": {"voltage": 14.0}}
+        sensor._handle_coordinator_update()
+        assert write.call_count == 1
+        assert sensor.native_value == 12.0
@@ -0,0 +1,103 @@
+"""Tests for the Geotab services."""
+import pytest
+from homeassistant.helpers import device_registry as dr
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.geotab.const import DOMAIN
+
+
+@pytest.mark.asyncio
+async def test_profile_service_returns_summary(hass, mock_geotab_api):
+    """Test that geotab.profile runs the refreshes and returns one summary per entry."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={"username": "user", "password": "pass", "database": "db"},
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    calls = mock_geotab_api.multi_call.call_count
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        "profile",
+        {"refreshes": 2, "top": 5},
+        blocking=True,
+        return_response=True,
+    )
+
+    summary = response[entry.entry_id]
+    assert summary["refreshes"] == 2
+    assert summary["functions"]
+    assert mock_geotab_api.multi_call.call_count == calls + 2
+    assert coordinator.profiler is None
+    assert coordinator.client.profiler is None
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+@pytest.mark.asyncio
+async def test_profile_service_arms_scheduled_refreshes(hass, mock_geotab_api):
+    """Test that without a response the next scheduled refreshes are profiled."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={"username": "user", "password": "pass", "database": "db"},
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+
+    await hass.services.async_call(DOMAIN, "profile", {"refreshes": 1}, blocking=True)
+    assert coordinator.profiler is not None
+
+    await coordinator.async_refresh()
+    assert coordinator.profiler is None
+    assert coordinator.profile_summary["refreshes"] == 1
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+@pytest.mark.asyncio
+async def test_refresh_service_scoped_to_a_vehicle(hass, mock_geotab_api):
+    """Test that refreshing one vehicle costs one scoped call and no fleet fetch."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={"username": "user", "password": "pass", "database": "db"},
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    device = dr.async_get(hass).async_get_device(identifiers={(DOMAIN, "device1")})
+    mock_geotab_api.get.reset_mock()
+    mock_geotab_api.multi_call.reset_mock()
+
+    await hass.services.async_call(
+        DOMAIN,
+        "refresh",
+        {"device_id": device.id, "stream": ["status", "faults"]},
+        blocking=True,
+    )
+
+    assert mock_geotab_api.get.call_count == 0
+    (calls,), _ = mock_geotab_api.multi_call.call_args
+    assert mock_geotab_api.multi_call.call_count == 1
+    assert [params["typeName"] for _, params in calls] == ["DeviceStatusInfo", "FaultData"]
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+@pytest.mark.asyncio
+async def test_refresh_service_without_scope_refreshes_every_entry(hass, mock_geotab_api):
+    """Test that an unscoped refresh runs a regular fetch."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={"username": "user", "password": "pass", "database": "db"},
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    calls = mock_geotab_api.multi_call.call_count
+
+    await hass.services.async_call(DOMAIN, "refresh", {}, blocking=True)
+
+    assert mock_geotab_api.multi_call.call_count == calls + 1
+    assert await hass.config_entries.async_unload(entry.entry_id)
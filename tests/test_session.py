@@ -0,0 +1,71 @@
+"""Tests for persisting the Geotab API session across restarts."""
+import pytest
+from mygeotab.api import Credentials
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.geotab.const import DOMAIN, SESSION_STORAGE_KEY
+
+
+def _stored(session_id, username="user"):
+    """Return a persisted session as the storage helper writes it."""
+    return {
+        "version": 1,
+        "minor_version": 1,
+        "key": "",
+        "data": {
+            "username": username,
+            "database": "db",
+            "session_id": session_id,
+            "session_database": "db",
+            "server": "my123.geotab.com",
+        },
+    }
+
+
+@pytest.mark.asyncio
+async def test_setup_reuses_and_saves_the_session(hass, hass_storage, mock_geotab_api):
+    """Test that a saved session is reused at startup and new sessions are saved."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={"username": "user", "password": "pass", "database": "db"},
+    )
+    entry.add_to_hass(hass)
+    key = SESSION_STORAGE_KEY.format(entry.entry_id)
+    hass_storage[key] = _stored("saved")
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+
+    assert coordinator.session_restored
+    assert mock_geotab_api.credentials.session_id == "saved"
+    assert mock_geotab_api.credentials.server == "my123.geotab.com"
+    mock_geotab_api.authenticate.assert_not_called()
+
+    # The server rejected the session and mygeotab authenticated again
+    mock_geotab_api.credentials = Credentials("user", "fresh", "db", "my456.geotab.com")
+    await coordinator.async_refresh()
+    assert hass_storage[key]["data"]["session_id"] == "fresh"
+    assert hass_storage[key]["data"]["server"] == "my456.geotab.com"
+
+    assert await hass.config_entries.async_remove(entry.entry_id)
+    await hass.async_block_till_done()
+    assert key not in hass_storage
+
+
+@pytest.mark.asyncio
+async def test_session_of_another_user_is_ignored(hass, hass_storage, mock_geotab_api):
+    """Test that a session saved for different credentials is not reused."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={"username": "user", "password": "pass", "database": "db"},
+    )
+    entry.add_to_hass(hass)
+    hass_storage[SESSION_STORAGE_KEY.format(entry.entry_id)] = _stored("saved", "other")
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert not hass.data[DOMAIN][entry.entry_id].session_restored
+    assert mock_geotab_api.credentials.session_id is None
+    assert await hass.config_entries.async_unload(entry.entry_id)
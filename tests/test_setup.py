@@ -1,10 +1,30 @@
 """Tests for Geotab entities setup."""
 import pytest
-from unittest.mock import MagicMock
-from custom_components.geotab.sensor import async_setup_entry as async_setup_sensor, SENSORS
+from unittest.mock import MagicMock, patch
+from custom_components.geotab.sensor import (
+    PERFORMANCE_SENSORS,
+    SENSORS,
+    async_setup_entry as async_setup_sensor,
+)
 from custom_components.geotab.binary_sensor import async_setup_entry as async_setup_binary, BINARY_SENSORS
 from custom_components.geotab.device_tracker import async_setup_entry as async_setup_tracker
-from custom_components.geotab.const import DOMAIN
+from custom_components.geotab.const import (
+    CONF_ENTITY_GROUPS,
+    CONF_ENTITY_PROFILE,
+    CONF_PERFORMANCE_SENSORS,
+    DEVICE_REMOVAL_GRACE_REFRESHES,
+    DOMAIN,
+    GROUP_STATUS,
+    GROUP_TRIPS,
+    PROFILE_CUSTOM,
+    PROFILE_MINIMAL,
+    PROFILE_STANDARD,
+    SIGNAL_DEVICES_ADDED,
+    SIGNAL_LIVE_POSITIONS,
+)
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 
 def _make_coordinator(data=None):
@@ -39,6 +59,7 @@ def _make_entry():
     entry = MagicMock()
     entry.entry_id = "test_id"
     entry.data = {"username": "user", "password": "pass", "database": "db"}
+    entry.options = {}
     entry.async_on_unload = MagicMock()
     return entry
 
@@ -133,3 +154,166 @@ async def test_sensor_setup_multiple_devices(hass, mock_geotab_api):
     entities = async_add_entities.call_args[0][0]
     # All SENSORS descriptions × 2 devices
     assert len(entities) == len(SENSORS) * 2
+
+
+@pytest.mark.asyncio
+async def test_minimal_profile_only_creates_status_entities(hass, mock_geotab_api):
+    """Test that the minimal profile skips everything outside the status group."""
+    entry = _make_entry()
+    entry.options = {CONF_ENTITY_PROFILE: PROFILE_MINIMAL}
+    coordinator = _make_coordinator()
+    hass.data[DOMAIN] = {entry.entry_id: coordinator}
+
+    async_add_entities = MagicMock()
+    await async_setup_sensor(hass, entry, async_add_entities)
+
+    keys = {entity.entity_description.key for entity in async_add_entities.call_args[0][0]}
+    assert keys == {d.key for d in SENSORS if d.group == GROUP_STATUS}
+    assert "rpm" not in keys
+
+
+@pytest.mark.asyncio
+async def test_standard_profile_skips_disabled_by_default(hass, mock_geotab_api):
+    """Test that the standard profile only creates entities enabled by default."""
+    entry = _make_entry()
+    entry.options = {CONF_ENTITY_PROFILE: PROFILE_STANDARD}
+    coordinator = _make_coordinator()
+    hass.data[DOMAIN] = {entry.entry_id: coordinator}
+
+    async_add_entities = MagicMock()
+    await async_setup_binary(hass, entry, async_add_entities)
+
+    entities = async_add_entities.call_args[0][0]
+    assert len(entities) == sum(
+        1 for d in BINARY_SENSORS if d.entity_registry_enabled_default
+    )
+
+
+@pytest.mark.asyncio
+async def test_custom_profile_removes_excluded_registry_entries(hass, mock_geotab_api):
+    """Test that entities outside the custom groups are removed from the registry."""
+    entry = _make_entry()
+    entry.options = {
+        CONF_ENTITY_PROFILE: PROFILE_CUSTOM,
+        CONF_ENTITY_GROUPS: [GROUP_STATUS, GROUP_TRIPS],
+    }
+    coordinator = _make_coordinator()
+    hass.data[DOMAIN] = {entry.entry_id: coordinator}
+    registry = er.async_get(hass)
+    kept = registry.async_get_or_create(
+        "sensor", DOMAIN, "device1_daily_distance", config_entry=entry
+    )
+    dropped = registry.async_get_or_create(
+        "sensor", DOMAIN, "device1_tire_pressure_front_left", config_entry=entry
+    )
+
+    async_add_entities = MagicMock()
+    await async_setup_sensor(hass, entry, async_add_entities)
+
+    keys = {entity.entity_description.key for entity in async_add_entities.call_args[0][0]}
+    assert "daily_distance" in keys
+    assert "tire_pressure_front_left" not in keys
+    assert registry.async_get(kept.entity_id) is not None
+    assert registry.async_get(dropped.entity_id) is None
+
+
+@pytest.mark.asyncio
+async def test_device_added_signal_creates_entities(hass, mock_geotab_api):
+    """Test that entities are only added for devices carried by the signal."""
+    entry = _make_entry()
+    coordinator = _make_coordinator()
+    hass.data[DOMAIN] = {entry.entry_id: coordinator}
+
+    async_add_entities = MagicMock()
+    await async_setup_tracker(hass, entry, async_add_entities)
+    async_add_entities.reset_mock()
+
+    async_dispatcher_send(hass, SIGNAL_DEVICES_ADDED.format(entry.entry_id), {"device2"})
+    await hass.async_block_till_done()
+
+    entities = async_add_entities.call_args[0][0]
+    assert [entity.unique_id for entity in entities] == ["device2_tracker"]
+
+
+@pytest.mark.asyncio
+async def test_performance_sensors_are_opt_in(hass, mock_geotab_api):
+    """Test that performance sensors are only created when enabled."""
+    entry = _make_entry()
+    entry.options = {CONF_PERFORMANCE_SENSORS: True}
+    coordinator = _make_coordinator()
+    hass.data[DOMAIN] = {entry.entry_id: coordinator}
+
+    async_add_entities = MagicMock()
+    await async_setup_sensor(hass, entry, async_add_entities)
+
+    performance_entities = list(async_add_entities.call_args_list[-1][0][0])
+    assert [entity.entity_description.key for entity in performance_entities] == [
+        description.key for description in PERFORMANCE_SENSORS
+    ]
+    assert performance_entities[0].unique_id == "test_id_poll_duration"
+
+
+@pytest.mark.asyncio
+async def test_live_positions_update_trackers_and_live_sensors(hass, mock_geotab_api):
+    """Test that a live feed push reaches only the tracker and live sensors."""
+    entry = _make_entry()
+    coordinator = _make_coordinator()
+    hass.data[DOMAIN] = {entry.entry_id: coordinator}
+    add_trackers, add_sensors = MagicMock(), MagicMock()
+    await async_setup_tracker(hass, entry, add_trackers)
+    await async_setup_sensor(hass, entry, add_sensors)
+    entities = [*add_trackers.call_args[0][0], *add_sensors.call_args[0][0]]
+    for entity in entities:
+        entity.hass = hass
+        await entity.async_added_to_hass()
+
+    with patch(
+        "homeassistant.helpers.entity.Entity.async_write_ha_state", autospec=True
+    ) as write:
+        async_dispatcher_send(
+            hass, SIGNAL_LIVE_POSITIONS.format(entry.entry_id), ["device1"], None
+        )
+        await hass.async_block_till_done()
+
+    written = {call.args[0].unique_id for call in write.call_args_list}
+    assert written == {"device1_tracker", "device1_speed", "device1_bearing"}
+
+
+
+@pytest.mark.asyncio
+async def test_returning_vehicle_gets_live_updates_once(hass, mock_geotab_api):
+    """Test that a retired vehicle's entities stop receiving live feed pushes."""
+    fleet = [{"id": "device1", "name": "One"}, {"id": "device2", "name": "Two"}]
+    mock_geotab_api.get.side_effect = lambda type_name, **kwargs: (
+        fleet if type_name == "Device" else []
+    )
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={"username": "user", "password": "pass", "database": "db"},
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+
+    # device2 leaves the fleet until it is removed, then comes back
+    returning = fleet.pop()
+    for _ in range(DEVICE_REMOVAL_GRACE_REFRESHES):
+        await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert er.async_get(hass).async_get("device_tracker.two_location") is None
+    fleet.append(returning)
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    with patch(
+        "homeassistant.helpers.entity.Entity.async_write_ha_state", autospec=True
+    ) as write:
+        async_dispatcher_send(
+            hass, SIGNAL_LIVE_POSITIONS.format(entry.entry_id), ["device2"], None
+        )
+        await hass.async_block_till_done()
+
+    written = sorted(call.args[0].unique_id for call in write.call_args_list)
+    # The bearing sensor is disabled by default, so it is not in Home Assistant
+    assert written == ["device2_speed", "device2_tracker"]
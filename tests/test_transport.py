@@ -0,0 +1,81 @@
+"""Tests for the Geotab JSON-RPC transport."""
+import json
+from unittest.mock import MagicMock
+
+import pytest
+from mygeotab.exceptions import AuthenticationException
+
+from custom_components.geotab.transport import JSON_CODEC, GeotabJsonRpc
+
+
+def _response(body):
+    """Return a fake HTTP response carrying a JSON-RPC body."""
+    response = MagicMock(status_code=200, headers={})
+    response.content = json.dumps(body).encode()
+    return response
+
+
+def _rpc(*bodies):
+    """Return a federated transport whose HTTP session answers with bodies in turn."""
+    http = MagicMock()
+    http.post.side_effect = [_response(body) for body in bodies]
+    return GeotabJsonRpc("user", "pass", "db", http_session=http, codec=JSON_CODEC), http
+
+
+def test_follows_federation_to_the_database_server():
+    """Test that authentication moves later calls to the server federation names."""
+    rpc, http = _rpc(
+        {"result": {
+            "path": "my123.geotab.com",
+            "credentials": {"userName": "user", "sessionId": "s1", "database": "db"},
+        }},
+        {"result": [{"id": "b1"}]},
+    )
+
+    assert rpc.get("Device") == [{"id": "b1"}]
+
+    urls = [call.args[0] for call in http.post.call_args_list]
+    assert urls == ["https://my.geotab.com/apiv1", "https://my123.geotab.com/apiv1"]
+    assert rpc.credentials.server == "my123.geotab.com"
+    assert rpc.credentials.session_id == "s1"
+
+
+def test_this_server_keeps_the_server():
+    """Test that a database on the federation server itself stays there."""
+    rpc, _ = _rpc(
+        {"result": {
+            "path": "ThisServer",
+            "credentials": {"userName": "user", "sessionId": "s1", "database": "db"},
+        }},
+    )
+
+    rpc.authenticate()
+
+    assert rpc.endpoint == "https://my.geotab.com/apiv1"
+
+
+def test_unknown_database_is_an_authentication_error():
+    """Test that a database that does not exist is reported like bad credentials."""
+    rpc, _ = _rpc(
+        {"error": {"errors": [{
+            "name": "DbUnavailableException",
+            "message": "Database 'db' UnknownDatabase",
+        }]}},
+    )
+
+    with pytest.raises(AuthenticationException):
+        rpc.authenticate()
+
+
+def test_explicit_endpoint_ignores_federation():
+    """Test that an emulator endpoint is kept whatever authentication answers."""
+    http = MagicMock()
+    http.post.return_value = _response({"result": {
+        "path": "my123.geotab.com",
+        "credentials": {"userName": "user", "sessionId": "s1", "database": "db"},
+    }})
+    rpc = GeotabJsonRpc("user", "pass", "db", endpoint="http://127.0.0.1:8765", http_session=http)
+
+    rpc.authenticate()
+
+    assert rpc.endpoint == "http://127.0.0.1:8765/apiv1"